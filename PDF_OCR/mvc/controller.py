@@ -1,9 +1,11 @@
 import argparse
 import configparser
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from .model import OcrModel
+from .state import STATE_FILE_NAME, DirectoryWatcher, StateIndex, hash_config
 from .view import ConsoleView
 
 
@@ -57,6 +59,45 @@ class OcrController:
         parser.add_argument(
             "-o", "--output-dir", default=None, help="Optional output directory"
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help=(
+                "OCR pages/images in chunks of this size with one Tesseract "
+                "process per chunk (0 disables batching)"
+            ),
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            help="Pages OCRed concurrently across files (default 1)",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=None,
+            help="Skip files unchanged since the last run with the same settings",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and OCR new or changed files as they appear",
+        )
+        parser.add_argument(
+            "--watch-interval",
+            type=float,
+            default=None,
+            help="Seconds between folder polls in watch mode (default 5)",
+        )
+        parser.add_argument(
+            "--settle-seconds",
+            type=float,
+            default=None,
+            help="Watch mode: wait until a file is unmodified this long (default 2)",
+        )
         return parser.parse_args()
 
     def _resolve_config_path(self, args: argparse.Namespace) -> Optional[Path]:
@@ -78,6 +119,11 @@ class OcrController:
             "dpi": section.get("dpi"),
             "image_dpi": section.get("image_dpi"),
             "output_dir": section.get("output_dir"),
+            "batch_size": section.get("batch_size"),
+            "jobs": section.get("jobs"),
+            "incremental": section.get("incremental"),
+            "watch_interval": section.get("watch_interval"),
+            "settle_seconds": section.get("settle_seconds"),
         }
 
     def _collect_inputs(self, input_path: Path) -> list[Path]:
@@ -116,7 +162,7 @@ class OcrController:
         input_path = Path(args.input)
         files = self._collect_inputs(input_path)
 
-        if not files:
+        if not files and not (args.watch and input_path.is_dir()):
             extensions = ", ".join(sorted(self.SUPPORTED_EXTENSIONS))
             self.view.error(
                 "Input must be a PDF/image file or folder containing: "
@@ -157,6 +203,36 @@ class OcrController:
                 self.view.error("Image DPI must be a positive integer.")
                 return 2
 
+        batch_size_raw = (
+            args.batch_size
+            if args.batch_size is not None
+            else config.get("batch_size")
+        )
+        if batch_size_raw in (None, ""):
+            batch_size = 0
+        else:
+            try:
+                batch_size = int(batch_size_raw)
+            except ValueError:
+                self.view.error("Batch size must be an integer.")
+                return 2
+            if batch_size < 0:
+                self.view.error("Batch size must be zero or a positive integer.")
+                return 2
+
+        jobs_raw = args.jobs if args.jobs is not None else config.get("jobs")
+        if jobs_raw in (None, ""):
+            jobs = 1
+        else:
+            try:
+                jobs = int(jobs_raw)
+            except ValueError:
+                self.view.error("Jobs must be an integer.")
+                return 2
+            if jobs <= 0:
+                self.view.error("Jobs must be a positive integer.")
+                return 2
+
         output_dir_value = args.output_dir
         if output_dir_value in (None, ""):
             output_dir_value = config.get("output_dir")
@@ -164,14 +240,142 @@ class OcrController:
             output_dir_value = "export"
         output_dir = Path(output_dir_value)
 
+        incremental_raw = (
+            args.incremental
+            if args.incremental is not None
+            else config.get("incremental")
+        )
+        incremental = str(incremental_raw).strip().lower() in {"1", "true", "yes", "on"}
+
+        watch_interval = self._positive_float(
+            args.watch_interval, config.get("watch_interval"), 5.0, "Watch interval"
+        )
+        settle_seconds = self._positive_float(
+            args.settle_seconds, config.get("settle_seconds"), 2.0, "Settle seconds"
+        )
+        if watch_interval is None or settle_seconds is None:
+            return 2
+
         model = OcrModel(lang=lang, dpi=dpi, image_dpi=image_dpi)
 
-        for input_file in files:
-            self.view.info(f"OCR: {input_file.name}")
-            text = model.extract_text(input_file)
-            target_dir = output_dir or input_file.parent
-            target_dir.mkdir(parents=True, exist_ok=True)
-            output_path = target_dir / f"{input_file.stem}.txt"
-            output_path.write_text(text, encoding="utf-8")
-            self.view.success(f"Wrote: {output_path}")
+        state = None
+        if incremental or args.watch:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            state = StateIndex(
+                output_dir / STATE_FILE_NAME,
+                hash_config({"lang": lang, "dpi": dpi, "image_dpi": image_dpi}),
+            )
+
+        if args.watch:
+            watcher = DirectoryWatcher(
+                input_path,
+                lambda path: path.suffix.lower() in self.SUPPORTED_EXTENSIONS,
+                settle_seconds,
+            )
+            self.view.info(f"Watching: {input_path} (Ctrl+C to stop)")
+            try:
+                while True:
+                    pending = self._filter_changed(watcher.poll(), state)
+                    if pending:
+                        self._ocr_watched(model, pending, output_dir, batch_size, jobs, state)
+                    time.sleep(watch_interval)
+            except KeyboardInterrupt:
+                return 0
+
+        if state is not None:
+            changed = self._filter_changed(files, state)
+            skipped = len(files) - len(changed)
+            if skipped:
+                self.view.info(f"Skipping {skipped} unchanged file(s)")
+            files = changed
+            if not files:
+                return 0
+
+        self._ocr_files(model, files, output_dir, batch_size, jobs, state)
         return 0
+
+    def _positive_float(
+        self,
+        cli_value: Optional[float],
+        config_value: Optional[str],
+        default: float,
+        name: str,
+    ) -> Optional[float]:
+        raw = cli_value if cli_value is not None else config_value
+        if raw in (None, ""):
+            return default
+        try:
+            value = float(raw)
+        except ValueError:
+            self.view.error(f"{name} must be a number.")
+            return None
+        if value < 0:
+            self.view.error(f"{name} must be zero or positive.")
+            return None
+        return value
+
+    def _filter_changed(
+        self, files: List[Path], state: Optional[StateIndex]
+    ) -> List[Path]:
+        if state is None:
+            return files
+        changed = []
+        for path in files:
+            try:
+                if state.needs_processing(path):
+                    changed.append(path)
+            except FileNotFoundError:
+                continue
+        return changed
+
+    def _ocr_watched(
+        self,
+        model: OcrModel,
+        files: List[Path],
+        output_dir: Path,
+        batch_size: int,
+        jobs: int,
+        state: StateIndex,
+    ) -> None:
+        try:
+            self._ocr_files(model, files, output_dir, batch_size, jobs, state)
+            return
+        except Exception as exc:
+            self.view.error(f"OCR failed ({exc}); retrying the remaining files one by one")
+
+        for path in self._filter_changed(files, state):
+            try:
+                self._ocr_files(model, [path], output_dir, batch_size, 1, state)
+            except Exception as exc:
+                self.view.error(f"Failed: {path}: {exc}")
+
+    def _ocr_files(
+        self,
+        model: OcrModel,
+        files: List[Path],
+        output_dir: Path,
+        batch_size: int,
+        jobs: int,
+        state: Optional[StateIndex],
+    ) -> None:
+
+        if batch_size > 0:
+            self.view.info(f"OCR: {len(files)} file(s) in chunks of {batch_size}")
+            results = model.extract_texts_batched(files, batch_size)
+        else:
+            self.view.info(f"OCR: {len(files)} file(s) with {jobs} job(s)")
+            results = model.extract_texts(files, jobs)
+
+        for input_file, text in results:
+            output_path = self._write_output(output_dir, input_file, text)
+            if state is not None:
+                state.mark_done(input_file, output_path)
+                state.save()
+
+    def _write_output(self, output_dir: Path, input_file: Path, text: str) -> Path:
+        target_dir = output_dir or input_file.parent
+        target_dir.mkdir(parents=True, exist_ok=True)
+        output_path = target_dir / f"{input_file.stem}.txt"
+        output_path.write_text(text, encoding="utf-8")
+        self.view.success(f"Wrote: {output_path}")
+        return output_path
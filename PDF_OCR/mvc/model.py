@@ -1,11 +1,26 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from tempfile import NamedTemporaryFile, TemporaryDirectory, mkdtemp
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
 import pytesseract
 
 
+TESSERACT_READABLE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp"}
+
+
+@dataclass
+class SpoolPage:
+    source: Path
+    index: int
+    path: Path
+    spooled: bool
+
+
 class OcrModel:
     def __init__(
         self, lang: str = "eng+ara", dpi: int = 300, image_dpi: Optional[int] = None
@@ -20,12 +35,73 @@ class OcrModel:
             return self._extract_text_from_pdf(input_path)
         return self._extract_text_from_image(input_path)
 
+    def extract_texts_batched(
+        self, input_paths: Iterable[Path], batch_size: int = 32
+    ) -> Iterator[Tuple[Path, str]]:
+        batch_size = max(1, batch_size)
+        with TemporaryDirectory(prefix="ocr_spool_") as spool:
+            spool_dir = Path(spool)
+            order: List[Path] = []
+            results: Dict[Path, List[Optional[str]]] = {}
+            pending: Dict[str, List[SpoolPage]] = {}
+            for input_path in input_paths:
+                order.append(input_path)
+                results[input_path] = []
+                config = self._batch_config(input_path)
+                for page in self._iter_pages(input_path, spool_dir, window=batch_size):
+                    results[input_path].append(None)
+                    chunk = pending.setdefault(config, [])
+                    chunk.append(page)
+                    if len(chunk) >= batch_size:
+                        self._ocr_chunk(chunk, config, spool_dir, results)
+                        pending[config] = []
+                        yield from self._pop_finished(order, results, input_path)
+                yield from self._pop_finished(order, results)
+
+            for config, chunk in pending.items():
+                if chunk:
+                    self._ocr_chunk(chunk, config, spool_dir, results)
+            yield from self._pop_finished(order, results)
+
+    def extract_texts(
+        self, input_paths: Iterable[Path], jobs: int = 1
+    ) -> Iterator[Tuple[Path, str]]:
+        jobs = max(1, jobs)
+        limit = jobs * 2
+        with TemporaryDirectory(prefix="ocr_pages_") as spool, ThreadPoolExecutor(
+            max_workers=jobs
+        ) as executor:
+            spool_dir = Path(spool)
+            order: List[Path] = []
+            results: Dict[Path, List[Optional[str]]] = {}
+            in_flight: Deque[Tuple[SpoolPage, Future]] = deque()
+            for input_path in input_paths:
+                order.append(input_path)
+                results[input_path] = []
+                config = self._batch_config(input_path)
+                for page in self._iter_pages(input_path, spool_dir, window=limit):
+                    results[input_path].append(None)
+                    future = executor.submit(
+                        pytesseract.image_to_string,
+                        str(page.path),
+                        lang=self.lang,
+                        config=config,
+                    )
+                    in_flight.append((page, future))
+                    while len(in_flight) > limit:
+                        self._collect_page(in_flight.popleft(), results)
+                        yield from self._pop_finished(order, results, input_path)
+                yield from self._pop_finished(order, results)
+
+            while in_flight:
+                self._collect_page(in_flight.popleft(), results)
+                yield from self._pop_finished(order, results)
+            yield from self._pop_finished(order, results)
+
     def _extract_text_from_pdf(self, pdf_path: Path) -> str:
-        pages = convert_from_path(str(pdf_path), dpi=self.dpi)
-        chunks = []
-        for page in pages:
-            chunks.append(pytesseract.image_to_string(page, lang=self.lang))
-        return "\n".join(chunks).strip()
+        for _, text in self.extract_texts([pdf_path]):
+            return text
+        return ""
 
     def _extract_text_from_image(self, image_path: Path) -> str:
         with Image.open(image_path) as image:
@@ -36,3 +112,114 @@ class OcrModel:
                 pytesseract.image_to_string(image, lang=self.lang, config=config)
                 .strip()
             )
+
+    def _batch_config(self, input_path: Path) -> str:
+        if input_path.suffix.lower() == ".pdf" or self.image_dpi is None:
+            return ""
+        return f"--dpi {self.image_dpi}"
+
+    def _iter_pages(
+        self, input_path: Path, spool_dir: Path, window: int
+    ) -> Iterator[SpoolPage]:
+        if input_path.suffix.lower() != ".pdf":
+            yield from self._spool_pages(input_path, spool_dir)
+            return
+
+        page_count = int(pdfinfo_from_path(str(input_path))["Pages"])
+        window = max(1, window)
+        for first_page in range(1, page_count + 1, window):
+            last_page = min(page_count, first_page + window - 1)
+            target = mkdtemp(prefix="pdf_", dir=spool_dir)
+            paths = convert_from_path(
+                str(input_path),
+                dpi=self.dpi,
+                first_page=first_page,
+                last_page=last_page,
+                output_folder=target,
+                paths_only=True,
+            )
+            for offset, path in enumerate(paths):
+                yield SpoolPage(
+                    input_path, first_page - 1 + offset, Path(path), spooled=True
+                )
+
+    def _collect_page(
+        self,
+        item: Tuple[SpoolPage, Future],
+        results: Dict[Path, List[Optional[str]]],
+    ) -> None:
+        page, future = item
+        try:
+            results[page.source][page.index] = future.result()
+        finally:
+            if page.spooled:
+                page.path.unlink(missing_ok=True)
+
+    def _spool_pages(self, input_path: Path, spool_dir: Path) -> List[SpoolPage]:
+        if input_path.suffix.lower() == ".pdf":
+            target = mkdtemp(prefix="pdf_", dir=spool_dir)
+            paths = convert_from_path(
+                str(input_path),
+                dpi=self.dpi,
+                output_folder=target,
+                paths_only=True,
+            )
+            return [
+                SpoolPage(input_path, index, Path(path), spooled=True)
+                for index, path in enumerate(paths)
+            ]
+
+        with Image.open(input_path) as image:
+            multi_frame = getattr(image, "n_frames", 1) > 1
+            readable = input_path.suffix.lower() in TESSERACT_READABLE_EXTENSIONS
+            if readable and not multi_frame:
+                return [SpoolPage(input_path, 0, input_path, spooled=False)]
+            image.seek(0)
+            with NamedTemporaryFile(
+                prefix="image_", suffix=".png", dir=spool_dir, delete=False
+            ) as handle:
+                spooled_path = Path(handle.name)
+            image.save(spooled_path)
+        return [SpoolPage(input_path, 0, spooled_path, spooled=True)]
+
+    def _ocr_chunk(
+        self,
+        chunk: List[SpoolPage],
+        config: str,
+        spool_dir: Path,
+        results: Dict[Path, List[Optional[str]]],
+    ) -> None:
+        list_path = spool_dir / "chunk.txt"
+        list_path.write_text(
+            "\n".join(str(page.path.resolve()) for page in chunk) + "\n",
+            encoding="utf-8",
+        )
+        output = pytesseract.image_to_string(
+            str(list_path), lang=self.lang, config=config
+        )
+        texts = output.split("\f")
+        if len(texts) != len(chunk) + 1:
+            texts = [
+                pytesseract.image_to_string(str(page.path), lang=self.lang, config=config)
+                for page in chunk
+            ]
+        for page, text in zip(chunk, texts):
+            results[page.source][page.index] = text
+            if page.spooled:
+                page.path.unlink(missing_ok=True)
+        list_path.unlink(missing_ok=True)
+
+    def _pop_finished(
+        self,
+        order: List[Path],
+        results: Dict[Path, List[Optional[str]]],
+        open_path: Optional[Path] = None,
+    ) -> Iterator[Tuple[Path, str]]:
+        while (
+            order
+            and order[0] != open_path
+            and all(text is not None for text in results[order[0]])
+        ):
+            input_path = order.pop(0)
+            texts = results.pop(input_path)
+            yield input_path, "\n".join(texts).strip()
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Set
+
+STATE_FILE_NAME = ".ocr_state.json"
+
+
+@dataclass
+class FileState:
+    size: int
+    mtime_ns: int
+    sha256: str
+    config_hash: str
+    output: str
+
+
+class StateIndex:
+    def __init__(self, path: Path, config_hash: str) -> None:
+        self.path = path
+        self.config_hash = config_hash
+        self._entries: Dict[str, FileState] = {}
+        if path.is_file():
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            for key, value in raw.get("files", {}).items():
+                try:
+                    self._entries[key] = FileState(**value)
+                except TypeError:
+                    continue
+
+    def needs_processing(self, file_path: Path) -> bool:
+        entry = self._entries.get(_key(file_path))
+        if entry is None or entry.config_hash != self.config_hash:
+            return True
+        if not Path(entry.output).is_file():
+            return True
+        stat = file_path.stat()
+        if stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns:
+            return False
+        if stat.st_size != entry.size:
+            return True
+        if hash_file(file_path) != entry.sha256:
+            return True
+        entry.mtime_ns = stat.st_mtime_ns
+        return False
+
+    def mark_done(self, file_path: Path, output_path: Path) -> None:
+        stat = file_path.stat()
+        self._entries[_key(file_path)] = FileState(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=hash_file(file_path),
+            config_hash=self.config_hash,
+            output=str(output_path.resolve()),
+        )
+
+    def save(self) -> None:
+        payload = {"files": {key: asdict(entry) for key, entry in self._entries.items()}}
+        part_path = self.path.with_name(self.path.name + ".part")
+        part_path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+        os.replace(part_path, self.path)
+
+
+class DirectoryWatcher:
+    def __init__(
+        self,
+        root: Path,
+        accept: Callable[[Path], bool],
+        settle_seconds: float = 2.0,
+    ) -> None:
+        self.root = root
+        self.accept = accept
+        self.settle_seconds = settle_seconds
+        self._dirs: Dict[Path, int] = {}
+        self._waiting: Set[Path] = set()
+
+    def poll(self) -> List[Path]:
+        candidates = set(self._waiting)
+        self._waiting.clear()
+        if self.root.is_file():
+            candidates.add(self.root)
+        elif not self._dirs:
+            self._scan(self.root, candidates)
+        else:
+            for directory, mtime_ns in list(self._dirs.items()):
+                try:
+                    current = directory.stat().st_mtime_ns
+                except FileNotFoundError:
+                    del self._dirs[directory]
+                    continue
+                if current != mtime_ns:
+                    self._scan(directory, candidates, recursive=False)
+
+        now = time.time()
+        ready: List[Path] = []
+        for path in candidates:
+            try:
+                age = now - path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age < self.settle_seconds:
+                self._waiting.add(path)
+            else:
+                ready.append(path)
+        return sorted(ready)
+
+    def _scan(self, directory: Path, found: Set[Path], recursive: bool = True) -> None:
+        try:
+            self._dirs[directory] = directory.stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            self._dirs.pop(directory, None)
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                if recursive or path not in self._dirs:
+                    self._scan(path, found)
+            elif entry.is_file() and self.accept(path):
+                found.add(path)
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_config(options: Dict[str, object]) -> str:
+    encoded = json.dumps(options, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _key(path: Path) -> str:
+    return str(path.resolve())
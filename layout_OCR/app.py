@@ -1,20 +1,34 @@
 from __future__ import annotations
 
 import argparse
+import logging
 from pathlib import Path
 
 from controllers.pipeline_controller import PipelineController
+from models.detectors.registry import available_detectors
 from models.detectors.simple_cv_detector import SimpleCvConfig
-from utils.config_utils import get_config_value, load_config, to_bool
+from utils.config_utils import load_config, pick, profile_defaults, to_bool
+from utils.debug_utils import DEBUG_CROP_MODES, DEBUG_FORMATS
+from utils.ocr_utils import OCR_BACKENDS, PAGE_THRESHOLDS, PREPROCESS_SCOPES, SCALE_MODES
+from utils.output_utils import STRUCTURED_FORMATS, TABLE_FORMATS
+from utils.schedule_utils import SCHEDULE_POLICIES
+from utils.script_utils import SCRIPT_MODES
 
 
 def build_parser() -> argparse.ArgumentParser:
+    detector_names = sorted(available_detectors().keys())
+
     parser = argparse.ArgumentParser(
         description="Detect layout blocks, OCR each region, and merge text per file."
     )
     parser.add_argument("--input", "-i", required=True, help="PDF, image, or folder")
     parser.add_argument("--output", "-o", default=None, help="Output folder")
     parser.add_argument("--config", "-c", default=None, help="Optional config.ini")
+    parser.add_argument(
+        "--boxes",
+        default=None,
+        help="layout_detector box file or folder; skips detection for matching documents",
+    )
     parser.add_argument(
         "--profile",
         default=None,
@@ -93,12 +107,55 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Replace digit groups in text using digits pass",
     )
+    parser.add_argument(
+        "--script-detect",
+        choices=list(SCRIPT_MODES),
+        default=None,
+        help="Route each region to a single language model: off, region, or osd",
+    )
+    parser.add_argument(
+        "--script-min-confidence",
+        type=float,
+        default=None,
+        help="Minimum Tesseract OSD script confidence for osd routing",
+    )
+    parser.add_argument(
+        "--script-lock-after",
+        type=int,
+        default=None,
+        help="Lock a document to one script after this many agreeing decisions, spot-checking "
+        "every Nth region afterwards (0 disables)",
+    )
     parser.add_argument(
         "--ocr-scale",
         type=float,
         default=None,
         help="Upscale factor for OCR crops",
     )
+    parser.add_argument(
+        "--ocr-scale-mode",
+        choices=list(SCALE_MODES),
+        default=None,
+        help="fixed uses --ocr-scale; auto picks a per-crop scale from text height",
+    )
+    parser.add_argument(
+        "--target-text-height",
+        type=float,
+        default=None,
+        help="auto scale: target text component height in pixels",
+    )
+    parser.add_argument(
+        "--min-scale",
+        type=float,
+        default=None,
+        help="auto scale: lowest allowed factor (below 1 downscales)",
+    )
+    parser.add_argument(
+        "--max-scale",
+        type=float,
+        default=None,
+        help="auto scale: highest allowed factor",
+    )
     parser.add_argument(
         "--ocr-binarize",
         action=argparse.BooleanOptionalAction,
@@ -117,12 +174,167 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Sharpen OCR crops before OCR",
     )
+    parser.add_argument(
+        "--preprocess-scope",
+        choices=list(PREPROCESS_SCOPES),
+        default=None,
+        help="Denoise/sharpen/binarize each crop, or the whole page once",
+    )
+    parser.add_argument(
+        "--page-threshold",
+        choices=list(PAGE_THRESHOLDS),
+        default=None,
+        help="Page scope binarization: global otsu or local adaptive",
+    )
+    parser.add_argument(
+        "--page-block-size",
+        type=int,
+        default=None,
+        help="Page scope adaptive threshold block size (odd number)",
+    )
+    parser.add_argument(
+        "--page-threshold-c",
+        type=int,
+        default=None,
+        help="Page scope adaptive threshold C value",
+    )
+    parser.add_argument(
+        "--ocr-backend",
+        choices=list(OCR_BACKENDS),
+        default=None,
+        help="stdin streams raw PNM to tesseract and reads TSV from stdout (no temp files)",
+    )
+    parser.add_argument(
+        "--ocr-timeout",
+        type=float,
+        default=None,
+        help="Seconds allowed per Tesseract call (0 disables)",
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=None,
+        help="Seconds allowed for all OCR calls of a page before degraded retry (0 disables)",
+    )
+    parser.add_argument(
+        "--degraded-psm",
+        type=int,
+        default=None,
+        help="PSM for the single full-page retry after a timeout",
+    )
+    parser.add_argument(
+        "--degraded-timeout",
+        type=float,
+        default=None,
+        help="Seconds allowed for the degraded retry of a page's remaining regions (0 disables)",
+    )
     parser.add_argument(
         "--crop-padding",
         type=int,
         default=None,
         help="Padding in pixels added around each detected box",
     )
+    parser.add_argument(
+        "--blank-page-ink-ratio",
+        type=float,
+        default=None,
+        help="Skip pages whose dark-pixel ratio is below this",
+    )
+    parser.add_argument(
+        "--min-crop-ink-ratio",
+        type=float,
+        default=None,
+        help="Skip boxes whose dark-pixel ratio is below this",
+    )
+    parser.add_argument(
+        "--ink-level",
+        type=int,
+        default=None,
+        help="Gray level (0-255) below which a pixel counts as ink",
+    )
+    parser.add_argument(
+        "--trim-crops",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Shrink each box to its ink bounds before padding and OCR",
+    )
+    parser.add_argument(
+        "--classify-regions",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Tag boxes as text, figure, table or rule before OCR",
+    )
+    parser.add_argument(
+        "--skip-regions",
+        default=None,
+        help="Comma-separated region kinds not sent to OCR (e.g. figure,rule)",
+    )
+    parser.add_argument(
+        "--text-min-height-pt",
+        type=float,
+        default=None,
+        help="Ink blobs shorter than this many points are ignored when measuring text height",
+    )
+    parser.add_argument(
+        "--figure-ink-ratio",
+        type=float,
+        default=None,
+        help="Ink density above which a tall box is a figure",
+    )
+    parser.add_argument(
+        "--figure-component-ratio",
+        type=float,
+        default=None,
+        help="Share of a box's ink in one connected blob above which a tall box is a figure",
+    )
+    parser.add_argument(
+        "--table-line-ratio",
+        type=float,
+        default=None,
+        help="Share of a box's ink on ruling lines above which it is a table",
+    )
+    parser.add_argument(
+        "--rule-aspect-ratio",
+        type=float,
+        default=None,
+        help="Aspect ratio above which a line-like box is a rule",
+    )
+    parser.add_argument(
+        "--detect-tables",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Find ruled table grids and OCR them one row strip at a time",
+    )
+    parser.add_argument(
+        "--table-psm",
+        type=int,
+        default=None,
+        help="Tesseract PSM for table row strips",
+    )
+    parser.add_argument(
+        "--table-min-cols",
+        type=int,
+        default=None,
+        help="Minimum columns for a ruled grid to count as a table",
+    )
+    parser.add_argument(
+        "--table-min-cell-size",
+        type=int,
+        default=None,
+        help="Minimum cell width/height in pixels; closer ruling lines are merged",
+    )
+    parser.add_argument(
+        "--table-min-rows",
+        type=int,
+        default=None,
+        help="Minimum rows for a ruled grid to count as a table",
+    )
+    parser.add_argument(
+        "--table-max-row-height",
+        type=float,
+        default=None,
+        help="Reject grids with a row taller than this many text heights (0 disables)",
+    )
     parser.add_argument("--poppler-path", default=None, help="Poppler bin folder path")
     parser.add_argument("--tesseract-cmd", default=None, help="Path to tesseract.exe")
 
@@ -150,7 +362,97 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="OCR full page if no boxes are detected",
     )
+    parser.add_argument(
+        "--flush-pages",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Flush output text after every page so it can be tailed",
+    )
+    parser.add_argument(
+        "--incremental",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Skip files unchanged since the last run with the same settings",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and OCR new or changed files as they appear",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=None,
+        help="Seconds between watch polls",
+    )
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=None,
+        help="Watch: wait until a file is unmodified for this long before OCR",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=list(SCHEDULE_POLICIES),
+        default=None,
+        help="File order: fifo (path order), sjf (cheapest first), or largest first",
+    )
+    parser.add_argument(
+        "--predict-runtime",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Estimate every input and print the predicted runtime before starting",
+    )
+    parser.add_argument(
+        "--seconds-per-megapixel",
+        type=float,
+        default=None,
+        help="Cost model: predicted seconds per rendered megapixel",
+    )
+    parser.add_argument(
+        "--seconds-per-page",
+        type=float,
+        default=None,
+        help="Cost model: predicted fixed seconds per page",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for pages; pages are shared via shared memory",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=None,
+        help="Estimated working-set budget for pages in flight across workers (0 = no limit)",
+    )
+    parser.add_argument(
+        "--render-window",
+        type=int,
+        default=None,
+        help="PDF pages rendered per pdftoppm call (pages are rendered lazily)",
+    )
+    parser.add_argument(
+        "--structured-output",
+        choices=list(STRUCTURED_FORMATS),
+        default=None,
+        help="Also write word boxes and confidences: none, jsonl, or hocr",
+    )
+    parser.add_argument(
+        "--table-output",
+        choices=list(TABLE_FORMATS),
+        default=None,
+        help="Also write detected tables to <name>.tables.tsv",
+    )
 
+    parser.add_argument(
+        "--detector",
+        "-d",
+        default=None,
+        choices=detector_names,
+        help=f"Detector to run: {', '.join(detector_names)}",
+    )
     parser.add_argument("--min-area", type=int, default=None, help="Min contour area")
     parser.add_argument("--kernel-width", type=int, default=None, help="Merge kernel width")
     parser.add_argument("--kernel-height", type=int, default=None, help="Merge kernel height")
@@ -214,6 +516,54 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Area ratio to treat boxes as duplicates",
     )
+    parser.add_argument(
+        "--min-gap-x-ratio",
+        type=float,
+        default=None,
+        help="xy_cut: min blank column run (ratio of page width) to split columns",
+    )
+    parser.add_argument(
+        "--min-gap-y-ratio",
+        type=float,
+        default=None,
+        help="xy_cut: min blank row run (ratio of page height) to split blocks",
+    )
+    parser.add_argument(
+        "--noise-ratio",
+        type=float,
+        default=None,
+        help="xy_cut: ink fraction per row/column treated as blank",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=None,
+        help="xy_cut: maximum recursion depth",
+    )
+    parser.add_argument(
+        "--work-max-side",
+        type=int,
+        default=None,
+        help="xy_cut: downscale the page so its longest side is at most this",
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=None,
+        help="Detect on overlapping tiles of this size for large pages (0 disables)",
+    )
+    parser.add_argument(
+        "--tile-overlap",
+        type=int,
+        default=None,
+        help="Overlap in pixels between detection tiles",
+    )
+    parser.add_argument(
+        "--tile-workers",
+        type=int,
+        default=None,
+        help="Threads used to detect tiles in parallel",
+    )
 
     parser.add_argument("--box-color", default=None, help="Box color for debug overlay")
     parser.add_argument("--box-width", type=int, default=None, help="Box line width for debug overlay")
@@ -224,103 +574,40 @@ def build_parser() -> argparse.ArgumentParser:
         help="Save debug crops and ordering overlays",
     )
     parser.add_argument("--debug-dir", default=None, help="Debug output folder")
+    parser.add_argument(
+        "--debug-scale",
+        type=float,
+        default=None,
+        help="Downscale factor for debug overlays and contact sheets (<= 1)",
+    )
+    parser.add_argument(
+        "--debug-format",
+        choices=list(DEBUG_FORMATS),
+        default=None,
+        help="Debug image format: png or uncompressed bmp",
+    )
+    parser.add_argument(
+        "--debug-compression",
+        type=int,
+        default=None,
+        help="PNG compression level for debug images (0-9)",
+    )
+    parser.add_argument(
+        "--debug-crops",
+        choices=list(DEBUG_CROP_MODES),
+        default=None,
+        help="Save crops as files, one contact sheet or zip per page, or not at all",
+    )
+    parser.add_argument(
+        "--log-level",
+        default=None,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level (DEBUG shows the scale chosen per crop)",
+    )
 
     return parser
 
 
-def pick(value, config, section: str, key: str, default, cast):
-    if value is not None:
-        return value
-    return get_config_value(config, section, key, default, cast)
-
-
-def profile_defaults(name: str, cv_defaults: SimpleCvConfig) -> dict:
-    base = {
-        "general": {
-            "dpi": 500,
-            "output_dir": "output",
-            "include_page_breaks": False,
-            "fallback_full_page": True,
-        },
-        "ocr": {
-            "lang": "eng+ara",
-            "psm": 6,
-            "oem": 1,
-            "scale": 2.0,
-            "binarize": True,
-            "denoise": True,
-            "sharpen": True,
-            "crop_padding": 4,
-            "line_psm": 7,
-            "line_psm_height_ratio": 0.07,
-            "digits_pass": False,
-            "digits_height_ratio": 0.08,
-            "digits_whitelist": "0123456789-/:.,٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹",
-            "digits_psm": 7,
-            "digits_min_chars": 2,
-            "digits_pass_scope": "short",
-            "digits_replace": False,
-            "whitelist": None,
-            "extra_config": None,
-            "digits_extra_config": None,
-        },
-        "order": {
-            "rtl": False,
-            "column_overlap_ratio": 0.3,
-        },
-        "cv": {
-            "min_area": cv_defaults.min_area,
-            "kernel_width": cv_defaults.kernel_width,
-            "kernel_height": cv_defaults.kernel_height,
-            "adaptive_block_size": cv_defaults.adaptive_block_size,
-            "adaptive_c": cv_defaults.adaptive_c,
-            "remove_lines": cv_defaults.remove_lines,
-            "line_length_ratio": cv_defaults.line_length_ratio,
-            "line_thickness": cv_defaults.line_thickness,
-            "border_margin": cv_defaults.border_margin,
-            "max_area_ratio": cv_defaults.max_area_ratio,
-            "merge_linefree": cv_defaults.merge_linefree,
-            "merge_iou_threshold": cv_defaults.merge_iou_threshold,
-            "merge_area_ratio": cv_defaults.merge_area_ratio,
-        },
-    }
-
-    if name.lower() != "arabic":
-        return base
-
-    base["order"].update(
-        {
-            "rtl": True,
-            "column_overlap_ratio": 0.4,
-        }
-    )
-    base["cv"].update(
-        {
-            "min_area": max(30, cv_defaults.min_area),
-            "kernel_width": max(8, cv_defaults.kernel_width - 2),
-            "kernel_height": cv_defaults.kernel_height,
-            "adaptive_c": max(10, cv_defaults.adaptive_c - 3),
-            "line_length_ratio": 0.1,
-            "line_thickness": max(2, cv_defaults.line_thickness),
-            "border_margin": max(3, cv_defaults.border_margin),
-            "max_area_ratio": 0.75,
-            "merge_linefree": True,
-            "merge_iou_threshold": 0.7,
-            "merge_area_ratio": 0.2,
-        }
-    )
-    base["ocr"].update(
-        {
-            "digits_pass": True,
-            "digits_height_ratio": 0.1,
-            "digits_whitelist": "0123456789-/:.,٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹",
-            "digits_pass_scope": "all",
-            "digits_replace": True,
-        }
-    )
-    return base
-
-
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
@@ -330,18 +617,42 @@ def main() -> int:
     profile_name = pick(args.profile, config, "general", "profile", "default", str)
     profile = profile_defaults(profile_name, defaults)
 
+    log_level = pick(
+        args.log_level, config, "general", "log_level", profile["general"]["log_level"], str
+    )
+    logging.basicConfig(level=log_level.upper(), format="%(levelname)s %(name)s: %(message)s")
+
     output_dir = pick(
         args.output, config, "general", "output_dir", profile["general"]["output_dir"], str
     )
     dpi = pick(args.dpi, config, "general", "dpi", profile["general"]["dpi"], int)
     poppler_path = pick(args.poppler_path, config, "general", "poppler_path", None, str)
     tesseract_cmd = pick(args.tesseract_cmd, config, "general", "tesseract_cmd", None, str)
+    boxes = pick(args.boxes, config, "general", "boxes", None, str)
+    boxes_path = Path(boxes) if boxes else None
 
     ocr_options = {
         "lang": pick(args.lang, config, "ocr", "lang", profile["ocr"]["lang"], str),
         "psm": pick(args.psm, config, "ocr", "psm", profile["ocr"]["psm"], int),
         "oem": pick(args.oem, config, "ocr", "oem", profile["ocr"]["oem"], int),
         "scale": pick(args.ocr_scale, config, "ocr", "scale", profile["ocr"]["scale"], float),
+        "scale_mode": pick(
+            args.ocr_scale_mode, config, "ocr", "scale_mode", profile["ocr"]["scale_mode"], str
+        ),
+        "target_text_height": pick(
+            args.target_text_height,
+            config,
+            "ocr",
+            "target_text_height",
+            profile["ocr"]["target_text_height"],
+            float,
+        ),
+        "min_scale": pick(
+            args.min_scale, config, "ocr", "min_scale", profile["ocr"]["min_scale"], float
+        ),
+        "max_scale": pick(
+            args.max_scale, config, "ocr", "max_scale", profile["ocr"]["max_scale"], float
+        ),
         "binarize": pick(
             args.ocr_binarize, config, "ocr", "binarize", profile["ocr"]["binarize"], to_bool
         ),
@@ -351,9 +662,177 @@ def main() -> int:
         "sharpen": pick(
             args.ocr_sharpen, config, "ocr", "sharpen", profile["ocr"]["sharpen"], to_bool
         ),
+        "preprocess_scope": pick(
+            args.preprocess_scope,
+            config,
+            "ocr",
+            "preprocess_scope",
+            profile["ocr"]["preprocess_scope"],
+            str,
+        ),
+        "page_threshold": pick(
+            args.page_threshold,
+            config,
+            "ocr",
+            "page_threshold",
+            profile["ocr"]["page_threshold"],
+            str,
+        ),
+        "page_block_size": pick(
+            args.page_block_size,
+            config,
+            "ocr",
+            "page_block_size",
+            profile["ocr"]["page_block_size"],
+            int,
+        ),
+        "page_threshold_c": pick(
+            args.page_threshold_c,
+            config,
+            "ocr",
+            "page_threshold_c",
+            profile["ocr"]["page_threshold_c"],
+            int,
+        ),
+        "ocr_backend": pick(
+            args.ocr_backend, config, "ocr", "ocr_backend", profile["ocr"]["ocr_backend"], str
+        ),
+        "ocr_timeout": pick(
+            args.ocr_timeout, config, "ocr", "ocr_timeout", profile["ocr"]["ocr_timeout"], float
+        ),
+        "page_timeout": pick(
+            args.page_timeout, config, "ocr", "page_timeout", profile["ocr"]["page_timeout"], float
+        ),
+        "degraded_psm": pick(
+            args.degraded_psm, config, "ocr", "degraded_psm", profile["ocr"]["degraded_psm"], int
+        ),
+        "degraded_timeout": pick(
+            args.degraded_timeout,
+            config,
+            "ocr",
+            "degraded_timeout",
+            profile["ocr"]["degraded_timeout"],
+            float,
+        ),
         "crop_padding": pick(
             args.crop_padding, config, "ocr", "crop_padding", profile["ocr"]["crop_padding"], int
         ),
+        "blank_page_ink_ratio": pick(
+            args.blank_page_ink_ratio,
+            config,
+            "ocr",
+            "blank_page_ink_ratio",
+            profile["ocr"]["blank_page_ink_ratio"],
+            float,
+        ),
+        "min_crop_ink_ratio": pick(
+            args.min_crop_ink_ratio,
+            config,
+            "ocr",
+            "min_crop_ink_ratio",
+            profile["ocr"]["min_crop_ink_ratio"],
+            float,
+        ),
+        "ink_level": pick(
+            args.ink_level, config, "ocr", "ink_level", profile["ocr"]["ink_level"], int
+        ),
+        "trim_crops": pick(
+            args.trim_crops, config, "ocr", "trim_crops", profile["ocr"]["trim_crops"], to_bool
+        ),
+        "classify_regions": pick(
+            args.classify_regions,
+            config,
+            "ocr",
+            "classify_regions",
+            profile["ocr"]["classify_regions"],
+            to_bool,
+        ),
+        "skip_regions": pick(
+            args.skip_regions, config, "ocr", "skip_regions", profile["ocr"]["skip_regions"], str
+        ),
+        "text_min_height_pt": pick(
+            args.text_min_height_pt,
+            config,
+            "ocr",
+            "text_min_height_pt",
+            profile["ocr"]["text_min_height_pt"],
+            float,
+        ),
+        "figure_ink_ratio": pick(
+            args.figure_ink_ratio,
+            config,
+            "ocr",
+            "figure_ink_ratio",
+            profile["ocr"]["figure_ink_ratio"],
+            float,
+        ),
+        "figure_component_ratio": pick(
+            args.figure_component_ratio,
+            config,
+            "ocr",
+            "figure_component_ratio",
+            profile["ocr"]["figure_component_ratio"],
+            float,
+        ),
+        "table_line_ratio": pick(
+            args.table_line_ratio,
+            config,
+            "ocr",
+            "table_line_ratio",
+            profile["ocr"]["table_line_ratio"],
+            float,
+        ),
+        "rule_aspect_ratio": pick(
+            args.rule_aspect_ratio,
+            config,
+            "ocr",
+            "rule_aspect_ratio",
+            profile["ocr"]["rule_aspect_ratio"],
+            float,
+        ),
+        "detect_tables": pick(
+            args.detect_tables,
+            config,
+            "ocr",
+            "detect_tables",
+            profile["ocr"]["detect_tables"],
+            to_bool,
+        ),
+        "table_psm": pick(
+            args.table_psm, config, "ocr", "table_psm", profile["ocr"]["table_psm"], int
+        ),
+        "table_min_cols": pick(
+            args.table_min_cols,
+            config,
+            "ocr",
+            "table_min_cols",
+            profile["ocr"]["table_min_cols"],
+            int,
+        ),
+        "table_min_cell_size": pick(
+            args.table_min_cell_size,
+            config,
+            "ocr",
+            "table_min_cell_size",
+            profile["ocr"]["table_min_cell_size"],
+            int,
+        ),
+        "table_min_rows": pick(
+            args.table_min_rows,
+            config,
+            "ocr",
+            "table_min_rows",
+            profile["ocr"]["table_min_rows"],
+            int,
+        ),
+        "table_max_row_height": pick(
+            args.table_max_row_height,
+            config,
+            "ocr",
+            "table_max_row_height",
+            profile["ocr"]["table_max_row_height"],
+            float,
+        ),
         "line_psm": pick(args.line_psm, config, "ocr", "line_psm", profile["ocr"]["line_psm"], int),
         "line_psm_height_ratio": pick(
             args.line_psm_height_ratio,
@@ -414,6 +893,30 @@ def main() -> int:
         "digits_extra_config": pick(
             args.digits_extra_config, config, "ocr", "digits_extra_config", None, str
         ),
+        "script_detect": pick(
+            args.script_detect,
+            config,
+            "ocr",
+            "script_detect",
+            profile["ocr"]["script_detect"],
+            str,
+        ),
+        "script_min_confidence": pick(
+            args.script_min_confidence,
+            config,
+            "ocr",
+            "script_min_confidence",
+            profile["ocr"]["script_min_confidence"],
+            float,
+        ),
+        "script_lock_after": pick(
+            args.script_lock_after,
+            config,
+            "ocr",
+            "script_lock_after",
+            profile["ocr"]["script_lock_after"],
+            int,
+        ),
     }
 
     order_options = {
@@ -488,11 +991,53 @@ def main() -> int:
             profile["cv"]["merge_area_ratio"],
             float,
         ),
+        "min_gap_x_ratio": pick(
+            args.min_gap_x_ratio,
+            config,
+            "cv",
+            "min_gap_x_ratio",
+            profile["cv"]["min_gap_x_ratio"],
+            float,
+        ),
+        "min_gap_y_ratio": pick(
+            args.min_gap_y_ratio,
+            config,
+            "cv",
+            "min_gap_y_ratio",
+            profile["cv"]["min_gap_y_ratio"],
+            float,
+        ),
+        "noise_ratio": pick(
+            args.noise_ratio, config, "cv", "noise_ratio", profile["cv"]["noise_ratio"], float
+        ),
+        "max_depth": pick(
+            args.max_depth, config, "cv", "max_depth", profile["cv"]["max_depth"], int
+        ),
+        "work_max_side": pick(
+            args.work_max_side, config, "cv", "work_max_side", profile["cv"]["work_max_side"], int
+        ),
+        "tile_size": pick(
+            args.tile_size, config, "cv", "tile_size", profile["cv"]["tile_size"], int
+        ),
+        "tile_overlap": pick(
+            args.tile_overlap, config, "cv", "tile_overlap", profile["cv"]["tile_overlap"], int
+        ),
+        "tile_workers": pick(
+            args.tile_workers, config, "cv", "tile_workers", profile["cv"]["tile_workers"], int
+        ),
     }
+    detector_name = pick(
+        args.detector, config, "general", "detector", profile["general"]["detector"], str
+    )
 
     view_options = {
         "color": pick(args.box_color, config, "debug", "box_color", "red", str),
         "width": pick(args.box_width, config, "debug", "box_width", 2, int),
+        "scale": pick(args.debug_scale, config, "debug", "scale", 1.0, float),
+        "format": pick(args.debug_format, config, "debug", "format", "png", str),
+        "compression": pick(args.debug_compression, config, "debug", "compression", 1, int),
+        "crops": pick(args.debug_crops, config, "debug", "crops", "files", str),
+        "queue_size": pick(None, config, "debug", "queue_size", 32, int),
     }
 
     debug_enabled = pick(args.debug, config, "debug", "enabled", False, to_bool)
@@ -515,6 +1060,100 @@ def main() -> int:
         profile["general"]["fallback_full_page"],
         to_bool,
     )
+    flush_pages = pick(
+        args.flush_pages,
+        config,
+        "general",
+        "flush_pages",
+        profile["general"]["flush_pages"],
+        to_bool,
+    )
+    workers = pick(
+        args.workers, config, "general", "workers", profile["general"]["workers"], int
+    )
+    memory_budget_mb = pick(
+        args.memory_budget_mb,
+        config,
+        "general",
+        "memory_budget_mb",
+        profile["general"]["memory_budget_mb"],
+        float,
+    )
+    render_window = pick(
+        args.render_window,
+        config,
+        "general",
+        "render_window",
+        profile["general"]["render_window"],
+        int,
+    )
+    schedule = pick(
+        args.schedule, config, "general", "schedule", profile["general"]["schedule"], str
+    )
+    seconds_per_megapixel = pick(
+        args.seconds_per_megapixel,
+        config,
+        "general",
+        "seconds_per_megapixel",
+        profile["general"]["seconds_per_megapixel"],
+        float,
+    )
+    seconds_per_page = pick(
+        args.seconds_per_page,
+        config,
+        "general",
+        "seconds_per_page",
+        profile["general"]["seconds_per_page"],
+        float,
+    )
+    predict_runtime = pick(
+        args.predict_runtime,
+        config,
+        "general",
+        "predict_runtime",
+        profile["general"]["predict_runtime"],
+        to_bool,
+    )
+    incremental = pick(
+        args.incremental,
+        config,
+        "general",
+        "incremental",
+        profile["general"]["incremental"],
+        to_bool,
+    )
+    watch_interval = pick(
+        args.watch_interval,
+        config,
+        "general",
+        "watch_interval",
+        profile["general"]["watch_interval"],
+        float,
+    )
+    settle_seconds = pick(
+        args.settle_seconds,
+        config,
+        "general",
+        "settle_seconds",
+        profile["general"]["settle_seconds"],
+        float,
+    )
+    structured_format = pick(
+        args.structured_output,
+        config,
+        "general",
+        "structured_output",
+        profile["general"]["structured_output"],
+        str,
+    )
+    table_output = pick(
+        args.table_output,
+        config,
+        "general",
+        "table_output",
+        profile["general"]["table_output"],
+        str,
+    )
 
     controller = PipelineController(
         detector_options=detector_options,
@@ -523,7 +1162,33 @@ def main() -> int:
         view_options=view_options,
         poppler_path=poppler_path,
         tesseract_cmd=tesseract_cmd,
+        structured_format=structured_format,
+        detector_name=detector_name,
+        workers=workers,
+        memory_budget_mb=memory_budget_mb,
+        render_window=render_window,
+        table_output=table_output,
     )
+    if args.watch:
+        try:
+            controller.watch(
+                Path(args.input),
+                Path(output_dir),
+                dpi=dpi,
+                debug_dir=debug_dir,
+                include_page_breaks=include_page_breaks,
+                fallback_full_page=fallback_full_page,
+                flush_pages=flush_pages,
+                interval=watch_interval,
+                settle_seconds=settle_seconds,
+                on_output=print,
+                boxes_path=boxes_path,
+            )
+        except KeyboardInterrupt:
+            pass
+        print(controller.report.summary())
+        return 0
+
     outputs = controller.run(
         Path(args.input),
         Path(output_dir),
@@ -531,10 +1196,18 @@ def main() -> int:
         debug_dir=debug_dir,
         include_page_breaks=include_page_breaks,
         fallback_full_page=fallback_full_page,
+        flush_pages=flush_pages,
+        incremental=incremental,
+        schedule=schedule,
+        seconds_per_megapixel=seconds_per_megapixel,
+        seconds_per_page=seconds_per_page,
+        on_plan=(lambda plan: print(plan.summary())) if predict_runtime else None,
+        boxes_path=boxes_path,
     )
 
     for output_path in outputs:
         print(output_path)
+    print(controller.report.summary())
 
     return 0
 
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import io
+import logging
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import aclosing
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Deque, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from controllers.pipeline_controller import PageContext, RegionJob
+from engine import LayoutOcrEngine, Source, _to_image
+from models.detectors.base import Box
+from models.document_model import Document
+from models.ocr_result import DocumentResult, OcrRegion, OcrResult, PageResult
+from utils.async_utils import iter_pdf_images_async, tesseract_data_async
+from utils.ocr_utils import OcrTimeoutError, PreparedOcr, finish_ocr
+from utils.script_utils import ScriptRouter
+
+logger = logging.getLogger(__name__)
+
+Sources = Union[Iterable[Source], AsyncIterable[Source]]
+
+
+class AsyncLayoutOcrEngine:
+    def __init__(
+        self,
+        engine: LayoutOcrEngine | None = None,
+        max_concurrency: int = 4,
+        max_pages: int = 2,
+        max_documents: int = 2,
+        executor: Executor | None = None,
+        **engine_options,
+    ) -> None:
+        self.engine = engine or LayoutOcrEngine(**engine_options)
+        self.controller = self.engine.controller
+        self.max_pages = max(1, int(max_pages))
+        self.max_documents = max(1, int(max_documents))
+        self.executor = executor
+        self._ocr_slots = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+    async def ocr_page(
+        self,
+        image: Image.Image | np.ndarray,
+        page_index: int = 0,
+        boxes: List[Box] | None = None,
+        script_router: ScriptRouter | None = None,
+    ) -> PageResult:
+        page = await self._run_blocking(
+            self.controller.begin_page,
+            _to_image(image),
+            page_index,
+            fallback_full_page=self.engine.fallback_full_page,
+            script_router=script_router or self.controller.build_script_router(),
+            boxes=boxes,
+        )
+        if isinstance(page, PageResult):
+            return page
+        try:
+            await self._ocr_regions(page)
+        finally:
+            result = self.controller.end_page(page)
+        return result
+
+    async def ocr_document(self, source: Source, dpi: int | None = None) -> DocumentResult:
+        return DocumentResult(pages=[page async for page in self.iter_document(source, dpi)])
+
+    async def iter_document(
+        self, source: Source, dpi: int | None = None
+    ) -> AsyncIterator[PageResult]:
+        router = self.controller.build_script_router()
+        images = self._iter_images(source, dpi or self.engine.dpi)
+        pending: Deque[asyncio.Future] = deque()
+        try:
+            index = 0
+            async for image in images:
+                pending.append(asyncio.ensure_future(self._ocr_owned_page(image, index, router)))
+                index += 1
+                if len(pending) >= self.max_pages:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            await _cancel_all(pending)
+            await images.aclose()
+
+    async def ocr_stream(
+        self, sources: Sources, dpi: int | None = None
+    ) -> AsyncIterator[DocumentResult]:
+        pending: Deque[asyncio.Future] = deque()
+        try:
+            async for source in _aiter(sources):
+                pending.append(asyncio.ensure_future(self.ocr_document(source, dpi)))
+                if len(pending) >= self.max_documents:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            await _cancel_all(pending)
+
+    async def _ocr_owned_page(
+        self, image: Image.Image, page_index: int, router: ScriptRouter
+    ) -> PageResult:
+        try:
+            return await self.ocr_page(image, page_index, script_router=router)
+        finally:
+            image.close()
+
+    async def _ocr_regions(self, page: PageContext) -> None:
+        jobs = await self._run_blocking(self._prepare_jobs, page, page.ordered)
+        tasks = [asyncio.ensure_future(self._run_job(page, job)) for job in jobs]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            await _cancel_all(tasks)
+
+        finished: Dict[int, Tuple[RegionJob, List[OcrResult]]] = {}
+        timed_out = False
+        for job, task in zip(jobs, tasks):
+            if task.cancelled():
+                continue
+            error = task.exception()
+            if error is None:
+                finished[job.index] = (job, task.result())
+            elif isinstance(error, OcrTimeoutError):
+                timed_out = True
+            else:
+                raise error
+
+        if timed_out:
+            if not self.controller.degrade_page(page, len(finished)):
+                self.controller.finish_degraded(page, await self._degraded_page(page))
+                return
+            boxes = [job.box for job in jobs if job.index not in finished]
+            indices = [job.index for job in jobs if job.index not in finished]
+            retry = await self._run_blocking(
+                self._prepare_jobs, page, boxes, indices=indices, degraded=True
+            )
+            retried = await asyncio.gather(*(self._run_degraded(page, job) for job in retry))
+            for job, job_results in zip(retry, retried):
+                if job_results is not None:
+                    finished[job.index] = (job, job_results)
+
+        for index in sorted(finished):
+            job, job_results = finished[index]
+            self.controller.finish_region(page, job, job_results)
+
+    def _prepare_jobs(
+        self,
+        page: PageContext,
+        boxes: List[Box],
+        indices: List[int] | None = None,
+        degraded: bool = False,
+    ) -> List[RegionJob]:
+        jobs = []
+        if indices is None:
+            indices = list(range(1, len(boxes) + 1))
+        for idx, box in zip(indices, boxes):
+            job = self.controller.prepare_region(page, idx, box, degraded=degraded)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    async def _run_job(self, page: PageContext, job: RegionJob) -> List[OcrResult]:
+        return list(await asyncio.gather(*(self._run_call(page, call) for call in job.calls)))
+
+    async def _run_degraded(self, page: PageContext, job: RegionJob) -> List[OcrResult] | None:
+        try:
+            return await self._run_job(page, job)
+        except OcrTimeoutError:
+            self.controller.region_timed_out(page, job.index)
+            return None
+
+    async def _run_call(self, page: PageContext, prepared: PreparedOcr) -> OcrResult:
+        result = await self._ocr_prepared(prepared, deadline=page.deadline)
+        page.ocr_calls += 1
+        return result
+
+    async def _degraded_page(self, page: PageContext) -> OcrRegion | None:
+        prepared = await self._run_blocking(self.controller.prepare_degraded, page.image)
+        timeout = float(self.controller.ocr_options.get("degraded_timeout", 0) or 0)
+        try:
+            result = await self._ocr_prepared(prepared, timeout=timeout)
+        except OcrTimeoutError:
+            logger.warning(
+                "Page %d degraded OCR timed out; leaving it empty", page.page_index + 1
+            )
+            return None
+        return self.controller.degraded_region(page.image, result)
+
+    async def _ocr_prepared(
+        self,
+        prepared: PreparedOcr,
+        deadline: float | None = None,
+        timeout: float | None = None,
+    ) -> OcrResult:
+        async with self._ocr_slots:
+            if timeout is None:
+                timeout = self.controller.call_timeout(deadline)
+            data = await tesseract_data_async(
+                prepared, timeout=timeout, backend=self.controller.ocr_backend()
+            )
+        return finish_ocr(prepared, data)
+
+    async def _iter_images(self, source: Source, dpi: int) -> AsyncIterator[Image.Image]:
+        if isinstance(source, (Image.Image, np.ndarray)):
+            yield _to_image(source).copy()
+            return
+        if isinstance(source, (str, Path)):
+            path = Path(source)
+            if Document(path).is_pdf:
+                pages = iter_pdf_images_async(path, dpi=dpi, poppler_path=self.engine.poppler_path)
+                async with aclosing(pages):
+                    async for image in pages:
+                        yield image
+                return
+            data = await self._run_blocking(path.read_bytes)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            data = await self._run_blocking(source.read)
+
+        if data[:5] == b"%PDF-":
+            pages = iter_pdf_images_async(data, dpi=dpi, poppler_path=self.engine.poppler_path)
+            async with aclosing(pages):
+                async for image in pages:
+                    yield image
+            return
+        for frame in await self._run_blocking(_decode_frames, data):
+            yield frame
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+
+def _decode_frames(data: bytes) -> List[Image.Image]:
+    with Image.open(io.BytesIO(data)) as image:
+        return [frame.copy() for frame in ImageSequence.Iterator(image)]
+
+
+async def _aiter(sources: Sources) -> AsyncIterator[Source]:
+    if hasattr(sources, "__aiter__"):
+        async for source in sources:
+            yield source
+    else:
+        for source in sources:
+            yield source
+
+
+async def _cancel_all(tasks: Iterable[asyncio.Future]) -> None:
+    tasks = [task for task in tasks if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,17 +1,117 @@
 from __future__ import annotations
 
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Tuple
 
+import numpy as np
 from PIL import Image
 
 from models.detectors.base import Box
-from models.detectors.simple_cv_detector import SimpleCvConfig, SimpleCvDetector
-from models.document_model import Document
-from utils.file_utils import build_output_name, collect_inputs, ensure_output_dir
-from utils.ocr_utils import ocr_image
+from models.detectors.registry import build_detector
+from models.detectors.simple_cv_detector import find_line_masks
+from models.detectors.tiled_detector import TiledDetector
+from models.document_model import Document, DocumentPage
+from models.ocr_result import OcrRegion, OcrResult, PageResult
+from models.run_report import RunReport
+from utils.box_utils import BoxFile, load_box_index
+from utils.debug_utils import DebugWriter
+from utils.file_utils import (
+    build_output_name,
+    build_structured_name,
+    build_table_name,
+    collect_inputs,
+    ensure_output_dir,
+    is_supported_file,
+)
+from utils.ink_utils import (
+    gray_array,
+    image_dpi,
+    ink_box,
+    ink_ratio,
+    pad_box,
+    points_to_pixels,
+)
+from utils.memory_utils import MemoryGovernor, estimate_page_bytes
+from utils.ocr_utils import (
+    OCR_BACKENDS,
+    OcrTimeoutError,
+    PreparedOcr,
+    prepare_ocr,
+    preprocess_page,
+    run_prepared,
+)
 from utils.ordering_utils import order_boxes_column_aware
-from utils.render_utils import draw_boxes_with_order
+from utils.output_utils import StreamingTextWriter, TableTsvWriter, build_structured_writer
+from utils.region_utils import classify_regions, estimate_text_height
+from utils.schedule_utils import SchedulePlan, plan_jobs
+from utils.script_utils import ScriptRouter
+from utils.shm_utils import SharedPageHandle, SharedPageStore, attach_page
+from utils.state_utils import (
+    STATE_FILE_NAME,
+    DirectoryWatcher,
+    StateIndex,
+    hash_config,
+    hash_file,
+)
+from utils.table_utils import (
+    TableGrid,
+    assemble_table,
+    drop_boxes_in_tables,
+    find_tables,
+    limit_row_height,
+    strip_lines,
+)
+
+DEGRADED_SKIPPED_KINDS = ("figure", "rule")
+
+_WORKER_CONTROLLER: "PipelineController | None" = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageContext:
+    image: Image.Image
+    page_index: int
+    base_name: str
+    gray: np.ndarray
+    ordered: List[Box]
+    kinds: List[str]
+    tables: Dict[int, TableGrid]
+    horizontal_lines: np.ndarray | None
+    vertical_lines: np.ndarray | None
+    source: Image.Image
+    page_preprocessed: bool
+    script_router: ScriptRouter | None
+    debug_writer: DebugWriter | None
+    deadline: float | None
+    chunks: List[str] = field(default_factory=list)
+    regions: List[OcrRegion] = field(default_factory=list)
+    skipped_regions: int = 0
+    non_text_regions: int = 0
+    ocr_calls: int = 0
+    ocr_pixels: int = 0
+    timeouts: int = 0
+    degraded: bool = False
+
+
+@dataclass
+class RegionJob:
+    index: int
+    box: Box
+    crop: Image.Image
+    lang: str
+    calls: List[PreparedOcr]
+    kind: str = "text"
+    digits: bool = False
+    table: TableGrid | None = None
+    table_rows: List[int] = field(default_factory=list)
 
 
 class PipelineController:
@@ -23,13 +123,44 @@ class PipelineController:
         view_options: Dict[str, object],
         poppler_path: str | None = None,
         tesseract_cmd: str | None = None,
+        structured_format: str = "none",
+        detector_name: str = "simple_cv",
+        workers: int = 1,
+        memory_budget_mb: float = 0,
+        render_window: int = 1,
+        table_output: str = "none",
     ) -> None:
-        self.detector = SimpleCvDetector(SimpleCvConfig(**detector_options))
+        self._worker_kwargs = {
+            "detector_options": detector_options,
+            "ocr_options": ocr_options,
+            "order_options": order_options,
+            "view_options": view_options,
+            "poppler_path": poppler_path,
+            "tesseract_cmd": tesseract_cmd,
+            "structured_format": structured_format,
+            "table_output": table_output,
+            "detector_name": detector_name,
+        }
+        self.detector = build_detector(detector_name, detector_options)
+        self.detector_name = detector_name
+        self.detector_options = detector_options
         self.ocr_options = ocr_options
         self.order_options = order_options
         self.view_options = view_options
         self.poppler_path = poppler_path
         self.tesseract_cmd = tesseract_cmd
+        self.structured_format = structured_format
+        self.table_output = table_output
+        self.workers = max(1, int(workers))
+        self.memory_budget_mb = max(0.0, float(memory_budget_mb))
+        self.render_window = max(1, int(render_window))
+        self._executor: ProcessPoolExecutor | None = None
+        self._page_store: SharedPageStore | None = None
+        self._layouts: Dict[str, BoxFile] = {}
+        self._document_serial = 0
+        self._worker_router: Tuple[int, ScriptRouter] | None = None
+        self.report = RunReport()
+        self._debug_writer: DebugWriter | None = None
 
     def run(
         self,
@@ -39,6 +170,13 @@ class PipelineController:
         debug_dir: Path | None = None,
         include_page_breaks: bool = False,
         fallback_full_page: bool = True,
+        flush_pages: bool = False,
+        incremental: bool = False,
+        schedule: str = "fifo",
+        seconds_per_megapixel: float = 0.3,
+        seconds_per_page: float = 0.2,
+        on_plan: Callable[[SchedulePlan], None] | None = None,
+        boxes_path: Path | None = None,
     ) -> List[Path]:
         files = collect_inputs(input_path)
         if not files:
@@ -48,17 +186,136 @@ class PipelineController:
         if debug_dir:
             ensure_output_dir(debug_dir)
 
+        self.report = RunReport()
+        self._layouts = load_box_index(boxes_path) if boxes_path else {}
+        options = (dpi, debug_dir, include_page_breaks, fallback_full_page, flush_pages)
+        state = self._open_state(output_dir, *options) if incremental else None
+        if state is not None:
+            changed = [path for path in files if state.needs_processing(path)]
+            self.report.unchanged_files += len(files) - len(changed)
+            files = changed
+
+        plan = plan_jobs(
+            files,
+            dpi,
+            policy=schedule,
+            workers=self.workers,
+            seconds_per_megapixel=seconds_per_megapixel,
+            seconds_per_page=seconds_per_page,
+            poppler_path=self.poppler_path,
+            estimate=on_plan is not None,
+        )
+        if on_plan is not None:
+            on_plan(plan)
+        files = plan.files
+        with ExitStack() as stack:
+            self._open_workers(stack)
+            return self._process_files(files, output_dir, options, state, check_state=False)
+
+    def watch(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        dpi: int,
+        debug_dir: Path | None = None,
+        include_page_breaks: bool = False,
+        fallback_full_page: bool = True,
+        flush_pages: bool = False,
+        interval: float = 5.0,
+        settle_seconds: float = 2.0,
+        on_output: Callable[[Path], None] | None = None,
+        boxes_path: Path | None = None,
+    ) -> None:
+        output_dir = ensure_output_dir(output_dir)
+        if debug_dir:
+            ensure_output_dir(debug_dir)
+
+        self.report = RunReport()
+        self._layouts = load_box_index(boxes_path) if boxes_path else {}
+        options = (dpi, debug_dir, include_page_breaks, fallback_full_page, flush_pages)
+        state = self._open_state(output_dir, *options)
+        watcher = DirectoryWatcher(input_path, is_supported_file, settle_seconds)
+        with ExitStack() as stack:
+            self._open_workers(stack)
+            while True:
+                files = watcher.poll()
+                for output_path in self._process_files(
+                    files, output_dir, options, state, keep_going=True
+                ):
+                    if on_output is not None:
+                        on_output(output_path)
+                time.sleep(interval)
+
+    def _open_state(
+        self,
+        output_dir: Path,
+        dpi: int,
+        debug_dir: Path | None,
+        include_page_breaks: bool,
+        fallback_full_page: bool,
+        flush_pages: bool,
+    ) -> StateIndex:
+        options = dict(self._worker_kwargs)
+        options.pop("view_options", None)
+        options.update(
+            {
+                "dpi": dpi,
+                "include_page_breaks": include_page_breaks,
+                "fallback_full_page": fallback_full_page,
+            }
+        )
+        return StateIndex(
+            output_dir / STATE_FILE_NAME, hash_config(options), boxes_digest=self._box_digest
+        )
+
+    def _box_digest(self, sha256: str) -> str:
+        layout = self._layouts.get(sha256)
+        return layout.digest if layout is not None else ""
+
+    def _open_workers(self, stack: ExitStack) -> None:
+        if self.workers > 1:
+            self._executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_page_worker,
+                    initargs=(self._worker_kwargs,),
+                )
+            )
+            self._page_store = stack.enter_context(SharedPageStore())
+        stack.push(self._close_workers)
+
+    def _close_workers(self, exc_type=None, exc=None, tb=None) -> None:
+        self._executor = None
+        self._page_store = None
+        self._close_debug_writer(failing=exc_type is not None)
+
+    def _process_files(
+        self,
+        files: List[Path],
+        output_dir: Path,
+        options: Tuple[int, Path | None, bool, bool, bool],
+        state: StateIndex | None = None,
+        keep_going: bool = False,
+        check_state: bool = True,
+    ) -> List[Path]:
         outputs: List[Path] = []
         for file_path in files:
-            output_path = self._process_file(
-                file_path,
-                output_dir,
-                dpi,
-                debug_dir,
-                include_page_breaks,
-                fallback_full_page,
-            )
+            try:
+                if check_state and state is not None and not state.needs_processing(file_path):
+                    self.report.unchanged_files += 1
+                    continue
+                output_path = self._process_file(file_path, output_dir, *options)
+            except Exception:
+                if not keep_going:
+                    raise
+                logger.exception("Failed to OCR %s; leaving it unmarked", file_path)
+                self.report.failed_files += 1
+                continue
             outputs.append(output_path)
+            self.report.files += 1
+            if state is not None:
+                state.mark_done(file_path, output_path)
+                state.save()
         return outputs
 
     def _process_file(
@@ -69,30 +326,160 @@ class PipelineController:
         debug_dir: Path | None,
         include_page_breaks: bool,
         fallback_full_page: bool,
+        flush_pages: bool = False,
     ) -> Path:
         document = Document(file_path)
-        text_sections: List[str] = []
+        layout = self._layout_for(document, dpi)
+        separator = "\n\n" if include_page_breaks else "\n"
+        output_path = output_dir / build_output_name(file_path.stem)
 
-        for page in document.load_pages(dpi, poppler_path=self.poppler_path):
-            page_text = self._process_page(
-                page.image,
-                page.index,
-                file_path.stem,
-                debug_dir,
-                fallback_full_page,
+        structured_path = output_dir / build_structured_name(
+            file_path.stem, self.structured_format
+        )
+
+        with ExitStack() as stack:
+            writer = stack.enter_context(
+                StreamingTextWriter(output_path, separator, flush_pages=flush_pages)
             )
-            if include_page_breaks and document.is_pdf:
-                page_text = f"--- Page {page.index + 1} ---\n{page_text}"
-            text_sections.append(page_text.strip())
-            page.image.close()
+            structured_writer = build_structured_writer(
+                self.structured_format, structured_path, file_path.name, flush_pages=flush_pages
+            )
+            if structured_writer is not None:
+                stack.enter_context(structured_writer)
+            table_writer = None
+            if self.table_output == "tsv":
+                table_writer = stack.enter_context(
+                    TableTsvWriter(
+                        output_dir / build_table_name(file_path.stem), flush_pages=flush_pages
+                    )
+                )
 
-        separator = "\n\n" if include_page_breaks else "\n"
-        combined = separator.join(section for section in text_sections if section)
-        output_name = build_output_name(file_path.stem)
-        output_path = output_dir / output_name
-        output_path.write_text(combined, encoding="utf-8")
+            pages = document.iter_pages(
+                dpi, poppler_path=self.poppler_path, window=self.render_window
+            )
+            for result in self._iter_page_results(
+                pages, file_path.stem, debug_dir, fallback_full_page, layout
+            ):
+                self.report.add_page(result)
+                page_text = result.text
+                if include_page_breaks and document.is_pdf:
+                    page_text = f"--- Page {result.index + 1} ---\n{page_text}"
+                writer.write_page(page_text)
+                if structured_writer is not None:
+                    structured_writer.write_page(result)
+                if table_writer is not None:
+                    table_writer.write_page(result)
         return output_path
 
+    def _layout_for(self, document: Document, dpi: int) -> BoxFile | None:
+        if not self._layouts:
+            return None
+        layout = self._layouts.get(hash_file(document.path))
+        if layout is None:
+            logger.warning("No box file for %s; running detection", document.path)
+            return None
+        if document.is_pdf:
+            layout.check_dpi(dpi)
+        return layout
+
+    def _iter_page_results(
+        self,
+        pages: Iterable[DocumentPage],
+        base_name: str,
+        debug_dir: Path | None,
+        fallback_full_page: bool,
+        layout: BoxFile | None = None,
+    ) -> Iterator[PageResult]:
+        if self._executor is None or self._page_store is None:
+            script_router = self.build_script_router()
+            for page in pages:
+                try:
+                    boxes = None
+                    if layout is not None:
+                        boxes = layout.page_boxes(page.index, page.image.width, page.image.height)
+                    yield self._process_page(
+                        page.image,
+                        page.index,
+                        base_name,
+                        debug_dir,
+                        fallback_full_page,
+                        script_router,
+                        boxes=boxes,
+                    )
+                finally:
+                    page.image.close()
+            return
+
+        governor = MemoryGovernor(int(self.memory_budget_mb * 1024 * 1024))
+        self._document_serial += 1
+        document_id = self._document_serial
+        in_flight: Deque[Tuple[SharedPageHandle, Future, int]] = deque()
+        try:
+            for page in pages:
+                boxes = None
+                if layout is not None:
+                    boxes = layout.page_boxes(page.index, page.image.width, page.image.height)
+                cost = estimate_page_bytes(
+                    page.image.width,
+                    page.image.height,
+                    self.detector_name,
+                    self.detector_options,
+                    self.ocr_options,
+                    channels=len(page.image.getbands()),
+                )
+                while in_flight and not governor.fits(cost):
+                    yield self._collect(in_flight.popleft(), governor)
+                handle = self._page_store.put(page.image)
+                page.image.close()
+                governor.acquire(cost)
+                future = self._executor.submit(
+                    _process_shared_page,
+                    handle,
+                    page.index,
+                    base_name,
+                    debug_dir,
+                    fallback_full_page,
+                    boxes,
+                    document_id,
+                )
+                in_flight.append((handle, future, cost))
+                if len(in_flight) >= self.workers * 2:
+                    yield self._collect(in_flight.popleft(), governor)
+            while in_flight:
+                yield self._collect(in_flight.popleft(), governor)
+        finally:
+            for handle, future, _ in in_flight:
+                future.cancel()
+                self._page_store.release(handle)
+
+    def _collect(
+        self, item: Tuple[SharedPageHandle, Future, int], governor: MemoryGovernor
+    ) -> PageResult:
+        handle, future, cost = item
+        try:
+            return future.result()
+        finally:
+            governor.release(cost)
+            self._page_store.release(handle)
+
+    def process_page(
+        self,
+        image: Image.Image,
+        page_index: int = 0,
+        boxes: List[Box] | None = None,
+        fallback_full_page: bool = True,
+        script_router: ScriptRouter | None = None,
+    ) -> PageResult:
+        return self._process_page(
+            image,
+            page_index,
+            "page",
+            None,
+            fallback_full_page,
+            script_router or self.build_script_router(),
+            boxes=boxes,
+        )
+
     def _process_page(
         self,
         image: Image.Image,
@@ -100,8 +487,121 @@ class PipelineController:
         base_name: str,
         debug_dir: Path | None,
         fallback_full_page: bool,
-    ) -> str:
-        boxes = self.detector.detect(image)
+        script_router: ScriptRouter | None = None,
+        boxes: List[Box] | None = None,
+    ) -> PageResult:
+        page = self.begin_page(
+            image,
+            page_index,
+            base_name,
+            self._get_debug_writer(debug_dir),
+            fallback_full_page,
+            script_router,
+            boxes,
+        )
+        if isinstance(page, PageResult):
+            return page
+
+        backend = self.ocr_backend()
+        regions = list(enumerate(page.ordered, start=1))
+        finished = 0
+        resume: int | None = None
+        for position, (idx, box) in enumerate(regions):
+            job = self.prepare_region(page, idx, box)
+            if job is None:
+                continue
+            results = []
+            try:
+                for prepared in job.calls:
+                    results.append(
+                        run_prepared(
+                            prepared, timeout=self.call_timeout(page.deadline), backend=backend
+                        )
+                    )
+                    page.ocr_calls += 1
+            except OcrTimeoutError:
+                resume = position
+                break
+            self.finish_region(page, job, results)
+            finished += 1
+
+        if resume is not None:
+            if not self.degrade_page(page, finished):
+                self.finish_degraded(page, self._degraded_page(image, page_index))
+                return self.end_page(page)
+            for idx, box in regions[resume:]:
+                job = self.prepare_region(page, idx, box, degraded=True)
+                if job is None:
+                    continue
+                try:
+                    result = run_prepared(
+                        job.calls[0], timeout=self.call_timeout(page.deadline), backend=backend
+                    )
+                except OcrTimeoutError:
+                    self.region_timed_out(page, idx)
+                    continue
+                page.ocr_calls += 1
+                self.finish_region(page, job, [result])
+        return self.end_page(page)
+
+    def begin_page(
+        self,
+        image: Image.Image,
+        page_index: int,
+        base_name: str = "page",
+        debug_writer: DebugWriter | None = None,
+        fallback_full_page: bool = True,
+        script_router: ScriptRouter | None = None,
+        boxes: List[Box] | None = None,
+    ) -> PageContext | PageResult:
+        page_timeout = float(self.ocr_options.get("page_timeout", 0) or 0)
+        deadline = time.monotonic() + page_timeout if page_timeout > 0 else None
+        ink_level = int(self.ocr_options.get("ink_level", 128))
+        gray = gray_array(image)
+        blank_ratio = float(self.ocr_options.get("blank_page_ink_ratio", 0.0005))
+        if ink_ratio(gray, ink_level) < blank_ratio:
+            return PageResult(
+                index=page_index,
+                width=image.width,
+                height=image.height,
+                text="",
+                blank=True,
+            )
+
+        horizontal_lines = vertical_lines = None
+        supplied_boxes = boxes is not None
+        if boxes is None:
+            layout = self.detector.detect_layout(image)
+            boxes = layout.boxes
+            horizontal_lines, vertical_lines = layout.horizontal_lines, layout.vertical_lines
+        classify = bool(self.ocr_options.get("classify_regions", True))
+        detect_tables = bool(self.ocr_options.get("detect_tables", False)) and not supplied_boxes
+        if (classify or detect_tables) and horizontal_lines is None:
+            if isinstance(self.detector, TiledDetector) and self.detector.tiles_page(image):
+                classify = detect_tables = False
+            else:
+                horizontal_lines, vertical_lines = self._line_masks(gray, ink_level)
+        min_text_height = points_to_pixels(
+            float(self.ocr_options.get("text_min_height_pt", 3.0)), image_dpi(image)
+        )
+
+        tables: List[TableGrid] = []
+        if detect_tables:
+            tables = find_tables(
+                horizontal_lines,
+                vertical_lines,
+                min_rows=int(self.ocr_options.get("table_min_rows", 2)),
+                min_cols=int(self.ocr_options.get("table_min_cols", 2)),
+                min_cell_size=int(self.ocr_options.get("table_min_cell_size", 8)),
+            )
+            max_row_height = float(self.ocr_options.get("table_max_row_height", 8.0))
+            if tables and max_row_height > 0:
+                text_height = estimate_text_height(gray, ink_level, min_text_height)
+                if text_height > 0:
+                    tables = limit_row_height(tables, max_row_height * text_height)
+            if tables:
+                boxes = drop_boxes_in_tables(boxes, tables) + [table.box for table in tables]
+
         if not boxes and fallback_full_page:
             boxes = [Box(0, 0, image.width, image.height)]
 
@@ -112,73 +612,444 @@ class PipelineController:
             overlap_ratio=float(self.order_options.get("column_overlap_ratio", 0.3)),
         )
 
-        if debug_dir:
-            overlay = draw_boxes_with_order(
-                image,
+        kinds = ["text"] * len(ordered)
+        if classify:
+            kinds = classify_regions(
+                gray,
                 ordered,
-                color=self.view_options.get("color", "red"),
-                width=int(self.view_options.get("width", 2)),
+                horizontal_lines,
+                vertical_lines,
+                ink_level,
+                figure_ink_ratio=float(self.ocr_options.get("figure_ink_ratio", 0.45)),
+                figure_component_ratio=float(
+                    self.ocr_options.get("figure_component_ratio", 0.6)
+                ),
+                table_line_ratio=float(self.ocr_options.get("table_line_ratio", 0.1)),
+                rule_aspect_ratio=float(self.ocr_options.get("rule_aspect_ratio", 15.0)),
+                min_text_height=min_text_height,
             )
-            debug_name = f"{base_name}_page_{page_index + 1}_order.png"
-            overlay.save(debug_dir / debug_name)
+        table_boxes = {table.box: table for table in tables}
+        page_tables = {
+            idx: table_boxes[box]
+            for idx, box in enumerate(ordered, start=1)
+            if box in table_boxes
+        }
+        for idx in page_tables:
+            kinds[idx - 1] = "table"
+
+        if debug_writer is not None:
+            debug_writer.save_overlay(base_name, page_index, image, ordered)
+
+        page_preprocessed = str(self.ocr_options.get("preprocess_scope", "crop")) == "page"
+        source = image
+        if page_preprocessed:
+            source = Image.fromarray(
+                preprocess_page(
+                    gray,
+                    binarize=bool(self.ocr_options.get("binarize", True)),
+                    denoise=bool(self.ocr_options.get("denoise", True)),
+                    sharpen=bool(self.ocr_options.get("sharpen", True)),
+                    threshold=str(self.ocr_options.get("page_threshold", "otsu")),
+                    block_size=int(self.ocr_options.get("page_block_size", 31)),
+                    threshold_c=int(self.ocr_options.get("page_threshold_c", 15)),
+                )
+            )
+
+        return PageContext(
+            image=image,
+            page_index=page_index,
+            base_name=base_name,
+            gray=gray,
+            ordered=ordered,
+            kinds=kinds,
+            tables=page_tables,
+            horizontal_lines=horizontal_lines,
+            vertical_lines=vertical_lines,
+            source=source,
+            page_preprocessed=page_preprocessed,
+            script_router=script_router,
+            debug_writer=debug_writer,
+            deadline=deadline,
+        )
 
-        chunks: List[str] = []
+    def prepare_region(
+        self, page: PageContext, idx: int, box: Box, degraded: bool = False
+    ) -> RegionJob | None:
+        image = page.image
+        kind = page.kinds[idx - 1]
+        skipped = self._skipped_kinds()
+        if degraded:
+            skipped = skipped.union(DEGRADED_SKIPPED_KINDS)
+        if kind in skipped:
+            page.non_text_regions += 1
+            page.regions.append(OcrRegion(index=idx, box=box, text="", kind=kind))
+            return None
+        if idx in page.tables and not degraded:
+            return self._prepare_table(page, idx, page.tables[idx])
+        ink_level = int(self.ocr_options.get("ink_level", 128))
+        min_crop_ink = float(self.ocr_options.get("min_crop_ink_ratio", 0.001))
+        inked = ink_box(page.gray, box, ink_level, min_crop_ink)
+        if inked is None:
+            page.skipped_regions += 1
+            return None
+        trim_crops = bool(self.ocr_options.get("trim_crops", True))
         crop_padding = int(self.ocr_options.get("crop_padding", 0))
-        for idx, box in enumerate(ordered, start=1):
-            if crop_padding > 0:
-                left = max(0, box.left - crop_padding)
-                top = max(0, box.top - crop_padding)
-                right = min(image.width, box.right + crop_padding)
-                bottom = min(image.height, box.bottom + crop_padding)
-            else:
-                left, top, right, bottom = box.left, box.top, box.right, box.bottom
-            crop = image.crop((left, top, right, bottom))
-            if debug_dir:
-                crop_name = f"{base_name}_page_{page_index + 1}_crop_{idx}.png"
-                crop.save(debug_dir / crop_name)
-            height_ratio = box.height / max(1, image.height)
-            default_psm = self.ocr_options.get("psm")
-            line_psm = self.ocr_options.get("line_psm")
-            line_psm_ratio = float(self.ocr_options.get("line_psm_height_ratio", 0.07))
-            psm = default_psm
-            if line_psm is not None and height_ratio <= line_psm_ratio:
-                psm = line_psm
-
-            text = ocr_image(
+        crop_box = pad_box(inked if trim_crops else box, crop_padding, image.size)
+        left, top = crop_box.left, crop_box.top
+        crop = page.source.crop((left, top, crop_box.right, crop_box.bottom))
+        if degraded:
+            prepared = self.prepare_degraded(
+                crop,
+                psm=self.ocr_options.get("psm"),
+                origin=(left, top),
+                page_preprocessed=page.page_preprocessed,
+            )
+            lang = str(self.ocr_options.get("lang", "eng+ara"))
+            return RegionJob(index=idx, box=box, crop=crop, lang=lang, calls=[prepared], kind=kind)
+        height_ratio = box.height / max(1, image.height)
+        default_psm = self.ocr_options.get("psm")
+        line_psm = self.ocr_options.get("line_psm")
+        line_psm_ratio = float(self.ocr_options.get("line_psm_height_ratio", 0.07))
+        psm = default_psm
+        if line_psm is not None and height_ratio <= line_psm_ratio:
+            psm = line_psm
+
+        lang = str(self.ocr_options.get("lang", "eng+ara"))
+        if page.script_router is not None:
+            lang = page.script_router.lang_for_region(page.page_index, image, box, crop)
+
+        calls = [
+            prepare_ocr(
                 crop,
-                lang=str(self.ocr_options.get("lang", "eng+ara")),
+                lang=lang,
                 tesseract_cmd=self.tesseract_cmd,
                 psm=psm,
                 oem=self.ocr_options.get("oem"),
                 whitelist=self.ocr_options.get("whitelist"),
                 extra_config=self.ocr_options.get("extra_config"),
-                scale=float(self.ocr_options.get("scale", 2.0)),
-                binarize=bool(self.ocr_options.get("binarize", True)),
-                denoise=bool(self.ocr_options.get("denoise", True)),
-                sharpen=bool(self.ocr_options.get("sharpen", True)),
+                origin=(left, top),
+                page_preprocessed=page.page_preprocessed,
+                **self._preprocess_options(),
             )
-
-            if self._digits_pass_enabled(height_ratio):
-                digits_text = ocr_image(
+        ]
+        digits = self._digits_pass_enabled(height_ratio)
+        if digits:
+            calls.append(
+                prepare_ocr(
                     crop,
                     lang=str(self.ocr_options.get("lang", "eng+ara")),
                     tesseract_cmd=self.tesseract_cmd,
                     psm=self.ocr_options.get("digits_psm", 7),
                     oem=self.ocr_options.get("oem"),
-                    whitelist=self.ocr_options.get(
-                        "digits_whitelist", "0123456789-/:.,"
-                    ),
+                    whitelist=self.ocr_options.get("digits_whitelist", "0123456789-/:.,"),
                     extra_config=self.ocr_options.get("digits_extra_config"),
-                    scale=float(self.ocr_options.get("scale", 2.0)),
-                    binarize=bool(self.ocr_options.get("binarize", True)),
-                    denoise=bool(self.ocr_options.get("denoise", True)),
-                    sharpen=bool(self.ocr_options.get("sharpen", True)),
+                    page_preprocessed=page.page_preprocessed,
+                    **self._preprocess_options(),
+                )
+            )
+        return RegionJob(
+            index=idx, box=box, crop=crop, lang=lang, calls=calls, kind=kind, digits=digits
+        )
+
+    def _prepare_table(self, page: PageContext, idx: int, grid: TableGrid) -> RegionJob:
+        box = grid.box
+        crop = page.source.crop((box.left, box.top, box.right, box.bottom))
+        lang = str(self.ocr_options.get("lang", "eng+ara"))
+        if page.script_router is not None:
+            lang = page.script_router.lang_for_region(page.page_index, page.image, box, crop)
+        ink_level = int(self.ocr_options.get("ink_level", 128))
+        min_crop_ink = float(self.ocr_options.get("min_crop_ink_ratio", 0.001))
+        calls: List[PreparedOcr] = []
+        rows: List[int] = []
+        for row in range(grid.rows):
+            row_box = grid.row_box(row)
+            gray_strip = strip_lines(
+                page.gray[row_box.top : row_box.bottom, row_box.left : row_box.right],
+                page.horizontal_lines,
+                page.vertical_lines,
+                row_box,
+            )
+            if ink_ratio(gray_strip, ink_level) <= min_crop_ink:
+                continue
+            strip = page.source.crop((row_box.left, row_box.top, row_box.right, row_box.bottom))
+            cleaned = Image.fromarray(
+                strip_lines(np.asarray(strip), page.horizontal_lines, page.vertical_lines, row_box)
+            )
+            strip.close()
+            calls.append(
+                prepare_ocr(
+                    cleaned,
+                    lang=lang,
+                    tesseract_cmd=self.tesseract_cmd,
+                    psm=self.ocr_options.get("table_psm", 6),
+                    oem=self.ocr_options.get("oem"),
+                    whitelist=self.ocr_options.get("whitelist"),
+                    extra_config=self.ocr_options.get("extra_config"),
+                    origin=(row_box.left, row_box.top),
+                    page_preprocessed=page.page_preprocessed,
+                    **self._preprocess_options(),
                 )
-                text = self._prefer_digits(text, digits_text)
-            text = text.strip()
-            if text:
-                chunks.append(text)
-        return "\n".join(chunks)
+            )
+            rows.append(row)
+        return RegionJob(
+            index=idx,
+            box=box,
+            crop=crop,
+            lang=lang,
+            calls=calls,
+            kind="table",
+            table=grid,
+            table_rows=rows,
+        )
+
+    def finish_region(
+        self,
+        page: PageContext,
+        job: RegionJob,
+        results: List[OcrResult],
+    ) -> None:
+        crop_pixels = job.crop.width * job.crop.height
+        if page.debug_writer is not None:
+            page.debug_writer.save_crop(page.base_name, page.page_index, job.index, job.crop)
+        if job.table is not None:
+            page.ocr_pixels += crop_pixels
+            self._finish_table(page, job, results)
+            return
+        page.ocr_pixels += crop_pixels * len(results)
+        result = results[0]
+        text = result.text
+        if job.digits:
+            text = self._prefer_digits(text, results[1].text)
+        text = text.strip()
+        if text:
+            page.chunks.append(text)
+            page.regions.append(
+                OcrRegion(
+                    index=job.index,
+                    box=job.box,
+                    text=text,
+                    lines=result.lines,
+                    lang=job.lang,
+                    kind=job.kind,
+                )
+            )
+
+    def _finish_table(self, page: PageContext, job: RegionJob, results: List[OcrResult]) -> None:
+        row_results: List[OcrResult | None] = [None] * job.table.rows
+        for row, result in zip(job.table_rows, results):
+            row_results[row] = result
+        table = assemble_table(
+            job.table, row_results, rtl=bool(self.order_options.get("rtl", False))
+        )
+        text = table.tsv
+        if not text.strip():
+            return
+        page.chunks.append(text)
+        page.regions.append(
+            OcrRegion(
+                index=job.index,
+                box=job.box,
+                text=text,
+                lines=[line for result in results for line in result.lines],
+                lang=job.lang,
+                kind="table",
+                table=table,
+            )
+        )
+
+    def degrade_page(self, page: PageContext, finished: int) -> bool:
+        page.timeouts += 1
+        page.degraded = True
+        if finished == 0:
+            logger.warning(
+                "Page %d exceeded its OCR time budget; retrying full page", page.page_index + 1
+            )
+            page.chunks, page.regions = [], []
+            page.non_text_regions = 0
+            return False
+        logger.warning(
+            "Page %d exceeded its OCR time budget; OCRing the remaining regions at scale 1",
+            page.page_index + 1,
+        )
+        timeout = float(self.ocr_options.get("degraded_timeout", 0) or 0)
+        page.deadline = time.monotonic() + timeout if timeout > 0 else None
+        return True
+
+    def region_timed_out(self, page: PageContext, idx: int) -> None:
+        logger.warning(
+            "Page %d region %d timed out in degraded mode; leaving it empty",
+            page.page_index + 1,
+            idx,
+        )
+        page.timeouts += 1
+
+    def finish_degraded(self, page: PageContext, fallback: OcrRegion | None) -> None:
+        page.ocr_calls += 1
+        page.ocr_pixels += page.image.width * page.image.height
+        if fallback is None:
+            page.timeouts += 1
+        elif fallback.text:
+            page.chunks.append(fallback.text)
+            page.regions.append(fallback)
+
+    def end_page(self, page: PageContext) -> PageResult:
+        if page.source is not page.image:
+            page.source.close()
+        if page.debug_writer is not None:
+            page.debug_writer.finish_page(page.base_name, page.page_index)
+        page.regions.sort(key=lambda region: region.index)
+        return PageResult(
+            index=page.page_index,
+            width=page.image.width,
+            height=page.image.height,
+            text="\n".join(page.chunks),
+            regions=page.regions,
+            skipped_regions=page.skipped_regions,
+            non_text_regions=page.non_text_regions,
+            ocr_calls=page.ocr_calls,
+            ocr_pixels=page.ocr_pixels,
+            timeouts=page.timeouts,
+            degraded=page.degraded,
+        )
+
+    def ocr_backend(self) -> str:
+        return str(self.ocr_options.get("ocr_backend", OCR_BACKENDS[0]))
+
+    def call_timeout(self, deadline: float | None) -> float:
+        call_timeout = float(self.ocr_options.get("ocr_timeout", 0) or 0)
+        if deadline is None:
+            return call_timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise OcrTimeoutError("Page time budget exceeded")
+        return min(call_timeout, remaining) if call_timeout > 0 else remaining
+
+    def _degraded_page(self, image: Image.Image, page_index: int) -> OcrRegion | None:
+        try:
+            result = run_prepared(
+                self.prepare_degraded(image),
+                timeout=float(self.ocr_options.get("degraded_timeout", 0) or 0),
+                backend=self.ocr_backend(),
+            )
+        except OcrTimeoutError:
+            logger.warning("Page %d degraded OCR timed out; leaving it empty", page_index + 1)
+            return None
+        return self.degraded_region(image, result)
+
+    def prepare_degraded(
+        self,
+        image: Image.Image,
+        psm: int | None = None,
+        origin: Tuple[int, int] = (0, 0),
+        page_preprocessed: bool = False,
+    ) -> PreparedOcr:
+        return prepare_ocr(
+            image,
+            lang=str(self.ocr_options.get("lang", "eng+ara")),
+            tesseract_cmd=self.tesseract_cmd,
+            psm=psm if psm is not None else int(self.ocr_options.get("degraded_psm", 3)),
+            oem=self.ocr_options.get("oem"),
+            scale=1.0,
+            binarize=bool(self.ocr_options.get("binarize", True)),
+            denoise=False,
+            sharpen=False,
+            origin=origin,
+            page_preprocessed=page_preprocessed,
+        )
+
+    def degraded_region(self, image: Image.Image, result: OcrResult) -> OcrRegion:
+        return OcrRegion(
+            index=1,
+            box=Box(0, 0, image.width, image.height),
+            text=result.text.strip(),
+            lines=result.lines,
+            lang=str(self.ocr_options.get("lang", "eng+ara")),
+        )
+
+    def _get_debug_writer(self, debug_dir: Path | None) -> DebugWriter | None:
+        if not debug_dir:
+            return None
+        if self._debug_writer is not None and self._debug_writer.debug_dir != debug_dir:
+            self._close_debug_writer()
+        if self._debug_writer is None:
+            self._debug_writer = DebugWriter(
+                debug_dir,
+                color=str(self.view_options.get("color", "red")),
+                width=int(self.view_options.get("width", 2)),
+                scale=float(self.view_options.get("scale", 1.0)),
+                image_format=str(self.view_options.get("format", "png")),
+                compression=int(self.view_options.get("compression", 1)),
+                crops=str(self.view_options.get("crops", "files")),
+                queue_size=int(self.view_options.get("queue_size", 32)),
+            )
+        return self._debug_writer
+
+    def _close_debug_writer(self, failing: bool = False) -> None:
+        if self._debug_writer is not None:
+            writer, self._debug_writer = self._debug_writer, None
+            writer.close(failing=failing)
+
+    def _preprocess_options(self) -> Dict[str, object]:
+        return {
+            "scale": float(self.ocr_options.get("scale", 2.0)),
+            "binarize": bool(self.ocr_options.get("binarize", True)),
+            "denoise": bool(self.ocr_options.get("denoise", True)),
+            "sharpen": bool(self.ocr_options.get("sharpen", True)),
+            "scale_mode": str(self.ocr_options.get("scale_mode", "fixed")),
+            "target_text_height": float(self.ocr_options.get("target_text_height", 32.0)),
+            "min_scale": float(self.ocr_options.get("min_scale", 0.5)),
+            "max_scale": float(self.ocr_options.get("max_scale", 4.0)),
+        }
+
+    def _line_masks(self, gray: np.ndarray, ink_level: int) -> Tuple[np.ndarray, np.ndarray]:
+        line_length_ratio = float(self.detector_options.get("line_length_ratio", 0.15))
+        line_length = max(10, int(max(gray.shape[:2]) * line_length_ratio))
+        ink = np.where(gray < ink_level, 255, 0).astype(np.uint8)
+        return find_line_masks(
+            ink, line_length, int(self.detector_options.get("line_thickness", 1))
+        )
+
+    def _skipped_kinds(self) -> set[str]:
+        kinds = str(self.ocr_options.get("skip_regions", "figure") or "")
+        return {kind.strip().lower() for kind in kinds.split(",") if kind.strip()}
+
+    def build_script_router(self) -> ScriptRouter:
+        return ScriptRouter(
+            str(self.ocr_options.get("lang", "eng+ara")),
+            mode=str(self.ocr_options.get("script_detect", "off")),
+            min_confidence=float(self.ocr_options.get("script_min_confidence", 2.0)),
+            tesseract_cmd=self.tesseract_cmd,
+            lock_after=int(self.ocr_options.get("script_lock_after", 0)),
+        )
+
+    def _process_shared_page_local(
+        self,
+        handle: SharedPageHandle,
+        page_index: int,
+        base_name: str,
+        debug_dir: Path | None,
+        fallback_full_page: bool,
+        boxes: List[Box] | None = None,
+        document_id: int = 0,
+    ) -> PageResult:
+        with attach_page(handle) as image:
+            result = self._process_page(
+                image,
+                page_index,
+                base_name,
+                debug_dir,
+                fallback_full_page,
+                self._document_router(document_id),
+                boxes=boxes,
+            )
+        if self._debug_writer is not None:
+            self._debug_writer.flush()
+        return result
+
+    def _document_router(self, document_id: int) -> ScriptRouter:
+        if self._worker_router is None or self._worker_router[0] != document_id:
+            self._worker_router = (document_id, self.build_script_router())
+        return self._worker_router[1]
 
     def _digits_pass_enabled(self, height_ratio: float) -> bool:
         if not bool(self.ocr_options.get("digits_pass", False)):
@@ -212,6 +1083,25 @@ class PipelineController:
         return text
 
 
+def _init_page_worker(controller_kwargs: Dict[str, object]) -> None:
+    global _WORKER_CONTROLLER
+    _WORKER_CONTROLLER = PipelineController(**controller_kwargs)
+
+
+def _process_shared_page(
+    handle: SharedPageHandle,
+    page_index: int,
+    base_name: str,
+    debug_dir: Path | None,
+    fallback_full_page: bool,
+    boxes: List[Box] | None = None,
+    document_id: int = 0,
+) -> PageResult:
+    return _WORKER_CONTROLLER._process_shared_page_local(
+        handle, page_index, base_name, debug_dir, fallback_full_page, boxes, document_id
+    )
+
+
 def _count_digits(text: str) -> int:
     return sum(1 for ch in text if ch.isdigit())
 
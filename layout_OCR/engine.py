@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Union
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from controllers.pipeline_controller import PipelineController
+from models.detectors.base import Box
+from models.detectors.simple_cv_detector import SimpleCvConfig
+from models.document_model import Document
+from models.ocr_result import DocumentResult, PageResult
+from utils.config_utils import get_config_value, load_config, profile_defaults, resolve_section
+from utils.pdf_utils import iter_pdf_bytes_images
+
+Source = Union[bytes, bytearray, memoryview, BinaryIO, Image.Image, np.ndarray, str, Path]
+
+
+class LayoutOcrEngine:
+    def __init__(
+        self,
+        profile: str = "default",
+        config_path: str | None = None,
+        detector: str | None = None,
+        ocr_options: Dict[str, object] | None = None,
+        detector_options: Dict[str, object] | None = None,
+        order_options: Dict[str, object] | None = None,
+        dpi: int | None = None,
+        poppler_path: str | None = None,
+        tesseract_cmd: str | None = None,
+    ) -> None:
+        config = load_config(config_path)
+        defaults = profile_defaults(profile, SimpleCvConfig())
+        general = resolve_section(config, "general", defaults["general"])
+        self.profile = profile
+        self.dpi = int(dpi or general["dpi"])
+        self.fallback_full_page = bool(general["fallback_full_page"])
+        self.poppler_path = poppler_path or get_config_value(
+            config, "general", "poppler_path", None, str
+        )
+        self.controller = PipelineController(
+            detector_options={
+                **resolve_section(config, "cv", defaults["cv"]),
+                **(detector_options or {}),
+            },
+            ocr_options={
+                **resolve_section(config, "ocr", defaults["ocr"]),
+                **(ocr_options or {}),
+            },
+            order_options={
+                **resolve_section(config, "order", defaults["order"]),
+                **(order_options or {}),
+            },
+            view_options={},
+            poppler_path=self.poppler_path,
+            tesseract_cmd=tesseract_cmd
+            or get_config_value(config, "general", "tesseract_cmd", None, str),
+            detector_name=str(detector or general["detector"]),
+        )
+
+    def ocr_page(
+        self,
+        image: Image.Image | np.ndarray,
+        page_index: int = 0,
+        boxes: List[Box] | None = None,
+    ) -> PageResult:
+        page = _to_image(image)
+        return self.controller.process_page(
+            page, page_index, boxes=boxes, fallback_full_page=self.fallback_full_page
+        )
+
+    def ocr_document(self, source: Source, dpi: int | None = None) -> DocumentResult:
+        return DocumentResult(pages=list(self.iter_document(source, dpi)))
+
+    def iter_document(self, source: Source, dpi: int | None = None) -> Iterator[PageResult]:
+        router = self.controller.build_script_router()
+        for index, image in enumerate(self._iter_images(source, dpi or self.dpi)):
+            try:
+                yield self.controller.process_page(
+                    image,
+                    index,
+                    fallback_full_page=self.fallback_full_page,
+                    script_router=router,
+                )
+            finally:
+                image.close()
+
+    def _iter_images(self, source: Source, dpi: int) -> Iterator[Image.Image]:
+        if isinstance(source, (Image.Image, np.ndarray)):
+            yield _to_image(source).copy()
+            return
+        if isinstance(source, (str, Path)):
+            pages = Document(Path(source)).iter_pages(dpi, poppler_path=self.poppler_path)
+            for page in pages:
+                yield page.image
+            return
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            data = source.read()
+
+        if data[:5] == b"%PDF-":
+            yield from iter_pdf_bytes_images(data, dpi=dpi, poppler_path=self.poppler_path)
+            return
+        with Image.open(io.BytesIO(data)) as image:
+            for frame in ImageSequence.Iterator(image):
+                yield frame.copy()
+
+
+def _to_image(image: Image.Image | np.ndarray) -> Image.Image:
+    if isinstance(image, Image.Image):
+        return image
+    array = np.asarray(image)
+    if array.dtype != np.uint8:
+        array = np.clip(array, 0, 255).astype(np.uint8)
+    return Image.fromarray(array)
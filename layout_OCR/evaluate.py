@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Callable, List
+
+from models.detectors.simple_cv_detector import SimpleCvConfig
+from utils.config_utils import load_config, pick, profile_defaults, resolve_section, to_bool
+from utils.eval_utils import expand_matrix, run_evaluation
+from utils.tune_utils import find_samples
+
+
+def _list_of(cast: Callable[[str], object]) -> Callable[[str], List[object]]:
+    def parse(value: str) -> List[object]:
+        return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+    return parse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure accuracy and throughput for a matrix of OCR settings."
+    )
+    parser.add_argument(
+        "--corpus",
+        required=True,
+        help="Folder of PDFs/images with a <name>.gt.txt next to each",
+    )
+    parser.add_argument("--config", "-c", default=None, help="Optional config.ini")
+    parser.add_argument("--profiles", type=_list_of(str), default=None, help="e.g. default,arabic")
+    parser.add_argument("--dpi", type=_list_of(int), default=None, help="e.g. 300,500")
+    parser.add_argument("--psm", type=_list_of(int), default=None, help="e.g. 4,6")
+    parser.add_argument("--oem", type=_list_of(int), default=None, help="e.g. 1,3")
+    parser.add_argument("--scale", type=_list_of(float), default=None, help="e.g. 1.5,2.0")
+    parser.add_argument("--binarize", type=_list_of(to_bool), default=None, help="e.g. true,false")
+    parser.add_argument("--denoise", type=_list_of(to_bool), default=None, help="e.g. true,false")
+    parser.add_argument("--sharpen", type=_list_of(to_bool), default=None, help="e.g. true,false")
+    parser.add_argument("--jobs", type=int, default=None, help="Configurations run in parallel")
+    parser.add_argument(
+        "--cache-dir",
+        default=".eval_cache",
+        help="Per-configuration result cache (empty string disables)",
+    )
+    parser.add_argument("--output", "-o", default=None, help="Write results as JSON")
+    parser.add_argument("--poppler-path", default=None, help="Poppler bin folder path")
+    parser.add_argument("--tesseract-cmd", default=None, help="Path to tesseract.exe")
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    config = load_config(args.config)
+
+    default_profile = pick(None, config, "general", "profile", "default", str)
+    poppler_path = pick(args.poppler_path, config, "general", "poppler_path", None, str)
+    tesseract_cmd = pick(args.tesseract_cmd, config, "general", "tesseract_cmd", None, str)
+    samples, _ = find_samples(Path(args.corpus), "text")
+
+    matrix = {
+        "profile": args.profiles,
+        "dpi": args.dpi,
+        "psm": args.psm,
+        "oem": args.oem,
+        "scale": args.scale,
+        "binarize": args.binarize,
+        "denoise": args.denoise,
+        "sharpen": args.sharpen,
+    }
+    runs = []
+    for settings in expand_matrix(matrix):
+        profile_name = str(settings.get("profile", default_profile))
+        profile = profile_defaults(profile_name, SimpleCvConfig())
+        general = resolve_section(config, "general", profile["general"])
+        ocr_options = resolve_section(config, "ocr", profile["ocr"])
+        for key in ("psm", "oem", "scale", "binarize", "denoise", "sharpen"):
+            if key in settings:
+                ocr_options[key] = settings[key]
+        options = {
+            "profile": profile_name,
+            "dpi": settings.get("dpi", general["dpi"]),
+            "detector": general["detector"],
+            "fallback_full_page": general["fallback_full_page"],
+            "ocr_options": ocr_options,
+            "detector_options": resolve_section(config, "cv", profile["cv"]),
+            "order_options": resolve_section(config, "order", profile["order"]),
+        }
+        runs.append(
+            {
+                "label": ", ".join(f"{key}={value}" for key, value in settings.items())
+                or "baseline",
+                "settings": settings,
+                "options": options,
+                "poppler_path": poppler_path,
+                "tesseract_cmd": tesseract_cmd,
+            }
+        )
+
+    print(f"Evaluating {len(runs)} configuration(s) on {len(samples)} file(s)")
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    results = run_evaluation(samples, runs, cache_dir=cache_dir, jobs=args.jobs)
+
+    print(f"{'CER':>7} {'WER':>7} {'pages/s':>8} {'p95 s':>7} {'RSS MB':>7}  settings")
+    for result in sorted(results, key=lambda item: (item["cer"], -item["pages_per_second"])):
+        rss = result.get("peak_rss_mb")
+        rss_text = f"{rss:7.0f}" if rss is not None else f"{'n/a':>7}"
+        cached = " (cached)" if result.get("cached") else ""
+        print(
+            f"{result['cer']:7.4f} {result['wer']:7.4f} {result['pages_per_second']:8.2f} "
+            f"{result['p95_page_seconds']:7.2f} {rss_text}  {result['label']}{cached}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
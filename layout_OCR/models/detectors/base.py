@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, List
 
+import numpy as np
 from PIL import Image
 
 
@@ -30,12 +31,47 @@ class Box:
         return self.top + self.height / 2.0
 
 
+def box_iou(box_a: Box, box_b: Box) -> float:
+    left = max(box_a.left, box_b.left)
+    top = max(box_a.top, box_b.top)
+    right = min(box_a.right, box_b.right)
+    bottom = min(box_a.bottom, box_b.bottom)
+    inter_w = max(0, right - left)
+    inter_h = max(0, bottom - top)
+    inter_area = inter_w * inter_h
+    area_a = box_a.width * box_a.height
+    area_b = box_b.width * box_b.height
+    union = area_a + area_b - inter_area
+    if union <= 0:
+        return 0.0
+    return inter_area / union
+
+
+@dataclass
+class PageLayout:
+    boxes: List[Box]
+    horizontal_lines: np.ndarray | None = None
+    vertical_lines: np.ndarray | None = None
+
+
 class LayoutDetector:
     name = "base"
 
     def detect(self, image: Image.Image) -> List[Box]:
         raise NotImplementedError
 
+    def detect_layout(self, image: Image.Image) -> PageLayout:
+        return PageLayout(self.detect(image))
+
+    def for_tile(
+        self,
+        page_width: int,
+        page_height: int,
+        tile_width: int,
+        tile_height: int,
+    ) -> "LayoutDetector":
+        return self
+
     @staticmethod
     def clip_boxes(boxes: Iterable[Box], width: int, height: int) -> List[Box]:
         clipped = []
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Dict, Type
+
+from .base import LayoutDetector
+from .simple_cv_detector import SimpleCvConfig, SimpleCvDetector
+from .tiled_detector import TiledConfig, TiledDetector
+from .xy_cut_detector import XyCutConfig, XyCutDetector
+
+
+DETECTOR_REGISTRY: Dict[str, Type[LayoutDetector]] = {
+    SimpleCvDetector.name: SimpleCvDetector,
+    XyCutDetector.name: XyCutDetector,
+}
+
+DETECTOR_CONFIGS: Dict[str, type] = {
+    SimpleCvDetector.name: SimpleCvConfig,
+    XyCutDetector.name: XyCutConfig,
+}
+
+
+def available_detectors() -> Dict[str, Type[LayoutDetector]]:
+    return dict(DETECTOR_REGISTRY)
+
+
+def build_detector(name: str, options: dict | None = None) -> LayoutDetector:
+    options = options or {}
+    if name not in DETECTOR_REGISTRY:
+        raise ValueError(f"Unknown detector: {name}")
+
+    config_cls = DETECTOR_CONFIGS.get(name)
+    if config_cls is None:
+        detector = DETECTOR_REGISTRY[name]()
+    else:
+        detector = DETECTOR_REGISTRY[name](_build_config(config_cls, options))
+
+    if int(options.get("tile_size", 0) or 0) > 0:
+        return TiledDetector(detector, _build_config(TiledConfig, options))
+    return detector
+
+
+def _build_config(config_cls: type, options: dict):
+    names = {item.name for item in fields(config_cls)}
+    return config_cls(**{key: value for key, value in options.items() if key in names})
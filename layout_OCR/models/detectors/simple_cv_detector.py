@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, replace
+from typing import List, Tuple
 
 import cv2
 import numpy as np
 from PIL import Image
 
-from .base import Box, LayoutDetector
+from .base import Box, LayoutDetector, PageLayout, box_iou
 
 
 @dataclass
@@ -34,8 +34,36 @@ class SimpleCvDetector(LayoutDetector):
         self.config = config or SimpleCvConfig()
 
     def detect(self, image: Image.Image) -> List[Box]:
+        return self.detect_layout(image).boxes
+
+    def detect_layout(self, image: Image.Image) -> PageLayout:
         rgb = np.array(image.convert("RGB"))
         gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        thresh = self.threshold(gray)
+        if not self.config.remove_lines:
+            return PageLayout(self.boxes_from_masks(thresh, thresh))
+        horiz, vert = self.line_masks(thresh)
+        cleaned = cv2.bitwise_and(thresh, cv2.bitwise_not(cv2.bitwise_or(horiz, vert)))
+        return PageLayout(self.boxes_from_masks(thresh, cleaned), horiz, vert)
+
+    def for_tile(
+        self,
+        page_width: int,
+        page_height: int,
+        tile_width: int,
+        tile_height: int,
+    ) -> "SimpleCvDetector":
+        length_scale = max(page_width, page_height) / max(1, max(tile_width, tile_height))
+        area_scale = (page_width * page_height) / max(1, tile_width * tile_height)
+        config = replace(
+            self.config,
+            line_length_ratio=min(1.0, self.config.line_length_ratio * length_scale),
+            max_area_ratio=min(1.0, self.config.max_area_ratio * area_scale),
+            border_margin=0,
+        )
+        return SimpleCvDetector(config)
+
+    def threshold(self, gray: np.ndarray) -> np.ndarray:
         block_size = max(3, int(self.config.adaptive_block_size))
         if block_size % 2 == 0:
             block_size += 1
@@ -53,29 +81,28 @@ class SimpleCvDetector(LayoutDetector):
             thresh[-margin:, :] = 0
             thresh[:, :margin] = 0
             thresh[:, -margin:] = 0
-        thresh_raw = thresh.copy()
-
-        if self.config.remove_lines:
-            max_dim = max(image.width, image.height)
-            line_length = max(10, int(max_dim * self.config.line_length_ratio))
-            thickness = max(1, int(self.config.line_thickness))
-            horiz_kernel = cv2.getStructuringElement(
-                cv2.MORPH_RECT, (line_length, thickness)
-            )
-            vert_kernel = cv2.getStructuringElement(
-                cv2.MORPH_RECT, (thickness, line_length)
-            )
-            horiz = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, horiz_kernel, iterations=1)
-            vert = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, vert_kernel, iterations=1)
-            lines = cv2.bitwise_or(horiz, vert)
-            thresh = cv2.bitwise_and(thresh, cv2.bitwise_not(lines))
-
+        return thresh
+
+    def remove_lines(self, thresh: np.ndarray) -> np.ndarray:
+        if not self.config.remove_lines:
+            return thresh
+        horiz, vert = self.line_masks(thresh)
+        lines = cv2.bitwise_or(horiz, vert)
+        return cv2.bitwise_and(thresh, cv2.bitwise_not(lines))
+
+    def line_masks(self, thresh: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        max_dim = max(thresh.shape[:2])
+        line_length = max(10, int(max_dim * self.config.line_length_ratio))
+        return find_line_masks(thresh, line_length, self.config.line_thickness)
+
+    def boxes_from_masks(self, thresh_raw: np.ndarray, thresh: np.ndarray) -> List[Box]:
+        height, width = thresh.shape[:2]
         kernel = cv2.getStructuringElement(
             cv2.MORPH_RECT,
             (self.config.kernel_width, self.config.kernel_height),
         )
         merged = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel, iterations=1)
-        max_area = int(self.config.max_area_ratio * image.width * image.height)
+        max_area = int(self.config.max_area_ratio * width * height)
         boxes = self._extract_boxes(merged, max_area)
         if self.config.merge_linefree:
             merged_raw = cv2.morphologyEx(
@@ -90,7 +117,7 @@ class SimpleCvDetector(LayoutDetector):
             )
         if not boxes:
             boxes = self._extract_boxes(thresh, max_area)
-        return self.clip_boxes(boxes, image.width, image.height)
+        return self.clip_boxes(boxes, width, height)
 
     def _extract_boxes(self, mask: np.ndarray, max_area: int) -> List[Box]:
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -119,7 +146,7 @@ class SimpleCvDetector(LayoutDetector):
         for box in combined:
             should_keep = True
             for existing in kept:
-                iou = _iou(box, existing)
+                iou = box_iou(box, existing)
                 if iou >= iou_threshold:
                     ratio = min(box.width * box.height, existing.width * existing.height) / max(
                         1, max(box.width * box.height, existing.width * existing.height)
@@ -132,17 +159,12 @@ class SimpleCvDetector(LayoutDetector):
         return kept
 
 
-def _iou(box_a: Box, box_b: Box) -> float:
-    left = max(box_a.left, box_b.left)
-    top = max(box_a.top, box_b.top)
-    right = min(box_a.right, box_b.right)
-    bottom = min(box_a.bottom, box_b.bottom)
-    inter_w = max(0, right - left)
-    inter_h = max(0, bottom - top)
-    inter_area = inter_w * inter_h
-    area_a = box_a.width * box_a.height
-    area_b = box_b.width * box_b.height
-    union = area_a + area_b - inter_area
-    if union <= 0:
-        return 0.0
-    return inter_area / union
+def find_line_masks(
+    thresh: np.ndarray, line_length: int, thickness: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    thickness = max(1, int(thickness))
+    horiz_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (line_length, thickness))
+    vert_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (thickness, line_length))
+    horiz = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, horiz_kernel, iterations=1)
+    vert = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, vert_kernel, iterations=1)
+    return horiz, vert
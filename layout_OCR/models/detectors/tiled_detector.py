@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .base import Box, LayoutDetector, PageLayout
+
+
+@dataclass
+class TiledConfig:
+    tile_size: int = 4096
+    tile_overlap: int = 256
+    tile_workers: int = 1
+
+
+class TiledDetector(LayoutDetector):
+    name = "tiled"
+
+    def __init__(self, inner: LayoutDetector, config: TiledConfig | None = None) -> None:
+        self.inner = inner
+        self.config = config or TiledConfig()
+
+    def tiles_page(self, image: Image.Image) -> bool:
+        tile_size = max(1, int(self.config.tile_size))
+        return image.width > tile_size or image.height > tile_size
+
+    def detect_layout(self, image: Image.Image) -> PageLayout:
+        if not self.tiles_page(image):
+            return self.inner.detect_layout(image)
+        return self._detect_tiles(image, masks=True)
+
+    def detect(self, image: Image.Image) -> List[Box]:
+        if not self.tiles_page(image):
+            return self.inner.detect(image)
+        return self._detect_tiles(image, masks=False).boxes
+
+    def _detect_tiles(self, image: Image.Image, masks: bool) -> PageLayout:
+        tile_size = max(1, int(self.config.tile_size))
+        overlap = max(0, min(int(self.config.tile_overlap), tile_size // 2))
+        xs = _tile_starts(image.width, tile_size, overlap)
+        ys = _tile_starts(image.height, tile_size, overlap)
+        tiles = [
+            (x, y, min(image.width, x + tile_size), min(image.height, y + tile_size))
+            for y in ys
+            for x in xs
+        ]
+        tile_detector = self.inner.for_tile(
+            image.width, image.height, min(tile_size, image.width), min(tile_size, image.height)
+        )
+
+        def detect_tile(tile: Tuple[int, int, int, int]) -> PageLayout:
+            left, top, right, bottom = tile
+            crop = image.crop(tile)
+            try:
+                if masks:
+                    layout = tile_detector.detect_layout(crop)
+                else:
+                    layout = PageLayout(tile_detector.detect(crop))
+            finally:
+                crop.close()
+            layout.boxes = [
+                Box(box.left + left, box.top + top, box.right + left, box.bottom + top)
+                for box in layout.boxes
+            ]
+            return layout
+
+        workers = max(1, int(self.config.tile_workers))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                tile_boxes, horizontal, vertical = _collect_tiles(
+                    executor.map(detect_tile, tiles), tiles, image.size
+                )
+        else:
+            tile_boxes, horizontal, vertical = _collect_tiles(
+                map(detect_tile, tiles), tiles, image.size
+            )
+
+        boxes = _stitch(tile_boxes, _seam_bands(xs, tile_size), _seam_bands(ys, tile_size))
+        max_area_ratio = float(getattr(getattr(self.inner, "config", None), "max_area_ratio", 0))
+        max_area = int(max_area_ratio * image.width * image.height)
+        if max_area > 0:
+            boxes = [box for box in boxes if box.width * box.height <= max_area]
+        return PageLayout(self.clip_boxes(boxes, image.width, image.height), horizontal, vertical)
+
+
+def _collect_tiles(
+    layouts: Iterable[PageLayout],
+    tiles: List[Tuple[int, int, int, int]],
+    size: Tuple[int, int],
+) -> Tuple[List[List[Box]], np.ndarray | None, np.ndarray | None]:
+    tile_boxes: List[List[Box]] = []
+    horizontal = vertical = None
+    has_masks = True
+    for (left, top, right, bottom), layout in zip(tiles, layouts):
+        tile_boxes.append(layout.boxes)
+        if layout.horizontal_lines is None or layout.vertical_lines is None:
+            has_masks = False
+        if not has_masks:
+            horizontal = vertical = None
+            continue
+        if horizontal is None:
+            horizontal = np.zeros((size[1], size[0]), dtype=np.uint8)
+            vertical = np.zeros((size[1], size[0]), dtype=np.uint8)
+        for target, mask in (
+            (horizontal, layout.horizontal_lines),
+            (vertical, layout.vertical_lines),
+        ):
+            region = target[top:bottom, left:right]
+            np.maximum(region, mask, out=region)
+    return tile_boxes, horizontal, vertical
+
+
+def _tile_starts(length: int, tile_size: int, overlap: int) -> List[int]:
+    if length <= tile_size:
+        return [0]
+    step = max(1, tile_size - overlap)
+    starts = list(range(0, length - tile_size, step))
+    starts.append(length - tile_size)
+    return starts
+
+
+def _seam_bands(starts: List[int], tile_size: int) -> List[Tuple[int, int]]:
+    return [(nxt, prev + tile_size) for prev, nxt in zip(starts, starts[1:])]
+
+
+def _in_band(low: int, high: int, bands: List[Tuple[int, int]]) -> bool:
+    return any(low <= band_high and high >= band_low for band_low, band_high in bands)
+
+
+def _stitch(
+    tile_boxes: List[List[Box]],
+    x_bands: List[Tuple[int, int]],
+    y_bands: List[Tuple[int, int]],
+) -> List[Box]:
+    boxes: List[Box] = []
+    owners: List[int] = []
+    for tile_index, tile in enumerate(tile_boxes):
+        boxes.extend(tile)
+        owners.extend([tile_index] * len(tile))
+
+    seam = [
+        index
+        for index, box in enumerate(boxes)
+        if _in_band(box.left, box.right, x_bands) or _in_band(box.top, box.bottom, y_bands)
+    ]
+    parent = list(range(len(boxes)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for pos, i in enumerate(seam):
+        for j in seam[pos + 1 :]:
+            if owners[i] == owners[j]:
+                continue
+            a, b = boxes[i], boxes[j]
+            if a.left <= b.right and b.left <= a.right and a.top <= b.bottom and b.top <= a.bottom:
+                parent[find(i)] = find(j)
+
+    groups: Dict[int, Box] = {}
+    order: List[int] = []
+    for index, box in enumerate(boxes):
+        root = find(index)
+        current = groups.get(root)
+        if current is None:
+            groups[root] = box
+            order.append(root)
+        else:
+            groups[root] = Box(
+                min(current.left, box.left),
+                min(current.top, box.top),
+                max(current.right, box.right),
+                max(current.bottom, box.bottom),
+            )
+    return [groups[root] for root in order]
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .base import Box, LayoutDetector
+
+
+@dataclass
+class XyCutConfig:
+    min_area: int = 50
+    border_margin: int = 2
+    max_area_ratio: float = 0.85
+    min_gap_x_ratio: float = 0.015
+    min_gap_y_ratio: float = 0.006
+    noise_ratio: float = 0.002
+    max_depth: int = 16
+    work_max_side: int = 2000
+
+
+class XyCutDetector(LayoutDetector):
+    name = "xy_cut"
+
+    def __init__(self, config: XyCutConfig | None = None) -> None:
+        self.config = config or XyCutConfig()
+
+    def detect(self, image: Image.Image) -> List[Box]:
+        gray = np.asarray(image.convert("L"))
+        _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        if self.config.border_margin > 0:
+            margin = int(self.config.border_margin)
+            ink[:margin, :] = 0
+            ink[-margin:, :] = 0
+            ink[:, :margin] = 0
+            ink[:, -margin:] = 0
+
+        factor = min(1.0, self.config.work_max_side / max(1, max(image.width, image.height)))
+        if factor < 1.0:
+            work_size = (max(1, int(image.width * factor)), max(1, int(image.height * factor)))
+            ink = cv2.resize(ink, work_size, interpolation=cv2.INTER_AREA)
+        mask = ink > 0
+
+        height, width = mask.shape
+        min_gap_x = max(1, int(round(self.config.min_gap_x_ratio * width)))
+        min_gap_y = max(1, int(round(self.config.min_gap_y_ratio * height)))
+        regions: List[Tuple[int, int, int, int]] = []
+        self._cut(mask, 0, 0, width, height, 0, min_gap_x, min_gap_y, regions)
+
+        scale_x = image.width / width
+        scale_y = image.height / height
+        max_area = int(self.config.max_area_ratio * image.width * image.height)
+        boxes: List[Box] = []
+        for left, top, right, bottom in regions:
+            box = Box(
+                int(left * scale_x),
+                int(top * scale_y),
+                int(np.ceil(right * scale_x)),
+                int(np.ceil(bottom * scale_y)),
+            )
+            area = box.width * box.height
+            if area < self.config.min_area:
+                continue
+            if max_area > 0 and area > max_area:
+                continue
+            boxes.append(box)
+        return self.clip_boxes(boxes, image.width, image.height)
+
+    def _cut(
+        self,
+        mask: np.ndarray,
+        left: int,
+        top: int,
+        right: int,
+        bottom: int,
+        depth: int,
+        min_gap_x: int,
+        min_gap_y: int,
+        regions: List[Tuple[int, int, int, int]],
+    ) -> None:
+        region = mask[top:bottom, left:right]
+        rows = np.count_nonzero(region, axis=1)
+        cols = np.count_nonzero(region, axis=0)
+        row_ink = rows > self.config.noise_ratio * (right - left)
+        col_ink = cols > self.config.noise_ratio * (bottom - top)
+        if not row_ink.any() or not col_ink.any():
+            return
+
+        row_idx = np.flatnonzero(row_ink)
+        col_idx = np.flatnonzero(col_ink)
+        top, bottom = top + int(row_idx[0]), top + int(row_idx[-1]) + 1
+        left, right = left + int(col_idx[0]), left + int(col_idx[-1]) + 1
+        row_ink = row_ink[row_idx[0] : row_idx[-1] + 1]
+        col_ink = col_ink[col_idx[0] : col_idx[-1] + 1]
+
+        if depth >= self.config.max_depth:
+            regions.append((left, top, right, bottom))
+            return
+
+        row_gaps = _find_gaps(row_ink, min_gap_y)
+        col_gaps = _find_gaps(col_ink, min_gap_x)
+        widest_row = max((end - start for start, end in row_gaps), default=0) / min_gap_y
+        widest_col = max((end - start for start, end in col_gaps), default=0) / min_gap_x
+
+        if row_gaps and widest_row >= widest_col:
+            for start, end in _segments(row_gaps, bottom - top):
+                self._cut(
+                    mask,
+                    left,
+                    top + start,
+                    right,
+                    top + end,
+                    depth + 1,
+                    min_gap_x,
+                    min_gap_y,
+                    regions,
+                )
+        elif col_gaps:
+            for start, end in _segments(col_gaps, right - left):
+                self._cut(
+                    mask,
+                    left + start,
+                    top,
+                    left + end,
+                    bottom,
+                    depth + 1,
+                    min_gap_x,
+                    min_gap_y,
+                    regions,
+                )
+        else:
+            regions.append((left, top, right, bottom))
+
+
+def _find_gaps(has_ink: np.ndarray, min_gap: int) -> List[Tuple[int, int]]:
+    blank = np.concatenate(([0], (~has_ink).astype(np.int8), [0]))
+    edges = np.diff(blank)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) >= min_gap
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+def _segments(gaps: List[Tuple[int, int]], length: int) -> List[Tuple[int, int]]:
+    segments: List[Tuple[int, int]] = []
+    cursor = 0
+    for start, end in gaps:
+        if start > cursor:
+            segments.append((cursor, start))
+        cursor = end
+    if cursor < length:
+        segments.append((cursor, length))
+    return segments
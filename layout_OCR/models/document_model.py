@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 from PIL import Image
 
-from utils.pdf_utils import pdf_to_images
+from utils.pdf_utils import iter_pdf_images, pdf_to_images
 
 
 @dataclass
@@ -34,3 +34,14 @@ class Document:
 
         image = Image.open(self.path)
         return [DocumentPage(index=0, image=image, source_name=self.path.stem)]
+
+    def iter_pages(
+        self, dpi: int, poppler_path: str | None = None, window: int = 1
+    ) -> Iterator[DocumentPage]:
+        if not self.is_pdf:
+            yield from self.load_pages(dpi, poppler_path=poppler_path)
+            return
+
+        images = iter_pdf_images(self.path, dpi=dpi, poppler_path=poppler_path, window=window)
+        for index, image in enumerate(images):
+            yield DocumentPage(index=index, image=image, source_name=self.path.stem)
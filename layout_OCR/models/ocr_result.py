@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List
+
+from models.detectors.base import Box
+
+
+@dataclass
+class OcrWord:
+    text: str
+    conf: float
+    box: Box
+
+
+@dataclass
+class OcrLine:
+    box: Box
+    words: List[OcrWord] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return " ".join(word.text for word in self.words)
+
+
+@dataclass
+class OcrResult:
+    text: str
+    lines: List[OcrLine] = field(default_factory=list)
+
+
+@dataclass
+class TableCell:
+    row: int
+    col: int
+    box: Box
+    text: str
+
+
+@dataclass
+class OcrTable:
+    rows: int
+    cols: int
+    cells: List[TableCell] = field(default_factory=list)
+
+    @property
+    def tsv(self) -> str:
+        grid = [[""] * self.cols for _ in range(self.rows)]
+        for cell in self.cells:
+            grid[cell.row][cell.col] = " ".join(cell.text.split())
+        return "\n".join("\t".join(row) for row in grid)
+
+
+@dataclass
+class OcrRegion:
+    index: int
+    box: Box
+    text: str
+    lines: List[OcrLine] = field(default_factory=list)
+    lang: str = ""
+    kind: str = "text"
+    table: OcrTable | None = None
+
+
+@dataclass
+class PageResult:
+    index: int
+    width: int
+    height: int
+    text: str
+    regions: List[OcrRegion] = field(default_factory=list)
+    blank: bool = False
+    skipped_regions: int = 0
+    non_text_regions: int = 0
+    ocr_calls: int = 0
+    ocr_pixels: int = 0
+    timeouts: int = 0
+    degraded: bool = False
+
+
+@dataclass
+class DocumentResult:
+    pages: List[PageResult] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(page.text for page in self.pages if page.text)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from models.ocr_result import PageResult
+
+
+@dataclass
+class RunReport:
+    files: int = 0
+    unchanged_files: int = 0
+    failed_files: int = 0
+    pages: int = 0
+    blank_pages: int = 0
+    regions: int = 0
+    skipped_regions: int = 0
+    non_text_regions: int = 0
+    ocr_calls: int = 0
+    ocr_pixels: int = 0
+    timeouts: int = 0
+    degraded_pages: int = 0
+
+    def add_page(self, page: PageResult) -> None:
+        self.pages += 1
+        self.blank_pages += int(page.blank)
+        self.regions += len(page.regions) - page.non_text_regions
+        self.skipped_regions += page.skipped_regions
+        self.non_text_regions += page.non_text_regions
+        self.ocr_calls += page.ocr_calls
+        self.ocr_pixels += page.ocr_pixels
+        self.timeouts += page.timeouts
+        self.degraded_pages += int(page.degraded)
+
+    def summary(self) -> str:
+        return (
+            f"files={self.files} unchanged_files={self.unchanged_files} "
+            f"failed_files={self.failed_files} pages={self.pages} blank_pages={self.blank_pages} "
+            f"regions={self.regions} skipped_regions={self.skipped_regions} "
+            f"non_text_regions={self.non_text_regions} "
+            f"ocr_calls={self.ocr_calls} ocr_megapixels={self.ocr_pixels / 1e6:.1f} "
+            f"timeouts={self.timeouts} degraded_pages={self.degraded_pages}"
+        )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import fields
+from pathlib import Path
+
+from models.detectors.simple_cv_detector import SimpleCvConfig
+from utils.config_utils import load_config, pick, profile_defaults, resolve_section
+from utils.tune_utils import (
+    expand_grid,
+    find_samples,
+    format_profile_section,
+    parse_grid,
+    run_tuning,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Search SimpleCvConfig parameters against ground-truth samples."
+    )
+    parser.add_argument(
+        "--samples",
+        "-s",
+        required=True,
+        help="Folder of PDFs/images with <name>.boxes.json or <name>.gt.txt next to each",
+    )
+    parser.add_argument("--config", "-c", default=None, help="Optional config.ini")
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Profile name used as the search baseline: default or arabic",
+    )
+    parser.add_argument("--dpi", type=int, default=None, help="PDF render DPI")
+    parser.add_argument(
+        "--metric",
+        choices=["auto", "boxes", "text"],
+        default="auto",
+        help="Score by box F1 (boxes) or 1 - CER after OCR (text)",
+    )
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=None,
+        help="Search values, e.g. --grid kernel_width=6,10,16 (repeatable)",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--top", type=int, default=10, help="Number of results to print")
+    parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="Write the best [cv] section to this file",
+    )
+    parser.add_argument("--poppler-path", default=None, help="Poppler bin folder path")
+    parser.add_argument("--tesseract-cmd", default=None, help="Path to tesseract.exe")
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    config = load_config(args.config)
+
+    profile_name = pick(args.profile, config, "general", "profile", "default", str)
+    profile = profile_defaults(profile_name, SimpleCvConfig())
+    dpi = pick(args.dpi, config, "general", "dpi", profile["general"]["dpi"], int)
+    poppler_path = pick(args.poppler_path, config, "general", "poppler_path", None, str)
+    tesseract_cmd = pick(args.tesseract_cmd, config, "general", "tesseract_cmd", None, str)
+
+    samples, metric = find_samples(Path(args.samples), args.metric)
+    cv_names = {item.name for item in fields(SimpleCvConfig)}
+    base = {
+        key: value
+        for key, value in resolve_section(config, "cv", profile["cv"]).items()
+        if key in cv_names
+    }
+    candidates = expand_grid(base, parse_grid(args.grid))
+    print(f"Tuning {len(candidates)} candidates on {len(samples)} sample(s) by {metric}")
+
+    results = run_tuning(
+        samples,
+        candidates,
+        metric,
+        dpi,
+        jobs=args.jobs,
+        poppler_path=poppler_path,
+        controller_options={
+            "ocr_options": resolve_section(config, "ocr", profile["ocr"]),
+            "order_options": resolve_section(config, "order", profile["order"]),
+            "tesseract_cmd": tesseract_cmd,
+        },
+    )
+
+    for rank, result in enumerate(results[: max(1, args.top)], start=1):
+        changed = {
+            key: value for key, value in result.params.items() if value != base.get(key)
+        }
+        print(
+            f"{rank:>3}. accuracy={result.accuracy:.4f} "
+            f"pages/s={result.pages_per_second:.2f} {changed or '(baseline)'}"
+        )
+
+    if results:
+        section = format_profile_section(results[0])
+        if args.output:
+            Path(args.output).write_text(section, encoding="utf-8")
+            print(f"Wrote: {args.output}")
+        else:
+            print()
+            print(section, end="")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+from PIL import Image
+
+from utils.ink_utils import set_image_dpi
+from utils.ocr_utils import (
+    OCR_BACKENDS,
+    OcrTimeoutError,
+    PreparedOcr,
+    encode_pnm,
+    parse_tsv,
+    tesseract_data,
+    tesseract_stdin_command,
+)
+from utils.pdf_utils import POPPLER_MISSING, poppler_tool
+
+
+async def tesseract_data_async(
+    prepared: PreparedOcr,
+    timeout: float = 0,
+    backend: str = OCR_BACKENDS[0],
+) -> Dict[str, list]:
+    if backend != "stdin":
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, tesseract_data, prepared.image, prepared.lang, prepared.config, timeout, backend
+        )
+
+    process = await asyncio.create_subprocess_exec(
+        *tesseract_stdin_command(prepared.lang, prepared.config),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(encode_pnm(prepared.image)), timeout or None
+        )
+    except asyncio.TimeoutError as err:
+        raise OcrTimeoutError(f"Tesseract exceeded {timeout:.1f}s") from err
+    finally:
+        await _reap(process)
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Tesseract failed ({process.returncode}): {message}")
+    return parse_tsv(stdout.decode("utf-8", errors="replace"))
+
+
+async def iter_pdf_images_async(
+    source: bytes | Path,
+    dpi: int = 200,
+    poppler_path: str | None = None,
+) -> AsyncIterator[Image.Image]:
+    command = [poppler_tool("pdftoppm", poppler_path), "-r", str(dpi)]
+    data = None
+    if isinstance(source, Path):
+        command.append(str(source))
+    else:
+        command.append("-")
+        data = bytes(source)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError as err:
+        raise RuntimeError(POPPLER_MISSING) from err
+
+    feeder = None
+    if data is not None:
+        feeder = asyncio.ensure_future(_feed_stdin(process.stdin, data))
+    stderr_task = asyncio.ensure_future(process.stderr.read())
+    try:
+        while True:
+            image = await _read_pnm(process.stdout)
+            if image is None:
+                break
+            yield set_image_dpi(image, dpi)
+        if feeder is not None:
+            await feeder
+        stderr = await stderr_task
+        returncode = await process.wait()
+    finally:
+        if feeder is not None:
+            feeder.cancel()
+        stderr_task.cancel()
+        await _reap(process)
+    if returncode != 0:
+        message = stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"pdftoppm failed ({returncode}): {message}")
+
+
+async def _reap(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+
+async def _feed_stdin(stream: asyncio.StreamWriter, data: bytes) -> None:
+    try:
+        stream.write(data)
+        await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        stream.close()
+
+
+async def _read_pnm(stream: asyncio.StreamReader) -> Image.Image | None:
+    tokens: List[bytes] = []
+    while len(tokens) < 4:
+        line = await stream.readline()
+        if not line:
+            return None
+        line = line.split(b"#", 1)[0]
+        tokens.extend(line.split())
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if maxval != 255 or magic not in (b"P5", b"P6"):
+        raise RuntimeError(f"Unsupported pdftoppm output: {magic!r} maxval {maxval}")
+    mode = "RGB" if magic == b"P6" else "L"
+    size = width * height * (3 if mode == "RGB" else 1)
+    try:
+        pixels = await stream.readexactly(size)
+    except asyncio.IncompleteReadError as err:
+        raise RuntimeError("Truncated pdftoppm output") from err
+    return Image.frombytes(mode, (width, height), pixels)
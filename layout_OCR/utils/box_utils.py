@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from models.detectors.base import Box
+from utils.state_utils import hash_file
+
+BOX_FILE_VERSION = 1
+
+
+@dataclass
+class PageBoxes:
+    index: int
+    width: int
+    height: int
+    boxes: List[Box] = field(default_factory=list)
+
+
+@dataclass
+class BoxFile:
+    path: Path
+    source: str
+    sha256: str
+    dpi: int
+    detector: str
+    config_hash: str
+    digest: str = ""
+    pages: Dict[int, PageBoxes] = field(default_factory=dict)
+
+    def check_dpi(self, dpi: int) -> None:
+        if self.dpi != dpi:
+            raise ValueError(
+                f"{self.path} was detected at {self.dpi} DPI but OCR runs at {dpi} DPI"
+            )
+
+    def page_boxes(self, index: int, width: int, height: int) -> List[Box]:
+        page = self.pages.get(index)
+        if page is None:
+            raise ValueError(f"{self.path} has no boxes for page {index + 1}")
+        if (page.width, page.height) != (width, height):
+            raise ValueError(
+                f"{self.path} page {index + 1} is {page.width}x{page.height} "
+                f"but the rendered page is {width}x{height}"
+            )
+        return list(page.boxes)
+
+
+def collect_box_files(input_path: Path) -> List[Path]:
+    if input_path.is_file():
+        return [input_path]
+    return sorted(
+        path
+        for path in input_path.rglob("*.boxes.*")
+        if path.is_file() and path.suffix.lower() in (".jsonl", ".npz")
+    )
+
+
+def load_box_index(input_path: Path) -> Dict[str, BoxFile]:
+    box_paths = collect_box_files(input_path)
+    if not box_paths:
+        raise FileNotFoundError(f"No box files found in {input_path}")
+
+    index: Dict[str, BoxFile] = {}
+    for box_path in box_paths:
+        box_file = read_box_file(box_path)
+        other = index.get(box_file.sha256)
+        if other is not None:
+            raise ValueError(f"{box_path} and {other.path} describe the same document")
+        index[box_file.sha256] = box_file
+    return index
+
+
+def read_box_file(path: Path) -> BoxFile:
+    if path.suffix.lower() == ".npz":
+        with np.load(path) as data:
+            return _from_arrays(path, data)
+
+    with path.open("r", encoding="utf-8") as handle:
+        lines = [line for line in handle if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty box file: {path}")
+    header = json.loads(lines[0])
+    pages = [_page_from_dict(json.loads(line)) for line in lines[1:]]
+    return _box_file(path, header, pages)
+
+
+def _page_from_dict(data: Dict[str, object]) -> PageBoxes:
+    return PageBoxes(
+        index=int(data["page"]) - 1,
+        width=int(data["width"]),
+        height=int(data["height"]),
+        boxes=[Box(*(int(value) for value in box)) for box in data.get("boxes", [])],
+    )
+
+
+def _box_file(path: Path, header: Dict[str, object], pages: List[PageBoxes]) -> BoxFile:
+    version = int(header.get("version", 0))
+    if version != BOX_FILE_VERSION:
+        raise ValueError(f"Unsupported box file version in {path}: {version}")
+    return BoxFile(
+        path=path,
+        source=str(header["source"]),
+        sha256=str(header["sha256"]),
+        dpi=int(header["dpi"]),
+        detector=str(header["detector"]),
+        config_hash=str(header["config_hash"]),
+        digest=hash_file(path),
+        pages={page.index: page for page in pages},
+    )
+
+
+def _from_arrays(path: Path, data) -> BoxFile:
+    header = json.loads(str(data["header"]))
+    pages = {
+        int(index): PageBoxes(index=int(index), width=int(width), height=int(height))
+        for index, width, height in data["pages"]
+    }
+    for index, left, top, right, bottom in data["boxes"]:
+        pages[int(index)].boxes.append(Box(int(left), int(top), int(right), int(bottom)))
+    return _box_file(path, header, list(pages.values()))
@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import configparser
 from pathlib import Path
-from typing import Callable, TypeVar
+from typing import Callable, Dict, TypeVar
+
+from models.detectors.simple_cv_detector import SimpleCvConfig
+from models.detectors.tiled_detector import TiledConfig
+from models.detectors.xy_cut_detector import XyCutConfig
+from utils.ocr_utils import OCR_BACKENDS
 
 T = TypeVar("T")
 
@@ -35,3 +40,173 @@ def get_config_value(
 def to_bool(value: str) -> bool:
     value = value.strip().lower()
     return value in {"1", "true", "yes", "y", "on"}
+
+
+def cast_for(default: object) -> Callable[[str], object]:
+    if isinstance(default, bool):
+        return to_bool
+    if isinstance(default, int):
+        return int
+    if isinstance(default, float):
+        return float
+    return str
+
+
+def resolve_section(
+    config: configparser.ConfigParser | None,
+    section: str,
+    defaults: Dict[str, object],
+) -> Dict[str, object]:
+    return {
+        key: get_config_value(config, section, key, default, cast_for(default))
+        for key, default in defaults.items()
+    }
+
+
+def pick(value, config, section: str, key: str, default, cast):
+    if value is not None:
+        return value
+    return get_config_value(config, section, key, default, cast)
+
+
+def profile_defaults(name: str, cv_defaults: SimpleCvConfig) -> dict:
+    base = {
+        "general": {
+            "dpi": 500,
+            "output_dir": "output",
+            "include_page_breaks": False,
+            "fallback_full_page": True,
+            "flush_pages": False,
+            "workers": 1,
+            "memory_budget_mb": 0.0,
+            "render_window": 1,
+            "schedule": "fifo",
+            "seconds_per_megapixel": 0.3,
+            "seconds_per_page": 0.2,
+            "predict_runtime": False,
+            "incremental": False,
+            "watch_interval": 5.0,
+            "settle_seconds": 2.0,
+            "structured_output": "none",
+            "table_output": "none",
+            "detector": "simple_cv",
+            "log_level": "WARNING",
+        },
+        "ocr": {
+            "lang": "eng+ara",
+            "psm": 6,
+            "oem": 1,
+            "scale": 2.0,
+            "scale_mode": "fixed",
+            "target_text_height": 32.0,
+            "min_scale": 0.5,
+            "max_scale": 4.0,
+            "binarize": True,
+            "denoise": True,
+            "sharpen": True,
+            "preprocess_scope": "crop",
+            "page_threshold": "otsu",
+            "page_block_size": 31,
+            "page_threshold_c": 15,
+            "ocr_backend": OCR_BACKENDS[0],
+            "ocr_timeout": 0.0,
+            "page_timeout": 0.0,
+            "degraded_psm": 3,
+            "degraded_timeout": 0.0,
+            "crop_padding": 4,
+            "blank_page_ink_ratio": 0.0005,
+            "min_crop_ink_ratio": 0.001,
+            "ink_level": 128,
+            "trim_crops": True,
+            "classify_regions": True,
+            "skip_regions": "figure",
+            "text_min_height_pt": 3.0,
+            "figure_ink_ratio": 0.45,
+            "figure_component_ratio": 0.6,
+            "table_line_ratio": 0.1,
+            "rule_aspect_ratio": 15.0,
+            "detect_tables": False,
+            "table_psm": 6,
+            "table_min_cols": 2,
+            "table_min_cell_size": 8,
+            "table_min_rows": 2,
+            "table_max_row_height": 8.0,
+            "line_psm": 7,
+            "line_psm_height_ratio": 0.07,
+            "digits_pass": False,
+            "digits_height_ratio": 0.08,
+            "digits_whitelist": "0123456789-/:.,٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹",
+            "digits_psm": 7,
+            "digits_min_chars": 2,
+            "digits_pass_scope": "short",
+            "digits_replace": False,
+            "whitelist": None,
+            "extra_config": None,
+            "digits_extra_config": None,
+            "script_detect": "off",
+            "script_min_confidence": 2.0,
+            "script_lock_after": 0,
+        },
+        "order": {
+            "rtl": False,
+            "column_overlap_ratio": 0.3,
+        },
+        "cv": {
+            "min_area": cv_defaults.min_area,
+            "kernel_width": cv_defaults.kernel_width,
+            "kernel_height": cv_defaults.kernel_height,
+            "adaptive_block_size": cv_defaults.adaptive_block_size,
+            "adaptive_c": cv_defaults.adaptive_c,
+            "remove_lines": cv_defaults.remove_lines,
+            "line_length_ratio": cv_defaults.line_length_ratio,
+            "line_thickness": cv_defaults.line_thickness,
+            "border_margin": cv_defaults.border_margin,
+            "max_area_ratio": cv_defaults.max_area_ratio,
+            "merge_linefree": cv_defaults.merge_linefree,
+            "merge_iou_threshold": cv_defaults.merge_iou_threshold,
+            "merge_area_ratio": cv_defaults.merge_area_ratio,
+            "min_gap_x_ratio": XyCutConfig.min_gap_x_ratio,
+            "min_gap_y_ratio": XyCutConfig.min_gap_y_ratio,
+            "noise_ratio": XyCutConfig.noise_ratio,
+            "max_depth": XyCutConfig.max_depth,
+            "work_max_side": XyCutConfig.work_max_side,
+            "tile_size": 0,
+            "tile_overlap": TiledConfig.tile_overlap,
+            "tile_workers": TiledConfig.tile_workers,
+        },
+    }
+
+    if name.lower() != "arabic":
+        return base
+
+    base["order"].update(
+        {
+            "rtl": True,
+            "column_overlap_ratio": 0.4,
+        }
+    )
+    base["cv"].update(
+        {
+            "min_area": max(30, cv_defaults.min_area),
+            "kernel_width": max(8, cv_defaults.kernel_width - 2),
+            "kernel_height": cv_defaults.kernel_height,
+            "adaptive_c": max(10, cv_defaults.adaptive_c - 3),
+            "line_length_ratio": 0.1,
+            "line_thickness": max(2, cv_defaults.line_thickness),
+            "border_margin": max(3, cv_defaults.border_margin),
+            "max_area_ratio": 0.75,
+            "merge_linefree": True,
+            "merge_iou_threshold": 0.7,
+            "merge_area_ratio": 0.2,
+        }
+    )
+    base["ocr"].update(
+        {
+            "digits_pass": True,
+            "digits_height_ratio": 0.1,
+            "digits_whitelist": "0123456789-/:.,٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹",
+            "digits_pass_scope": "all",
+            "digits_replace": True,
+        }
+    )
+    return base
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import io
+import logging
+import queue
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from PIL import Image
+
+from models.detectors.base import Box
+from utils.render_utils import draw_boxes_with_order
+
+DEBUG_FORMATS = ("png", "bmp")
+DEBUG_CROP_MODES = ("files", "sheet", "zip", "none")
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class DebugWriter:
+    def __init__(
+        self,
+        debug_dir: Path,
+        color: str = "red",
+        width: int = 2,
+        scale: float = 1.0,
+        image_format: str = "png",
+        compression: int = 1,
+        crops: str = "files",
+        queue_size: int = 32,
+    ) -> None:
+        self.debug_dir = debug_dir
+        self.color = color
+        self.width = width
+        self.scale = min(1.0, max(0.05, float(scale)))
+        self.image_format = image_format if image_format in DEBUG_FORMATS else "png"
+        self.compression = min(9, max(0, int(compression)))
+        self.crops = crops if crops in DEBUG_CROP_MODES else "files"
+        self._pending: Dict[Tuple[str, int], List[Tuple[int, Image.Image]]] = {}
+        self._error: BaseException | None = None
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread = threading.Thread(target=self._drain, name="debug-writer", daemon=True)
+        self._thread.start()
+
+    def save_overlay(
+        self, base_name: str, page_index: int, image: Image.Image, boxes: Sequence[Box]
+    ) -> None:
+        if self.scale < 1.0:
+            size = (
+                max(1, int(image.width * self.scale)),
+                max(1, int(image.height * self.scale)),
+            )
+            image = image.resize(size, Image.Resampling.BILINEAR)
+            boxes = [_scale_box(box, self.scale) for box in boxes]
+        else:
+            image = image.copy()
+        self._put(("overlay", base_name, page_index, image, list(boxes)))
+
+    def save_crop(self, base_name: str, page_index: int, idx: int, crop: Image.Image) -> None:
+        if self.crops != "none":
+            self._put(("crop", base_name, page_index, idx, crop))
+
+    def finish_page(self, base_name: str, page_index: int) -> None:
+        self._put(("page", base_name, page_index))
+
+    def flush(self) -> None:
+        self._queue.join()
+        self._raise_error()
+
+    def close(self, failing: bool = False) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if failing and self._error is not None:
+            error, self._error = self._error, None
+            logger.error("Debug writer failed", exc_info=error)
+            return
+        self._raise_error()
+
+    def __enter__(self) -> "DebugWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(failing=exc_type is not None)
+
+    def _put(self, job: tuple) -> None:
+        self._raise_error()
+        self._queue.put(job)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _drain(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._handle(job)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _handle(self, job: tuple) -> None:
+        kind, base_name, page_index = job[:3]
+        prefix = f"{base_name}_page_{page_index + 1}"
+        if kind == "overlay":
+            image, boxes = job[3], job[4]
+            overlay = draw_boxes_with_order(image, boxes, color=self.color, width=self.width)
+            image.close()
+            self._save(overlay, self.debug_dir / f"{prefix}_order.{self.image_format}")
+            overlay.close()
+        elif kind == "crop":
+            idx, crop = job[3], job[4]
+            if self.crops == "files":
+                self._save(crop, self.debug_dir / f"{prefix}_crop_{idx}.{self.image_format}")
+                crop.close()
+            else:
+                self._pending.setdefault((base_name, page_index), []).append((idx, crop))
+        elif kind == "page":
+            crops = self._pending.pop((base_name, page_index), [])
+            if not crops:
+                return
+            if self.crops == "sheet":
+                sheet = _contact_sheet(crops, self.scale)
+                self._save(sheet, self.debug_dir / f"{prefix}_crops.{self.image_format}")
+                sheet.close()
+            else:
+                self._write_zip(self.debug_dir / f"{prefix}_crops.zip", crops)
+            for _, crop in crops:
+                crop.close()
+
+    def _save(self, image: Image.Image, target: Path | io.BytesIO) -> None:
+        if self.image_format == "png":
+            image.save(target, format="PNG", compress_level=self.compression)
+        else:
+            image.save(target, format="BMP")
+
+    def _write_zip(self, path: Path, crops: List[Tuple[int, Image.Image]]) -> None:
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for idx, crop in crops:
+                buffer = io.BytesIO()
+                self._save(crop, buffer)
+                archive.writestr(f"crop_{idx}.{self.image_format}", buffer.getvalue())
+
+
+def _scale_box(box: Box, scale: float) -> Box:
+    return Box(
+        int(box.left * scale),
+        int(box.top * scale),
+        int(box.right * scale),
+        int(box.bottom * scale),
+    )
+
+
+def _contact_sheet(crops: List[Tuple[int, Image.Image]], scale: float) -> Image.Image:
+    thumbs: List[Image.Image] = []
+    for _, crop in crops:
+        if scale < 1.0:
+            size = (max(1, int(crop.width * scale)), max(1, int(crop.height * scale)))
+            thumbs.append(crop.resize(size, Image.Resampling.BILINEAR))
+        else:
+            thumbs.append(crop)
+
+    gap = 8
+    row_width = max(max(thumb.width for thumb in thumbs), 1600)
+    placements: List[Tuple[int, int]] = []
+    x = y = row_height = 0
+    for thumb in thumbs:
+        if x > 0 and x + thumb.width > row_width:
+            x = 0
+            y += row_height + gap
+            row_height = 0
+        placements.append((x, y))
+        x += thumb.width + gap
+        row_height = max(row_height, thumb.height)
+
+    sheet = Image.new("RGB", (row_width, y + row_height), "white")
+    for thumb, position in zip(thumbs, placements):
+        sheet.paste(thumb.convert("RGB"), position)
+    for thumb, (_, crop) in zip(thumbs, crops):
+        if thumb is not crop:
+            thumb.close()
+    return sheet
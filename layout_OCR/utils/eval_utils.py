@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from controllers.pipeline_controller import PipelineController
+from models.document_model import Document
+from utils.metrics_utils import char_error_rate, word_error_rate
+from utils.tune_utils import TuneSample
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MATRIX_KEYS = ("profile", "dpi", "psm", "oem", "scale", "binarize", "denoise", "sharpen")
+
+
+def expand_matrix(matrix: Dict[str, List[object]]) -> List[Dict[str, object]]:
+    keys = [key for key in MATRIX_KEYS if matrix.get(key)]
+    return [dict(zip(keys, values)) for values in itertools.product(*(matrix[k] for k in keys))]
+
+
+def corpus_fingerprint(samples: List[TuneSample]) -> str:
+    digest = hashlib.sha256()
+    for sample in samples:
+        stat = sample.path.stat()
+        digest.update(f"{sample.path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        digest.update((sample.truth_text or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def config_key(options: Dict[str, object], fingerprint: str) -> str:
+    payload = json.dumps({"options": options, "corpus": fingerprint}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def run_evaluation(
+    samples: List[TuneSample],
+    runs: List[Dict[str, object]],
+    cache_dir: Path | None = None,
+    jobs: int | None = None,
+) -> List[Dict[str, object]]:
+    fingerprint = corpus_fingerprint(samples)
+    results: Dict[int, Dict[str, object]] = {}
+    pending = []
+    for index, run in enumerate(runs):
+        key = config_key(run["options"], fingerprint)
+        cached = _read_cache(cache_dir, key)
+        if cached is not None:
+            cached["cached"] = True
+            results[index] = cached
+        else:
+            pending.append((index, key, run))
+
+    if pending:
+        with multiprocessing.Pool(processes=jobs, maxtasksperchild=1) as pool:
+            tasks = [(run, samples) for _, _, run in pending]
+            for (index, key, _), result in zip(pending, pool.imap(_evaluate_run, tasks)):
+                _write_cache(cache_dir, key, result)
+                result["cached"] = False
+                results[index] = result
+
+    return [results[index] for index in range(len(runs))]
+
+
+def _evaluate_run(task) -> Dict[str, object]:
+    run, samples = task
+    options = run["options"]
+    controller = PipelineController(
+        detector_options=options["detector_options"],
+        ocr_options=options["ocr_options"],
+        order_options=options["order_options"],
+        view_options={},
+        poppler_path=run.get("poppler_path"),
+        tesseract_cmd=run.get("tesseract_cmd"),
+        detector_name=str(options.get("detector", "simple_cv")),
+    )
+    dpi = int(options["dpi"])
+    fallback_full_page = bool(options.get("fallback_full_page", True))
+
+    latencies: List[float] = []
+    cer_values: List[float] = []
+    wer_values: List[float] = []
+    start = time.perf_counter()
+    for sample in samples:
+        texts: List[str] = []
+        for page in Document(sample.path).load_pages(dpi, poppler_path=run.get("poppler_path")):
+            page_start = time.perf_counter()
+            result = controller.process_page(
+                page.image, page.index, fallback_full_page=fallback_full_page
+            )
+            latencies.append(time.perf_counter() - page_start)
+            texts.append(result.text)
+            page.image.close()
+        text = "\n".join(texts)
+        cer_values.append(char_error_rate(text, sample.truth_text or ""))
+        wer_values.append(word_error_rate(text, sample.truth_text or ""))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "label": run["label"],
+        "settings": run["settings"],
+        "pages": len(latencies),
+        "cer": float(np.mean(cer_values)) if cer_values else 0.0,
+        "wer": float(np.mean(wer_values)) if wer_values else 0.0,
+        "pages_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p95_page_seconds": float(np.percentile(latencies, 95)) if latencies else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_tesseract_rss_mb": _peak_rss_mb(children=True),
+    }
+
+
+def _peak_rss_mb(children: bool = False) -> float | None:
+    if resource is not None:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        if sys.platform == "darwin":
+            return peak / (1024 * 1024)
+        return peak / 1024
+    if children:
+        return None
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        peak = getattr(info, "peak_wset", None) or info.rss
+        return peak / (1024 * 1024)
+    return None
+
+
+def _read_cache(cache_dir: Path | None, key: str) -> Dict[str, object] | None:
+    if cache_dir is None:
+        return None
+    path = cache_dir / f"{key}.json"
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_cache(cache_dir: Path | None, key: str, result: Dict[str, object]) -> None:
+    if cache_dir is None:
+        return
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / f"{key}.json").write_text(json.dumps(result, indent=2), encoding="utf-8")
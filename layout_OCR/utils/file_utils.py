@@ -29,3 +29,11 @@ def ensure_output_dir(path: Path) -> Path:
 
 def build_output_name(base_name: str) -> str:
     return f"{base_name}.txt"
+
+
+def build_structured_name(base_name: str, structured_format: str) -> str:
+    return f"{base_name}.{structured_format.lower()}"
+
+
+def build_table_name(base_name: str) -> str:
+    return f"{base_name}.tables.tsv"
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+from models.detectors.base import Box
+
+DEFAULT_DPI = 300
+POINTS_PER_INCH = 72.0
+
+
+def gray_array(image: Image.Image) -> np.ndarray:
+    if image.mode == "L":
+        return np.asarray(image)
+    gray = image.convert("L")
+    try:
+        return np.array(gray)
+    finally:
+        gray.close()
+
+
+def image_dpi(image: Image.Image, default: float = DEFAULT_DPI) -> float:
+    dpi = image.info.get("dpi")
+    if isinstance(dpi, (tuple, list)) and dpi:
+        dpi = dpi[0]
+    try:
+        dpi = float(dpi)
+    except (TypeError, ValueError):
+        return float(default)
+    return dpi if dpi > 1 else float(default)
+
+
+def set_image_dpi(image: Image.Image, dpi: float) -> Image.Image:
+    image.info["dpi"] = (dpi, dpi)
+    return image
+
+
+def points_to_pixels(points: float, dpi: float) -> float:
+    return points * dpi / POINTS_PER_INCH
+
+
+def ink_ratio(gray: np.ndarray, ink_level: int = 128) -> float:
+    if gray.size == 0:
+        return 0.0
+    return float(np.count_nonzero(gray < ink_level)) / gray.size
+
+
+def ink_box(
+    gray: np.ndarray,
+    box: Box,
+    ink_level: int = 128,
+    min_ink_ratio: float = 0.0,
+) -> Box | None:
+    region = gray[box.top : box.bottom, box.left : box.right]
+    if region.size == 0:
+        return None
+    ink = region < ink_level
+    count = int(np.count_nonzero(ink))
+    if count == 0 or count < min_ink_ratio * region.size:
+        return None
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    return Box(
+        box.left + int(cols[0]),
+        box.top + int(rows[0]),
+        box.left + int(cols[-1]) + 1,
+        box.top + int(rows[-1]) + 1,
+    )
+
+
+def pad_box(box: Box, padding: int, size: Tuple[int, int]) -> Box:
+    width, height = size
+    return Box(
+        max(0, box.left - padding),
+        max(0, box.top - padding),
+        min(width, box.right + padding),
+        min(height, box.bottom + padding),
+    )
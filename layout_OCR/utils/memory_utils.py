@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Dict
+
+DETECTOR_BYTES_PER_PIXEL = {
+    "simple_cv": 6.0,
+    "xy_cut": 2.0,
+}
+OCR_BYTES_PER_PIXEL = 4.0
+TESSERACT_BYTES_PER_PIXEL = 8.0
+PAGE_PREPROCESS_BYTES_PER_PIXEL = 3.0
+
+
+def estimate_page_bytes(
+    width: int,
+    height: int,
+    detector_name: str,
+    detector_options: Dict[str, object],
+    ocr_options: Dict[str, object],
+    channels: int = 1,
+) -> int:
+    pixels = float(width) * float(height)
+
+    detect_pixels = pixels
+    tile_size = int(detector_options.get("tile_size", 0) or 0)
+    if tile_size > 0:
+        tile_workers = max(1, int(detector_options.get("tile_workers", 1)))
+        detect_pixels = min(pixels, float(tile_size * tile_size * tile_workers))
+    detector_factor = DETECTOR_BYTES_PER_PIXEL.get(detector_name, 6.0)
+    if detector_name == "simple_cv" and bool(detector_options.get("merge_linefree", False)):
+        detector_factor += 2.0
+
+    scale = float(ocr_options.get("scale", 2.0))
+    if str(ocr_options.get("scale_mode", "fixed")) == "auto":
+        scale = max(scale, 1.0)
+    crop_pixels = pixels * scale * scale
+
+    total = pixels * channels
+    total += detect_pixels * detector_factor
+    total += crop_pixels * (OCR_BYTES_PER_PIXEL + TESSERACT_BYTES_PER_PIXEL)
+    if str(ocr_options.get("preprocess_scope", "crop")) == "page":
+        total += pixels * PAGE_PREPROCESS_BYTES_PER_PIXEL
+    return int(total)
+
+
+class MemoryGovernor:
+    def __init__(self, budget_bytes: int = 0) -> None:
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.used_bytes = 0
+
+    def fits(self, nbytes: int) -> bool:
+        if self.budget_bytes <= 0 or self.used_bytes == 0:
+            return True
+        return self.used_bytes + nbytes <= self.budget_bytes
+
+    def acquire(self, nbytes: int) -> None:
+        self.used_bytes += nbytes
+
+    def release(self, nbytes: int) -> None:
+        self.used_bytes = max(0, self.used_bytes - nbytes)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+from models.detectors.base import Box, box_iou
+
+
+def levenshtein(source: Sequence, target: Sequence) -> int:
+    if len(source) < len(target):
+        source, target = target, source
+    previous = list(range(len(target) + 1))
+    for i, item in enumerate(source, start=1):
+        current = [i] + [0] * len(target)
+        for j, other in enumerate(target, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (item != other),
+            )
+        previous = current
+    return previous[-1]
+
+
+def char_error_rate(hypothesis: str, reference: str) -> float:
+    hypothesis = " ".join(hypothesis.split())
+    reference = " ".join(reference.split())
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return levenshtein(hypothesis, reference) / len(reference)
+
+
+def box_f1(predicted: List[Box], truth: List[Box], iou_threshold: float = 0.5) -> float:
+    if not predicted and not truth:
+        return 1.0
+    if not predicted or not truth:
+        return 0.0
+    pairs = sorted(
+        (
+            (box_iou(pred, gt), i, j)
+            for i, pred in enumerate(predicted)
+            for j, gt in enumerate(truth)
+        ),
+        reverse=True,
+    )
+    used_pred: set[int] = set()
+    used_truth: set[int] = set()
+    matches = 0
+    for iou, i, j in pairs:
+        if iou < iou_threshold:
+            break
+        if i in used_pred or j in used_truth:
+            continue
+        used_pred.add(i)
+        used_truth.add(j)
+        matches += 1
+    precision = matches / len(predicted)
+    recall = matches / len(truth)
+    if precision + recall == 0:
+        return 0.0
+    return 2 * precision * recall / (precision + recall)
+
+
+def word_error_rate(hypothesis: str, reference: str) -> float:
+    hypothesis_words = hypothesis.split()
+    reference_words = reference.split()
+    if not reference_words:
+        return 0.0 if not hypothesis_words else 1.0
+    return levenshtein(hypothesis_words, reference_words) / len(reference_words)
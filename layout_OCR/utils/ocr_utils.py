@@ -1,10 +1,56 @@
 from __future__ import annotations
 
+import logging
+import shlex
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
 import cv2
 import numpy as np
 import pytesseract
 from PIL import Image
 
+from models.detectors.base import Box
+from models.ocr_result import OcrLine, OcrResult, OcrWord
+
+SCALE_MODES = ("fixed", "auto")
+PREPROCESS_SCOPES = ("crop", "page")
+PAGE_THRESHOLDS = ("otsu", "adaptive")
+OCR_BACKENDS = ("stdin", "pytesseract")
+TSV_INT_FIELDS = (
+    "level",
+    "page_num",
+    "block_num",
+    "par_num",
+    "line_num",
+    "word_num",
+    "left",
+    "top",
+    "width",
+    "height",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class OcrTimeoutError(RuntimeError):
+    pass
+
+
+@dataclass
+class PreparedOcr:
+    image: Image.Image
+    lang: str
+    config: str
+    origin: Tuple[int, int]
+    scale_x: float
+    scale_y: float
+
+    @property
+    def pixels(self) -> int:
+        return self.image.width * self.image.height
+
 
 def ocr_image(
     image: Image.Image,
@@ -18,13 +64,110 @@ def ocr_image(
     binarize: bool = True,
     denoise: bool = True,
     sharpen: bool = True,
-) -> str:
+    origin: Tuple[int, int] = (0, 0),
+    scale_mode: str = "fixed",
+    target_text_height: float = 32.0,
+    min_scale: float = 0.5,
+    max_scale: float = 4.0,
+    page_preprocessed: bool = False,
+    timeout: float = 0,
+    backend: str = OCR_BACKENDS[0],
+) -> OcrResult:
+    prepared = prepare_ocr(
+        image,
+        lang,
+        tesseract_cmd=tesseract_cmd,
+        psm=psm,
+        oem=oem,
+        whitelist=whitelist,
+        extra_config=extra_config,
+        scale=scale,
+        binarize=binarize,
+        denoise=denoise,
+        sharpen=sharpen,
+        origin=origin,
+        scale_mode=scale_mode,
+        target_text_height=target_text_height,
+        min_scale=min_scale,
+        max_scale=max_scale,
+        page_preprocessed=page_preprocessed,
+    )
+    return run_prepared(prepared, timeout=timeout, backend=backend)
+
+
+def prepare_ocr(
+    image: Image.Image,
+    lang: str,
+    tesseract_cmd: str | None = None,
+    psm: int | None = None,
+    oem: int | None = None,
+    whitelist: str | None = None,
+    extra_config: str | None = None,
+    scale: float = 2.0,
+    binarize: bool = True,
+    denoise: bool = True,
+    sharpen: bool = True,
+    origin: Tuple[int, int] = (0, 0),
+    scale_mode: str = "fixed",
+    target_text_height: float = 32.0,
+    min_scale: float = 0.5,
+    max_scale: float = 4.0,
+    page_preprocessed: bool = False,
+) -> PreparedOcr:
     if tesseract_cmd:
         pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
-    processed = preprocess_for_ocr(
-        image, scale=scale, binarize=binarize, denoise=denoise, sharpen=sharpen
+    if page_preprocessed:
+        processed = rescale_for_ocr(
+            image,
+            scale=scale,
+            binarized=binarize,
+            scale_mode=scale_mode,
+            target_text_height=target_text_height,
+            min_scale=min_scale,
+            max_scale=max_scale,
+        )
+    else:
+        processed = preprocess_for_ocr(
+            image,
+            scale=scale,
+            binarize=binarize,
+            denoise=denoise,
+            sharpen=sharpen,
+            scale_mode=scale_mode,
+            target_text_height=target_text_height,
+            min_scale=min_scale,
+            max_scale=max_scale,
+        )
+    return PreparedOcr(
+        image=processed,
+        lang=lang,
+        config=build_config(psm, oem, whitelist, extra_config),
+        origin=origin,
+        scale_x=processed.width / max(1, image.width),
+        scale_y=processed.height / max(1, image.height),
+    )
+
+
+def run_prepared(
+    prepared: PreparedOcr, timeout: float = 0, backend: str = OCR_BACKENDS[0]
+) -> OcrResult:
+    data = tesseract_data(
+        prepared.image, prepared.lang, prepared.config, timeout=timeout, backend=backend
     )
+    return finish_ocr(prepared, data)
+
+
+def finish_ocr(prepared: PreparedOcr, data: Dict[str, list]) -> OcrResult:
+    return _build_result(data, prepared.origin, prepared.scale_x, prepared.scale_y)
+
+
+def build_config(
+    psm: int | None = None,
+    oem: int | None = None,
+    whitelist: str | None = None,
+    extra_config: str | None = None,
+) -> str:
     config_parts = []
     if psm is not None:
         config_parts.append(f"--psm {psm}")
@@ -35,8 +178,165 @@ def ocr_image(
         config_parts.append(f"-c tessedit_char_whitelist={whitelist}")
     if extra_config:
         config_parts.append(extra_config)
-    config = " ".join(config_parts)
-    return pytesseract.image_to_string(processed, lang=lang, config=config)
+    return " ".join(config_parts)
+
+
+def tesseract_data(
+    image: Image.Image,
+    lang: str,
+    config: str,
+    timeout: float = 0,
+    backend: str = OCR_BACKENDS[0],
+) -> Dict[str, list]:
+    if backend == "stdin":
+        command = tesseract_stdin_command(lang, config)
+        try:
+            completed = subprocess.run(
+                command,
+                input=encode_pnm(image),
+                capture_output=True,
+                timeout=timeout or None,
+                check=False,
+            )
+        except subprocess.TimeoutExpired as err:
+            raise OcrTimeoutError(f"Tesseract exceeded {timeout:.1f}s") from err
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"Tesseract failed ({completed.returncode}): {message}")
+        return parse_tsv(completed.stdout.decode("utf-8", errors="replace"))
+
+    try:
+        return pytesseract.image_to_data(
+            image,
+            lang=lang,
+            config=config,
+            output_type=pytesseract.Output.DICT,
+            timeout=timeout,
+        )
+    except RuntimeError as err:
+        if "timeout" in str(err).lower():
+            raise OcrTimeoutError(f"Tesseract exceeded {timeout:.1f}s") from err
+        raise
+
+
+def tesseract_stdin_command(lang: str, config: str) -> List[str]:
+    return [
+        pytesseract.pytesseract.tesseract_cmd,
+        "stdin",
+        "stdout",
+        "-l",
+        lang,
+        *shlex.split(config),
+        "tsv",
+    ]
+
+
+def encode_pnm(image: Image.Image) -> bytes:
+    if image.mode not in ("L", "RGB"):
+        image = image.convert("RGB" if image.mode in ("RGBA", "P", "CMYK") else "L")
+    pixels = np.ascontiguousarray(np.asarray(image))
+    magic = b"P5" if image.mode == "L" else b"P6"
+    header = magic + f"\n{image.width} {image.height}\n255\n".encode("ascii")
+    return header + pixels.tobytes()
+
+
+def parse_tsv(output: str) -> Dict[str, list]:
+    rows = output.splitlines()
+    if not rows:
+        return {}
+    columns = rows[0].split("\t")
+    data: Dict[str, list] = {column: [] for column in columns}
+    for row in rows[1:]:
+        values = row.split("\t")
+        if len(values) < len(columns) - 1:
+            continue
+        values += [""] * (len(columns) - len(values))
+        try:
+            parsed = [
+                int(value)
+                if column in TSV_INT_FIELDS
+                else float(value)
+                if column == "conf"
+                else value
+                for column, value in zip(columns, values)
+            ]
+        except ValueError:
+            continue
+        for column, value in zip(columns, parsed):
+            data[column].append(value)
+    return data
+
+
+def _build_result(
+    data: Dict[str, list],
+    origin: Tuple[int, int],
+    scale_x: float,
+    scale_y: float,
+) -> OcrResult:
+    lines: List[OcrLine] = []
+    paragraphs: List[List[OcrLine]] = []
+    line_keys: Dict[Tuple[int, int, int], OcrLine] = {}
+    last_paragraph = None
+    for i, raw_text in enumerate(data.get("text", [])):
+        word_text = str(raw_text).strip()
+        if not word_text:
+            continue
+        box = _map_box(
+            data["left"][i],
+            data["top"][i],
+            data["width"][i],
+            data["height"][i],
+            origin,
+            scale_x,
+            scale_y,
+        )
+        word = OcrWord(text=word_text, conf=float(data["conf"][i]), box=box)
+        paragraph_key = (data["block_num"][i], data["par_num"][i])
+        line_key = paragraph_key + (data["line_num"][i],)
+        line = line_keys.get(line_key)
+        if line is None:
+            line = OcrLine(box=box)
+            line_keys[line_key] = line
+            lines.append(line)
+            if paragraph_key != last_paragraph:
+                paragraphs.append([])
+                last_paragraph = paragraph_key
+            paragraphs[-1].append(line)
+        else:
+            line.box = _union_box(line.box, box)
+        line.words.append(word)
+
+    text = "\n\n".join(
+        "\n".join(line.text for line in paragraph) for paragraph in paragraphs
+    )
+    return OcrResult(text=text, lines=lines)
+
+
+def _map_box(
+    left: int,
+    top: int,
+    width: int,
+    height: int,
+    origin: Tuple[int, int],
+    scale_x: float,
+    scale_y: float,
+) -> Box:
+    x0, y0 = origin
+    return Box(
+        x0 + int(round(int(left) / scale_x)),
+        y0 + int(round(int(top) / scale_y)),
+        x0 + int(round((int(left) + int(width)) / scale_x)),
+        y0 + int(round((int(top) + int(height)) / scale_y)),
+    )
+
+
+def _union_box(box_a: Box, box_b: Box) -> Box:
+    return Box(
+        min(box_a.left, box_b.left),
+        min(box_a.top, box_b.top),
+        max(box_a.right, box_b.right),
+        max(box_a.bottom, box_b.bottom),
+    )
 
 
 def _expand_whitelist(whitelist: str | None) -> str | None:
@@ -57,12 +357,19 @@ def preprocess_for_ocr(
     binarize: bool = True,
     denoise: bool = True,
     sharpen: bool = True,
+    scale_mode: str = "fixed",
+    target_text_height: float = 32.0,
+    min_scale: float = 0.5,
+    max_scale: float = 4.0,
 ) -> Image.Image:
     gray = cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2GRAY)
+    if scale_mode == "auto":
+        scale = choose_scale(gray, scale, target_text_height, min_scale, max_scale)
     if scale and scale != 1.0:
         new_width = max(1, int(round(gray.shape[1] * scale)))
         new_height = max(1, int(round(gray.shape[0] * scale)))
-        gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
+        interpolation = cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA
+        gray = cv2.resize(gray, (new_width, new_height), interpolation=interpolation)
 
     if denoise:
         gray = cv2.medianBlur(gray, 3)
@@ -75,3 +382,110 @@ def preprocess_for_ocr(
         _, gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
     return Image.fromarray(gray)
+
+
+def preprocess_page(
+    gray: np.ndarray,
+    binarize: bool = True,
+    denoise: bool = True,
+    sharpen: bool = True,
+    threshold: str = "otsu",
+    block_size: int = 31,
+    threshold_c: int = 15,
+) -> np.ndarray:
+    if denoise:
+        gray = cv2.medianBlur(gray, 3)
+
+    if sharpen:
+        blurred = cv2.GaussianBlur(gray, (0, 0), 1.0)
+        gray = cv2.addWeighted(gray, 1.5, blurred, -0.5, 0)
+
+    if binarize:
+        if threshold == "adaptive":
+            block_size = max(3, block_size | 1)
+            gray = cv2.adaptiveThreshold(
+                gray,
+                255,
+                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                cv2.THRESH_BINARY,
+                block_size,
+                threshold_c,
+            )
+        else:
+            _, gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    return gray
+
+
+def rescale_for_ocr(
+    image: Image.Image,
+    scale: float = 2.0,
+    binarized: bool = True,
+    scale_mode: str = "fixed",
+    target_text_height: float = 32.0,
+    min_scale: float = 0.5,
+    max_scale: float = 4.0,
+) -> Image.Image:
+    gray = np.asarray(image if image.mode == "L" else image.convert("L"))
+    if scale_mode == "auto":
+        scale = choose_scale(gray, scale, target_text_height, min_scale, max_scale)
+    if not scale or scale == 1.0:
+        return image if image.mode == "L" else Image.fromarray(gray)
+
+    new_width = max(1, int(round(gray.shape[1] * scale)))
+    new_height = max(1, int(round(gray.shape[0] * scale)))
+    interpolation = cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA
+    gray = cv2.resize(gray, (new_width, new_height), interpolation=interpolation)
+    if binarized:
+        _, gray = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
+    return Image.fromarray(gray)
+
+
+def estimate_text_height(gray: np.ndarray) -> float | None:
+    if gray.size == 0:
+        return None
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    if count <= 1:
+        return None
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    keep = (
+        (heights >= 3)
+        & (areas >= 6)
+        & (heights < gray.shape[0] * 0.95)
+        & (widths < gray.shape[1] * 0.95)
+    )
+    if not np.any(keep):
+        return None
+    return float(np.median(heights[keep]))
+
+
+def choose_scale(
+    gray: np.ndarray,
+    fallback: float,
+    target_text_height: float = 32.0,
+    min_scale: float = 0.5,
+    max_scale: float = 4.0,
+) -> float:
+    height = estimate_text_height(gray)
+    if height is None:
+        logger.debug(
+            "crop %dx%d: no text components, scale %.2f",
+            gray.shape[1],
+            gray.shape[0],
+            fallback,
+        )
+        return fallback
+    scale = float(np.clip(target_text_height / height, min_scale, max_scale))
+    if abs(scale - 1.0) < 0.1:
+        scale = 1.0
+    logger.debug(
+        "crop %dx%d: text height %.1f px, scale %.2f",
+        gray.shape[1],
+        gray.shape[0],
+        height,
+        scale,
+    )
+    return scale
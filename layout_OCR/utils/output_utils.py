@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import html
+import json
+import os
+from pathlib import Path
+from typing import IO, Dict, List
+
+from models.detectors.base import Box
+from models.ocr_result import OcrLine, OcrRegion, OcrTable, PageResult
+
+STRUCTURED_FORMATS = ("none", "jsonl", "hocr")
+TABLE_FORMATS = ("none", "tsv")
+HOCR_REGION_CLASSES = {
+    "text": "ocr_carea",
+    "figure": "ocr_photo",
+    "table": "ocr_table",
+    "rule": "ocr_separator",
+}
+
+
+class AtomicFileWriter:
+    def __init__(self, path: Path, flush_pages: bool = False) -> None:
+        self.path = path
+        self.flush_pages = flush_pages
+        self.temp_path = path.with_name(f"{path.name}.part")
+        self._handle: IO[str] | None = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self) -> None:
+        if self._handle is None:
+            self._handle = self.temp_path.open("w", encoding="utf-8")
+            self._write_header()
+
+    def close(self) -> Path:
+        if self._handle is None:
+            self.open()
+        self._write_footer()
+        self._handle.close()
+        self._handle = None
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        try:
+            self.temp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _write(self, text: str) -> None:
+        if self._handle is None:
+            self.open()
+        self._handle.write(text)
+
+    def _page_done(self) -> None:
+        if self.flush_pages and self._handle is not None:
+            self._handle.flush()
+
+    def _write_header(self) -> None:
+        pass
+
+    def _write_footer(self) -> None:
+        pass
+
+
+class StreamingTextWriter(AtomicFileWriter):
+    def __init__(self, path: Path, separator: str = "\n", flush_pages: bool = False) -> None:
+        super().__init__(path, flush_pages=flush_pages)
+        self.separator = separator
+        self._has_content = False
+
+    def write_page(self, text: str) -> None:
+        text = text.strip()
+        if not text:
+            return
+        if self._has_content:
+            self._write(self.separator)
+        self._write(text)
+        self._has_content = True
+        self._page_done()
+
+
+class JsonLinesWriter(AtomicFileWriter):
+    def write_page(self, page: PageResult) -> None:
+        self._write(json.dumps(page_to_dict(page), ensure_ascii=False))
+        self._write("\n")
+        self._page_done()
+
+
+class HocrWriter(AtomicFileWriter):
+    def __init__(self, path: Path, source_name: str, flush_pages: bool = False) -> None:
+        super().__init__(path, flush_pages=flush_pages)
+        self.source_name = source_name
+
+    def write_page(self, page: PageResult) -> None:
+        page_no = page.index + 1
+        parts: List[str] = [
+            f"  <div class='ocr_page' id='page_{page_no}' "
+            f"title='image \"{html.escape(self.source_name, quote=True)}\"; "
+            f"bbox 0 0 {page.width} {page.height}; ppageno {page.index}'>\n"
+        ]
+        for region in page.regions:
+            region_id = f"{page_no}_{region.index}"
+            lang_attr = f" lang='{html.escape(region.lang, quote=True)}'" if region.lang else ""
+            hocr_class = HOCR_REGION_CLASSES.get(region.kind, "ocr_carea")
+            parts.append(
+                f"   <div class='{hocr_class}' id='block_{region_id}'{lang_attr} "
+                f"title='{_hocr_bbox(region.box)}'>\n"
+            )
+            for line_no, line in enumerate(region.lines, start=1):
+                line_id = f"{region_id}_{line_no}"
+                parts.append(
+                    f"    <span class='ocr_line' id='line_{line_id}' "
+                    f"title='{_hocr_bbox(line.box)}'>"
+                )
+                for word_no, word in enumerate(line.words, start=1):
+                    conf = max(0, int(round(word.conf)))
+                    parts.append(
+                        f"<span class='ocrx_word' id='word_{line_id}_{word_no}' "
+                        f"title='{_hocr_bbox(word.box)}; x_wconf {conf}'>"
+                        f"{html.escape(word.text)}</span> "
+                    )
+                parts.append("</span>\n")
+            parts.append("   </div>\n")
+        parts.append("  </div>\n")
+        self._write("".join(parts))
+        self._page_done()
+
+    def _write_header(self) -> None:
+        self._write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" '
+            '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            " <head>\n"
+            f"  <title>{html.escape(self.source_name)}</title>\n"
+            '  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>\n'
+            "  <meta name='ocr-system' content='layout_OCR'/>\n"
+            "  <meta name='ocr-capabilities' content='ocr_page ocr_carea ocr_photo ocr_table ocr_separator ocr_line ocrx_word'/>\n"
+            " </head>\n"
+            " <body>\n"
+        )
+
+    def _write_footer(self) -> None:
+        self._write(" </body>\n</html>\n")
+
+
+class TableTsvWriter(AtomicFileWriter):
+    def __init__(self, path: Path, flush_pages: bool = False) -> None:
+        super().__init__(path, flush_pages=flush_pages)
+        self._tables = 0
+
+    def write_page(self, page: PageResult) -> None:
+        for region in page.regions:
+            if region.table is None:
+                continue
+            if self._tables:
+                self._write("\n")
+            self._write(
+                f"# page {page.index + 1} region {region.index} "
+                f"rows {region.table.rows} cols {region.table.cols}\n"
+            )
+            self._write(region.table.tsv + "\n")
+            self._tables += 1
+        self._page_done()
+
+    def close(self) -> Path | None:
+        if not self._tables:
+            self.abort()
+            return None
+        return super().close()
+
+
+def build_structured_writer(
+    structured_format: str,
+    path: Path,
+    source_name: str,
+    flush_pages: bool = False,
+) -> AtomicFileWriter | None:
+    structured_format = structured_format.lower()
+    if structured_format == "jsonl":
+        return JsonLinesWriter(path, flush_pages=flush_pages)
+    if structured_format == "hocr":
+        return HocrWriter(path, source_name, flush_pages=flush_pages)
+    return None
+
+
+def page_to_dict(page: PageResult) -> Dict[str, object]:
+    return {
+        "page": page.index + 1,
+        "width": page.width,
+        "height": page.height,
+        "regions": [_region_to_dict(region) for region in page.regions],
+    }
+
+
+def _region_to_dict(region: OcrRegion) -> Dict[str, object]:
+    data: Dict[str, object] = {
+        "index": region.index,
+        "bbox": _bbox(region.box),
+        "text": region.text,
+        "lang": region.lang,
+        "kind": region.kind,
+        "lines": [_line_to_dict(line) for line in region.lines],
+    }
+    if region.table is not None:
+        data["table"] = _table_to_dict(region.table)
+    return data
+
+
+def _table_to_dict(table: OcrTable) -> Dict[str, object]:
+    return {
+        "rows": table.rows,
+        "cols": table.cols,
+        "cells": [
+            {"row": cell.row, "col": cell.col, "bbox": _bbox(cell.box), "text": cell.text}
+            for cell in table.cells
+        ],
+    }
+
+
+def _line_to_dict(line: OcrLine) -> Dict[str, object]:
+    return {
+        "bbox": _bbox(line.box),
+        "text": line.text,
+        "words": [
+            {"text": word.text, "conf": word.conf, "bbox": _bbox(word.box)}
+            for word in line.words
+        ],
+    }
+
+
+def _bbox(box: Box) -> List[int]:
+    return [box.left, box.top, box.right, box.bottom]
+
+
+def _hocr_bbox(box: Box) -> str:
+    return f"bbox {box.left} {box.top} {box.right} {box.bottom}"
@@ -1,18 +1,147 @@
 from __future__ import annotations
 
+import shutil
+import subprocess
+import threading
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Iterator, List, Tuple
 
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pdf2image.exceptions import PDFInfoNotInstalledError
 from PIL import Image
 
+from utils.ink_utils import set_image_dpi
+
+POPPLER_MISSING = (
+    "Poppler is required for PDF rendering. Install it and ensure `pdftoppm` is on PATH, "
+    "or provide --poppler-path pointing to the Poppler bin directory."
+)
+
 
 def pdf_to_images(path: Path, dpi: int = 200, poppler_path: str | None = None) -> List[Image.Image]:
     try:
-        return convert_from_path(str(path), dpi=dpi, poppler_path=poppler_path)
+        images = convert_from_path(str(path), dpi=dpi, poppler_path=poppler_path)
+    except PDFInfoNotInstalledError as err:
+        raise RuntimeError(POPPLER_MISSING) from err
+    return [set_image_dpi(image, dpi) for image in images]
+
+
+def pdf_info(path: Path, poppler_path: str | None = None) -> Tuple[int, float, float]:
+    try:
+        info = pdfinfo_from_path(str(path), poppler_path=poppler_path)
     except PDFInfoNotInstalledError as err:
-        raise RuntimeError(
-            "Poppler is required for PDF rendering. Install it and ensure `pdftoppm` is on PATH, "
-            "or provide --poppler-path pointing to the Poppler bin directory."
-        ) from err
+        raise RuntimeError(POPPLER_MISSING) from err
+    pages = int(info.get("Pages", 0))
+    width, height = 612.0, 792.0
+    size = str(info.get("Page size", "")).split()
+    if len(size) >= 3 and size[1] == "x":
+        try:
+            width, height = float(size[0]), float(size[2])
+        except ValueError:
+            pass
+    return pages, width, height
+
+
+def iter_pdf_images(
+    path: Path,
+    dpi: int = 200,
+    poppler_path: str | None = None,
+    window: int = 1,
+) -> Iterator[Image.Image]:
+    page_count, _, _ = pdf_info(path, poppler_path=poppler_path)
+    window = max(1, window)
+    for first_page in range(1, page_count + 1, window):
+        last_page = min(page_count, first_page + window - 1)
+        try:
+            images = convert_from_path(
+                str(path),
+                dpi=dpi,
+                poppler_path=poppler_path,
+                first_page=first_page,
+                last_page=last_page,
+            )
+        except PDFInfoNotInstalledError as err:
+            raise RuntimeError(POPPLER_MISSING) from err
+        for image in images:
+            yield set_image_dpi(image, dpi)
+
+
+def iter_pdf_bytes_images(
+    data: bytes,
+    dpi: int = 200,
+    poppler_path: str | None = None,
+) -> Iterator[Image.Image]:
+    command = [poppler_tool("pdftoppm", poppler_path), "-r", str(dpi), "-"]
+    try:
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except FileNotFoundError as err:
+        raise RuntimeError(POPPLER_MISSING) from err
+
+    feeder = threading.Thread(target=_feed_stdin, args=(process.stdin, data), daemon=True)
+    feeder.start()
+    errors: List[bytes] = []
+    drainer = threading.Thread(target=_drain, args=(process.stderr, errors), daemon=True)
+    drainer.start()
+    try:
+        while True:
+            image = _read_pnm(process.stdout)
+            if image is None:
+                break
+            yield set_image_dpi(image, dpi)
+    finally:
+        process.stdout.close()
+        feeder.join()
+        drainer.join()
+        stderr = b"".join(errors).decode("utf-8", errors="replace").strip()
+        returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"pdftoppm failed ({returncode}): {stderr}")
+
+
+def poppler_tool(name: str, poppler_path: str | None) -> str:
+    if poppler_path:
+        return str(Path(poppler_path) / name)
+    return shutil.which(name) or name
+
+
+def _feed_stdin(stream: BinaryIO, data: bytes) -> None:
+    try:
+        stream.write(data)
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+def _drain(stream: BinaryIO, chunks: List[bytes]) -> None:
+    try:
+        for block in iter(lambda: stream.read(1 << 16), b""):
+            chunks.append(block)
+    except OSError:
+        pass
+    finally:
+        stream.close()
+
+
+def _read_pnm(stream: BinaryIO) -> Image.Image | None:
+    tokens: List[bytes] = []
+    while len(tokens) < 4:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.split(b"#", 1)[0]
+        tokens.extend(line.split())
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if maxval != 255 or magic not in (b"P5", b"P6"):
+        raise RuntimeError(f"Unsupported pdftoppm output: {magic!r} maxval {maxval}")
+    mode = "RGB" if magic == b"P6" else "L"
+    size = width * height * (3 if mode == "RGB" else 1)
+    pixels = stream.read(size)
+    if len(pixels) != size:
+        raise RuntimeError("Truncated pdftoppm output")
+    return Image.frombytes(mode, (width, height), pixels)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import cv2
+import numpy as np
+
+from models.detectors.base import Box
+
+REGION_KINDS = ("text", "figure", "table", "rule")
+
+_CHUNK = 64
+
+
+def classify_regions(
+    gray: np.ndarray,
+    boxes: Sequence[Box],
+    horizontal_lines: np.ndarray,
+    vertical_lines: np.ndarray,
+    ink_level: int = 128,
+    figure_ink_ratio: float = 0.45,
+    figure_component_ratio: float = 0.6,
+    figure_min_height: float = 3.0,
+    table_line_ratio: float = 0.1,
+    rule_aspect_ratio: float = 15.0,
+    min_text_height: float = 4.0,
+) -> List[str]:
+    if not boxes:
+        return []
+    ink = (gray < ink_level).astype(np.uint8)
+
+    coords = np.array([[b.left, b.top, b.right, b.bottom] for b in boxes], dtype=np.int64)
+    coords[:, 0::2] = np.clip(coords[:, 0::2], 0, gray.shape[1])
+    coords[:, 1::2] = np.clip(coords[:, 1::2], 0, gray.shape[0])
+    widths = np.maximum(1, coords[:, 2] - coords[:, 0])
+    heights = np.maximum(1, coords[:, 3] - coords[:, 1])
+    ink_pixels = _box_sums(ink, coords)
+    horiz_pixels = _box_sums((horizontal_lines > 0).astype(np.uint8), coords)
+    vert_pixels = _box_sums((vertical_lines > 0).astype(np.uint8), coords)
+
+    count, _, stats, centroids = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    stats, centroids = stats[1:], centroids[1:]
+    largest = np.zeros(len(boxes), dtype=np.int64)
+    components = np.zeros(len(boxes), dtype=np.int64)
+    if count > 1:
+        areas = stats[:, cv2.CC_STAT_AREA]
+        for start in range(0, len(boxes), _CHUNK):
+            chunk = coords[start : start + _CHUNK]
+            inside = (
+                (centroids[None, :, 0] >= chunk[:, 0, None])
+                & (centroids[None, :, 0] < chunk[:, 2, None])
+                & (centroids[None, :, 1] >= chunk[:, 1, None])
+                & (centroids[None, :, 1] < chunk[:, 3, None])
+            )
+            components[start : start + _CHUNK] = inside.sum(axis=1)
+            largest[start : start + _CHUNK] = np.where(inside, areas[None, :], 0).max(axis=1)
+        text_height = _text_height(stats[:, cv2.CC_STAT_HEIGHT], min_text_height)
+    else:
+        text_height = 0.0
+
+    safe_ink = np.maximum(1, ink_pixels)
+    density = ink_pixels / (widths * heights)
+    line_share = np.minimum(1.0, (horiz_pixels + vert_pixels) / safe_ink)
+    largest_share = largest / safe_ink
+    aspect = np.maximum(widths / heights, heights / widths)
+    large = heights >= figure_min_height * max(1.0, text_height)
+
+    rule = (aspect >= rule_aspect_ratio) & ((line_share >= 0.5) | (components <= 2))
+    table = (
+        ~rule
+        & large
+        & (horiz_pixels > 0)
+        & (vert_pixels > 0)
+        & (line_share >= table_line_ratio)
+    )
+    figure = (
+        ~rule
+        & ~table
+        & large
+        & ((density >= figure_ink_ratio) | (largest_share >= figure_component_ratio))
+    )
+    kinds = np.full(len(boxes), "text", dtype=object)
+    kinds[figure] = "figure"
+    kinds[table] = "table"
+    kinds[rule] = "rule"
+    return kinds.tolist()
+
+
+def estimate_text_height(gray: np.ndarray, ink_level: int = 128, min_height: float = 4.0) -> float:
+    ink = (gray < ink_level).astype(np.uint8)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    if count <= 1:
+        return 0.0
+    return _text_height(stats[1:, cv2.CC_STAT_HEIGHT], min_height)
+
+
+def _box_sums(mask: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    integral = cv2.integral(mask)
+    left, top, right, bottom = coords.T
+    return (
+        integral[bottom, right]
+        - integral[top, right]
+        - integral[bottom, left]
+        + integral[top, left]
+    ).astype(np.int64)
+
+
+def _text_height(heights: np.ndarray, min_height: float) -> float:
+    heights = heights[heights >= min_height]
+    if heights.size == 0:
+        return 0.0
+    return float(np.median(heights))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from PIL import Image
+
+from utils.pdf_utils import pdf_info
+
+SCHEDULE_POLICIES = ("fifo", "sjf", "largest")
+UNREADABLE_PIXELS_PER_BYTE = 8
+
+
+@dataclass
+class JobEstimate:
+    path: Path
+    pages: int
+    pixels: int
+    seconds: float
+
+
+@dataclass
+class SchedulePlan:
+    jobs: List[JobEstimate]
+    policy: str
+    workers: int
+
+    @property
+    def files(self) -> List[Path]:
+        return [job.path for job in self.jobs]
+
+    @property
+    def pages(self) -> int:
+        return sum(job.pages for job in self.jobs)
+
+    @property
+    def predicted_seconds(self) -> float:
+        return sum(job.seconds for job in self.jobs) / max(1, self.workers)
+
+    def summary(self) -> str:
+        return (
+            f"Scheduled {len(self.jobs)} file(s), {self.pages} page(s) ({self.policy}); "
+            f"predicted runtime {_format_seconds(self.predicted_seconds)}"
+        )
+
+
+def estimate_job(
+    path: Path,
+    dpi: int,
+    seconds_per_megapixel: float = 0.3,
+    seconds_per_page: float = 0.2,
+    poppler_path: str | None = None,
+) -> JobEstimate:
+    pages, pixels = 1, 0
+    try:
+        if path.suffix.lower() == ".pdf":
+            pages, width_pts, height_pts = pdf_info(path, poppler_path=poppler_path)
+            page_pixels = (width_pts / 72.0 * dpi) * (height_pts / 72.0 * dpi)
+            pixels = int(pages * page_pixels)
+        else:
+            with Image.open(path) as image:
+                pixels = image.width * image.height
+    except (OSError, RuntimeError, ValueError):
+        pixels = path.stat().st_size * UNREADABLE_PIXELS_PER_BYTE
+    seconds = pixels / 1e6 * seconds_per_megapixel + pages * seconds_per_page
+    return JobEstimate(path=path, pages=pages, pixels=pixels, seconds=seconds)
+
+
+def plan_jobs(
+    files: List[Path],
+    dpi: int,
+    policy: str = "fifo",
+    workers: int = 1,
+    seconds_per_megapixel: float = 0.3,
+    seconds_per_page: float = 0.2,
+    poppler_path: str | None = None,
+    estimate: bool = True,
+) -> SchedulePlan:
+    if not estimate and policy == "fifo":
+        jobs = [JobEstimate(path=path, pages=0, pixels=0, seconds=0.0) for path in files]
+        return SchedulePlan(jobs=jobs, policy=policy, workers=workers)
+    jobs = [
+        estimate_job(path, dpi, seconds_per_megapixel, seconds_per_page, poppler_path)
+        for path in files
+    ]
+    if policy == "sjf":
+        jobs.sort(key=lambda job: job.seconds)
+    elif policy == "largest":
+        jobs.sort(key=lambda job: job.seconds, reverse=True)
+    return SchedulePlan(jobs=jobs, policy=policy, workers=workers)
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from models.detectors.base import Box
+
+SCRIPT_MODES = ("off", "region", "osd")
+SCRIPT_LANGS = {"Latin": "eng", "Arabic": "ara"}
+
+
+class ScriptRouter:
+    def __init__(
+        self,
+        lang: str,
+        mode: str = "off",
+        min_confidence: float = 2.0,
+        tesseract_cmd: str | None = None,
+        lock_after: int = 0,
+    ) -> None:
+        self.lang = lang
+        self.languages = [part for part in lang.split("+") if part]
+        self.mode = mode.lower()
+        self.min_confidence = min_confidence
+        self.tesseract_cmd = tesseract_cmd
+        self.lock_after = max(0, int(lock_after))
+        self._page_cache: Dict[int, str | None] = {}
+        self._agreed: str | None = None
+        self._agree_count = 0
+        self._mixed = False
+        self._locked: str | None = None
+        self._since_check = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off" and len(self.languages) > 1
+
+    def lang_for_region(
+        self,
+        page_index: int,
+        page_image: Image.Image,
+        box: Box,
+        crop: Image.Image,
+    ) -> str:
+        if not self.enabled:
+            return self.lang
+
+        if self._locked is not None and self._since_check + 1 < self.lock_after:
+            self._since_check += 1
+            script = self._locked
+        else:
+            script = self._classify(page_index, page_image, crop)
+            self._vote(script)
+
+        lang = SCRIPT_LANGS.get(script or "")
+        if lang in self.languages:
+            return lang
+        return self.lang
+
+    def _classify(self, page_index: int, page_image: Image.Image, crop: Image.Image) -> str | None:
+        if self.mode == "osd":
+            if page_index not in self._page_cache:
+                self._page_cache[page_index] = self._detect_page_script(page_image)
+            return self._page_cache[page_index]
+        return classify_script(crop)
+
+    def _vote(self, script: str | None) -> None:
+        if self._mixed or self.lock_after == 0:
+            return
+        self._since_check = 0
+        if self._locked is not None and script != self._locked:
+            self._locked = None
+            self._mixed = True
+            return
+        if script is None:
+            self._agree_count = 0
+            return
+        if self._agreed is not None and self._agreed != script:
+            self._mixed = True
+            return
+        self._agreed = script
+        self._agree_count += 1
+        if self._agree_count >= self.lock_after:
+            self._locked = script
+
+    def _detect_page_script(self, page_image: Image.Image) -> str | None:
+        if self.tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+        try:
+            osd = pytesseract.image_to_osd(
+                page_image, output_type=pytesseract.Output.DICT
+            )
+        except pytesseract.TesseractError:
+            return None
+        if float(osd.get("script_conf", 0.0)) < self.min_confidence:
+            return None
+        return str(osd.get("script"))
+
+
+def classify_script(
+    image: Image.Image,
+    max_side: int = 512,
+    min_components: int = 8,
+) -> str | None:
+    gray = np.asarray(image.convert("L"))
+    height, width = gray.shape
+    factor = min(1.0, max_side / max(1, max(height, width)))
+    if factor < 1.0:
+        gray = cv2.resize(
+            gray,
+            (max(1, int(width * factor)), max(1, int(height * factor))),
+            interpolation=cv2.INTER_AREA,
+        )
+    _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    comp_w = stats[1:, cv2.CC_STAT_WIDTH]
+    comp_h = stats[1:, cv2.CC_STAT_HEIGHT]
+    glyphs = comp_h >= 3
+    if count - 1 < min_components or int(glyphs.sum()) < min_components:
+        return None
+    wide_ratio = float(np.mean(comp_w[glyphs] > 1.5 * comp_h[glyphs]))
+
+    rows = ink.sum(axis=1).astype(np.float32)
+    ink_rows = rows[rows > 0]
+    if ink_rows.size == 0:
+        return None
+    baseline_ratio = float(ink_rows.max() / max(1.0, float(ink_rows.mean())))
+
+    if baseline_ratio >= 2.8 and wide_ratio >= 0.25:
+        return "Arabic"
+    if baseline_ratio <= 2.0 and wide_ratio <= 0.15:
+        return "Latin"
+    return None
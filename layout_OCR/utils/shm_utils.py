@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.ink_utils import image_dpi, set_image_dpi
+
+SHARED_MODES = ("L", "RGB", "RGBA")
+
+
+@dataclass(frozen=True)
+class SharedPageHandle:
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    dpi: float
+
+
+class SharedPageStore:
+    def __init__(self) -> None:
+        self._segments: Dict[str, SharedMemory] = {}
+
+    def __enter__(self) -> "SharedPageStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def put(self, image: Image.Image) -> SharedPageHandle:
+        shared = image if image.mode in SHARED_MODES else image.convert("RGB")
+        array = np.asarray(shared)
+        segment = SharedMemory(create=True, size=max(1, array.nbytes))
+        self._segments[segment.name] = segment
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+        view[...] = array
+        del view
+        if shared is not image:
+            shared.close()
+        return SharedPageHandle(
+            segment.name, tuple(array.shape), array.dtype.str, image_dpi(image)
+        )
+
+    def release(self, handle: SharedPageHandle) -> None:
+        segment = self._segments.pop(handle.name, None)
+        if segment is not None:
+            _destroy(segment)
+
+    def close(self) -> None:
+        while self._segments:
+            _, segment = self._segments.popitem()
+            _destroy(segment)
+
+
+@contextmanager
+def attach_page(handle: SharedPageHandle) -> Iterator[Image.Image]:
+    if sys.version_info >= (3, 13):
+        segment = SharedMemory(name=handle.name, track=False)
+    else:
+        segment = SharedMemory(name=handle.name)
+    array = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=segment.buf)
+    image = set_image_dpi(Image.fromarray(array), handle.dpi)
+    try:
+        yield image
+    finally:
+        image.close()
+        del image
+        del array
+        try:
+            segment.close()
+        except BufferError:
+            pass
+
+
+def _destroy(segment: SharedMemory) -> None:
+    try:
+        segment.close()
+    except BufferError:
+        pass
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
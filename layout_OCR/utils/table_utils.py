@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import cv2
+import numpy as np
+
+from models.detectors.base import Box
+from models.ocr_result import OcrResult, OcrTable, TableCell
+
+
+@dataclass
+class TableGrid:
+    box: Box
+    row_edges: List[int]
+    col_edges: List[int]
+
+    @property
+    def rows(self) -> int:
+        return len(self.row_edges) - 1
+
+    @property
+    def cols(self) -> int:
+        return len(self.col_edges) - 1
+
+    def row_box(self, row: int) -> Box:
+        return Box(
+            self.col_edges[0], self.row_edges[row], self.col_edges[-1], self.row_edges[row + 1]
+        )
+
+    def cell_box(self, row: int, col: int) -> Box:
+        return Box(
+            self.col_edges[col],
+            self.row_edges[row],
+            self.col_edges[col + 1],
+            self.row_edges[row + 1],
+        )
+
+
+def find_tables(
+    horizontal_lines: np.ndarray,
+    vertical_lines: np.ndarray,
+    min_rows: int = 2,
+    min_cols: int = 2,
+    min_cell_size: int = 8,
+    line_coverage: float = 0.5,
+) -> List[TableGrid]:
+    grid = cv2.bitwise_or(horizontal_lines, vertical_lines)
+    grid = cv2.dilate(grid, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(grid, connectivity=8)
+    tables: List[TableGrid] = []
+    for label in range(1, count):
+        x, y, w, h = (int(value) for value in stats[label, :4])
+        if w < 2 * min_cell_size or h < 2 * min_cell_size:
+            continue
+        horiz = horizontal_lines[y : y + h, x : x + w] > 0
+        vert = vertical_lines[y : y + h, x : x + w] > 0
+        row_edges = _line_positions(horiz.sum(axis=1), w * line_coverage, min_cell_size)
+        col_edges = _line_positions(vert.sum(axis=0), h * line_coverage, min_cell_size)
+        if len(row_edges) < min_rows + 1 or len(col_edges) < min_cols + 1:
+            continue
+        tables.append(
+            TableGrid(
+                box=Box(x + col_edges[0], y + row_edges[0], x + col_edges[-1], y + row_edges[-1]),
+                row_edges=[y + edge for edge in row_edges],
+                col_edges=[x + edge for edge in col_edges],
+            )
+        )
+    return tables
+
+
+def limit_row_height(tables: Sequence[TableGrid], max_row_height: float) -> List[TableGrid]:
+    return [
+        table
+        for table in tables
+        if max(b - a for a, b in zip(table.row_edges, table.row_edges[1:])) <= max_row_height
+    ]
+
+
+def drop_boxes_in_tables(boxes: Sequence[Box], tables: Sequence[TableGrid]) -> List[Box]:
+    return [
+        box
+        for box in boxes
+        if not any(_contains(table.box, box.center_x, box.center_y) for table in tables)
+    ]
+
+
+def strip_lines(
+    strip: np.ndarray,
+    horizontal_lines: np.ndarray,
+    vertical_lines: np.ndarray,
+    box: Box,
+    background: int = 255,
+) -> np.ndarray:
+    lines = (
+        horizontal_lines[box.top : box.bottom, box.left : box.right]
+        | vertical_lines[box.top : box.bottom, box.left : box.right]
+    )
+    lines = cv2.dilate(lines, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+    cleaned = strip.copy()
+    cleaned[lines > 0] = background
+    return cleaned
+
+
+def assemble_table(
+    grid: TableGrid, row_results: Sequence[OcrResult | None], rtl: bool = False
+) -> OcrTable:
+    cells: List[TableCell] = []
+    for row, result in enumerate(row_results):
+        texts: List[List[str]] = [[] for _ in range(grid.cols)]
+        if result is not None:
+            for line in result.lines:
+                parts: List[List[str]] = [[] for _ in range(grid.cols)]
+                for word in line.words:
+                    col = _column_of(grid.col_edges, word.box.center_x)
+                    if col is not None and word.text.strip():
+                        parts[col].append(word.text)
+                for col, words in enumerate(parts):
+                    if words:
+                        texts[col].append(" ".join(words))
+        for col in range(grid.cols):
+            cells.append(
+                TableCell(
+                    row=row,
+                    col=grid.cols - 1 - col if rtl else col,
+                    box=grid.cell_box(row, col),
+                    text=" ".join(texts[col]),
+                )
+            )
+    cells.sort(key=lambda cell: (cell.row, cell.col))
+    return OcrTable(rows=grid.rows, cols=grid.cols, cells=cells)
+
+
+def _line_positions(profile: np.ndarray, min_length: float, min_gap: int) -> List[int]:
+    positions = np.flatnonzero(profile >= min_length)
+    if positions.size == 0:
+        return []
+    edges: List[int] = []
+    start = prev = int(positions[0])
+    for pos in positions[1:]:
+        pos = int(pos)
+        if pos - prev > 1:
+            edges.append((start + prev) // 2)
+            start = pos
+        prev = pos
+    edges.append((start + prev) // 2)
+
+    merged = [edges[0]]
+    for edge in edges[1:]:
+        if edge - merged[-1] >= min_gap:
+            merged.append(edge)
+    return merged
+
+
+def _column_of(edges: List[int], x: float) -> int | None:
+    index = int(np.searchsorted(edges, x, side="right")) - 1
+    if 0 <= index < len(edges) - 1:
+        return index
+    return None
+
+
+def _contains(box: Box, x: float, y: float) -> bool:
+    return box.left <= x < box.right and box.top <= y < box.bottom
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from controllers.pipeline_controller import PipelineController
+from models.detectors.base import Box
+from models.detectors.simple_cv_detector import SimpleCvConfig, SimpleCvDetector
+from models.document_model import Document
+from utils.config_utils import cast_for
+from utils.file_utils import collect_inputs
+from utils.metrics_utils import box_f1, char_error_rate
+
+DEFAULT_GRID: Dict[str, List[object]] = {
+    "adaptive_block_size": [15, 25, 35],
+    "adaptive_c": [10, 15, 20],
+    "remove_lines": [True, False],
+    "line_length_ratio": [0.1, 0.15],
+    "kernel_width": [6, 10, 16],
+    "kernel_height": [2, 3, 5],
+}
+THRESHOLD_KEYS = ("adaptive_block_size", "adaptive_c", "border_margin")
+LINE_KEYS = ("remove_lines", "line_length_ratio", "line_thickness")
+
+_WORKER_STATE: Dict[str, object] = {}
+
+
+@dataclass
+class TuneSample:
+    path: Path
+    truth_boxes: List[List[Box]] | None
+    truth_text: str | None
+
+
+@dataclass
+class TuneResult:
+    params: Dict[str, object]
+    accuracy: float
+    pages: int
+    seconds: float
+
+    @property
+    def pages_per_second(self) -> float:
+        if self.seconds <= 0:
+            return 0.0
+        return self.pages / self.seconds
+
+
+def find_samples(samples_dir: Path, metric: str = "auto") -> Tuple[List[TuneSample], str]:
+    samples: List[TuneSample] = []
+    for path in collect_inputs(samples_dir):
+        boxes_path = path.with_name(f"{path.stem}.boxes.json")
+        text_path = path.with_name(f"{path.stem}.gt.txt")
+        truth_boxes = _load_truth_boxes(boxes_path) if boxes_path.is_file() else None
+        truth_text = text_path.read_text(encoding="utf-8") if text_path.is_file() else None
+        if truth_boxes is None and truth_text is None:
+            continue
+        samples.append(TuneSample(path, truth_boxes, truth_text))
+
+    if metric == "auto":
+        if samples and all(sample.truth_boxes is not None for sample in samples):
+            metric = "boxes"
+        else:
+            metric = "text"
+    key = "truth_boxes" if metric == "boxes" else "truth_text"
+    samples = [sample for sample in samples if getattr(sample, key) is not None]
+    if not samples:
+        raise FileNotFoundError(
+            f"No samples with `<name>.boxes.json` or `<name>.gt.txt` found in {samples_dir}"
+        )
+    return samples, metric
+
+
+def parse_grid(specs: List[str] | None) -> Dict[str, List[object]]:
+    if not specs:
+        return dict(DEFAULT_GRID)
+    defaults = {item.name: item.default for item in fields(SimpleCvConfig)}
+    grid: Dict[str, List[object]] = {}
+    for spec in specs:
+        key, _, values = spec.partition("=")
+        key = key.strip().replace("-", "_")
+        if key not in defaults or not values:
+            raise ValueError(f"Invalid grid entry: {spec}")
+        cast = cast_for(defaults[key])
+        grid[key] = [cast(value.strip()) for value in values.split(",") if value.strip()]
+    return grid
+
+
+def expand_grid(base: Dict[str, object], grid: Dict[str, List[object]]) -> List[Dict[str, object]]:
+    keys = list(grid)
+    seen = set()
+    candidates: List[Dict[str, object]] = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        params = dict(base)
+        params.update(zip(keys, values))
+        if not params["remove_lines"]:
+            for key in LINE_KEYS[1:]:
+                params[key] = base[key]
+        if not params["merge_linefree"]:
+            params["merge_iou_threshold"] = base["merge_iou_threshold"]
+            params["merge_area_ratio"] = base["merge_area_ratio"]
+        signature = tuple(sorted(params.items()))
+        if signature in seen:
+            continue
+        seen.add(signature)
+        candidates.append(params)
+    return candidates
+
+
+def run_tuning(
+    samples: List[TuneSample],
+    candidates: List[Dict[str, object]],
+    metric: str,
+    dpi: int,
+    jobs: int | None = None,
+    poppler_path: str | None = None,
+    controller_options: Dict[str, object] | None = None,
+) -> List[TuneResult]:
+    groups: Dict[Tuple[object, ...], List[Dict[str, object]]] = {}
+    for params in candidates:
+        key = tuple(params[name] for name in THRESHOLD_KEYS)
+        groups.setdefault(key, []).append(params)
+
+    results: List[TuneResult] = []
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(samples, metric, dpi, poppler_path, controller_options or {}),
+    ) as executor:
+        for group_results in executor.map(_evaluate_group, groups.values()):
+            results.extend(group_results)
+
+    results.sort(key=lambda item: (-round(item.accuracy, 3), -item.pages_per_second))
+    return results
+
+
+def format_profile_section(result: TuneResult) -> str:
+    lines = [
+        f"; accuracy = {result.accuracy:.4f}, pages_per_second = {result.pages_per_second:.2f}",
+        "[cv]",
+    ]
+    for item in fields(SimpleCvConfig):
+        value = result.params[item.name]
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        lines.append(f"{item.name} = {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _load_truth_boxes(path: Path) -> List[List[Box]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("pages", [])
+    if data and data[0] and isinstance(data[0][0], (int, float)):
+        data = [data]
+    return [[Box(*(int(v) for v in box[:4])) for box in page] for page in data]
+
+
+def _init_worker(
+    samples: List[TuneSample],
+    metric: str,
+    dpi: int,
+    poppler_path: str | None,
+    controller_options: Dict[str, object],
+) -> None:
+    pages: List[List[np.ndarray]] = []
+    images = []
+    for sample in samples:
+        gray_pages: List[np.ndarray] = []
+        sample_images = []
+        for page in Document(sample.path).load_pages(dpi, poppler_path=poppler_path):
+            gray = page.image.convert("L")
+            page.image.close()
+            gray_pages.append(np.asarray(gray))
+            if metric == "text":
+                sample_images.append(gray)
+        pages.append(gray_pages)
+        images.append(sample_images)
+
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(
+        {
+            "samples": samples,
+            "metric": metric,
+            "pages": pages,
+            "images": images,
+            "text_cache": {},
+        }
+    )
+    if metric == "text":
+        _WORKER_STATE["controller"] = PipelineController(
+            detector_options={},
+            ocr_options=dict(controller_options.get("ocr_options", {})),
+            order_options=dict(controller_options.get("order_options", {})),
+            view_options={},
+            tesseract_cmd=controller_options.get("tesseract_cmd"),
+        )
+
+
+def _evaluate_group(candidates: List[Dict[str, object]]) -> List[TuneResult]:
+    pages: List[List[np.ndarray]] = _WORKER_STATE["pages"]
+    page_count = sum(len(sample_pages) for sample_pages in pages)
+
+    first = SimpleCvDetector(SimpleCvConfig(**candidates[0]))
+    start = time.perf_counter()
+    thresholds = [[first.threshold(gray) for gray in sample_pages] for sample_pages in pages]
+    threshold_seconds = time.perf_counter() - start
+
+    line_cache: Dict[Tuple[object, ...], Tuple[List[List[np.ndarray]], float]] = {}
+    results: List[TuneResult] = []
+    for params in candidates:
+        detector = SimpleCvDetector(SimpleCvConfig(**params))
+        line_key = tuple(params[name] for name in LINE_KEYS)
+        if line_key not in line_cache:
+            start = time.perf_counter()
+            cleaned = [
+                [detector.remove_lines(thresh) for thresh in sample_thresholds]
+                for sample_thresholds in thresholds
+            ]
+            line_cache[line_key] = (cleaned, time.perf_counter() - start)
+        cleaned, line_seconds = line_cache[line_key]
+
+        start = time.perf_counter()
+        boxes = [
+            [
+                detector.boxes_from_masks(raw, clean)
+                for raw, clean in zip(sample_thresholds, sample_cleaned)
+            ]
+            for sample_thresholds, sample_cleaned in zip(thresholds, cleaned)
+        ]
+        detect_seconds = time.perf_counter() - start
+
+        accuracy, ocr_seconds = _score(boxes)
+        results.append(
+            TuneResult(
+                params=params,
+                accuracy=accuracy,
+                pages=page_count,
+                seconds=threshold_seconds + line_seconds + detect_seconds + ocr_seconds,
+            )
+        )
+    return results
+
+
+def _score(boxes: List[List[List[Box]]]) -> Tuple[float, float]:
+    samples: List[TuneSample] = _WORKER_STATE["samples"]
+    if _WORKER_STATE["metric"] == "boxes":
+        scores = [
+            box_f1(page_boxes, truth)
+            for sample, sample_boxes in zip(samples, boxes)
+            for page_boxes, truth in itertools.zip_longest(
+                sample_boxes, sample.truth_boxes or [], fillvalue=[]
+            )
+        ]
+        return float(np.mean(scores)) if scores else 0.0, 0.0
+
+    controller: PipelineController = _WORKER_STATE["controller"]
+    text_cache: Dict[Tuple[object, ...], Tuple[str, float]] = _WORKER_STATE["text_cache"]
+    errors: List[float] = []
+    ocr_seconds = 0.0
+    for sample_index, (sample, sample_boxes) in enumerate(zip(samples, boxes)):
+        page_texts: List[str] = []
+        for page_index, page_boxes in enumerate(sample_boxes):
+            key = (sample_index, page_index, tuple(page_boxes))
+            if key not in text_cache:
+                image = _WORKER_STATE["images"][sample_index][page_index]
+                start = time.perf_counter()
+                result = controller.process_page(image, page_index, boxes=page_boxes)
+                text_cache[key] = (result.text, time.perf_counter() - start)
+            text, seconds = text_cache[key]
+            page_texts.append(text)
+            ocr_seconds += seconds
+        errors.append(char_error_rate("\n".join(page_texts), sample.truth_text or ""))
+    accuracy = max(0.0, 1.0 - float(np.mean(errors))) if errors else 0.0
+    return accuracy, ocr_seconds
@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from controllers.pipeline_controller import PipelineController
+from controllers.pipeline_controller import OUTPUT_FORMATS, PipelineController
 from models.detectors.registry import available_detectors
 
 
@@ -11,7 +11,7 @@ def build_parser() -> argparse.ArgumentParser:
     detector_names = sorted(available_detectors().keys())
 
     parser = argparse.ArgumentParser(
-        description="Detect layout blocks in PDFs or images and export boxed images."
+        description="Detect layout blocks in PDFs or images and export boxed images or box files."
     )
     parser.add_argument("--input", "-i", required=True, help="PDF, image, or folder")
     parser.add_argument("--output", "-o", default="output", help="Output folder")
@@ -23,6 +23,26 @@ def build_parser() -> argparse.ArgumentParser:
         help=f"Detector to run: {', '.join(detector_names)}",
     )
     parser.add_argument("--dpi", type=int, default=200, help="PDF render DPI")
+    parser.add_argument(
+        "--format",
+        "-f",
+        default="png",
+        choices=list(OUTPUT_FORMATS),
+        help="png: boxed page images; jsonl/npz: one box file per document, no rendering",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes; pages and files are split across them",
+    )
+    parser.add_argument(
+        "--pages-per-task",
+        type=int,
+        default=4,
+        help="PDF pages rendered and detected per worker task",
+    )
 
     parser.add_argument("--min-area", type=int, default=200, help="Min contour area")
     parser.add_argument("--kernel-width", type=int, default=25, help="Merge kernel width")
@@ -102,7 +122,13 @@ def main() -> int:
     view_options = {"color": args.box_color, "width": args.box_width}
 
     controller = PipelineController(
-        args.detector, detector_options, view_options, poppler_path=args.poppler_path
+        args.detector,
+        detector_options,
+        view_options,
+        poppler_path=args.poppler_path,
+        output_format=args.format,
+        jobs=args.jobs,
+        pages_per_task=args.pages_per_task,
     )
     outputs = controller.run(Path(args.input), Path(args.output), dpi=args.dpi)
 
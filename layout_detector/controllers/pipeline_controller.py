@@ -1,13 +1,36 @@
 from __future__ import annotations
 
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 
 from models.document_model import Document
+from models.detectors.base import Box
 from models.detectors.registry import build_detector
-from utils.file_utils import build_output_name, collect_inputs, ensure_output_dir
+from utils.box_utils import BoxFile, PageBoxes, hash_config, hash_file, write_box_file
+from utils.file_utils import (
+    build_box_name,
+    build_output_name,
+    collect_inputs,
+    ensure_output_dir,
+)
 from views.render_view import draw_boxes
 
+OUTPUT_FORMATS = ("png", "jsonl", "npz")
+
+_WORKER_CONTROLLER: "PipelineController | None" = None
+
+
+@dataclass
+class DetectedPage:
+    index: int
+    width: int
+    height: int
+    boxes: List[Box] = field(default_factory=list)
+    output_path: Path | None = None
+
 
 class PipelineController:
     def __init__(
@@ -16,10 +39,25 @@ class PipelineController:
         detector_options: Dict[str, object] | None = None,
         view_options: Dict[str, object] | None = None,
         poppler_path: str | None = None,
+        output_format: str = "png",
+        jobs: int = 1,
+        pages_per_task: int = 4,
     ) -> None:
+        self._worker_kwargs = {
+            "detector_name": detector_name,
+            "detector_options": detector_options,
+            "view_options": view_options,
+            "poppler_path": poppler_path,
+            "output_format": output_format,
+        }
         self.detector = build_detector(detector_name, detector_options)
+        self.detector_name = detector_name
+        self.detector_options = detector_options or {}
         self.view_options = view_options or {}
         self.poppler_path = poppler_path
+        self.output_format = output_format if output_format in OUTPUT_FORMATS else "png"
+        self.jobs = max(1, int(jobs))
+        self.pages_per_task = max(1, int(pages_per_task))
 
     def run(self, input_path: Path, output_dir: Path, dpi: int) -> List[Path]:
         files = collect_inputs(input_path)
@@ -27,26 +65,113 @@ class PipelineController:
             raise FileNotFoundError(f"No supported files found in {input_path}")
 
         output_dir = ensure_output_dir(output_dir)
+        tasks = self._plan_tasks(files)
+        remaining = Counter(file_path for file_path, _, _ in tasks)
+        detected: Dict[Path, List[DetectedPage]] = {}
         outputs: List[Path] = []
-        for file_path in files:
-            outputs.extend(self._process_file(file_path, output_dir, dpi))
+        for (file_path, _, _), pages in zip(tasks, self._run_tasks(tasks, output_dir, dpi)):
+            detected.setdefault(file_path, []).extend(pages)
+            remaining[file_path] -= 1
+            if remaining[file_path] == 0:
+                outputs.extend(
+                    self._finish_file(file_path, output_dir, dpi, detected.pop(file_path))
+                )
         return outputs
 
-    def _process_file(self, file_path: Path, output_dir: Path, dpi: int) -> List[Path]:
+    def _plan_tasks(self, files: List[Path]) -> List[Tuple[Path, int, int]]:
+        tasks: List[Tuple[Path, int, int]] = []
+        for file_path in files:
+            page_count = Document(file_path).page_count(poppler_path=self.poppler_path)
+            for first_page in range(1, page_count + 1, self.pages_per_task):
+                last_page = min(page_count, first_page + self.pages_per_task - 1)
+                tasks.append((file_path, first_page, last_page))
+        return tasks
+
+    def _run_tasks(
+        self, tasks: List[Tuple[Path, int, int]], output_dir: Path, dpi: int
+    ) -> Iterable[List[DetectedPage]]:
+        if self.jobs == 1 or len(tasks) == 1:
+            for file_path, first_page, last_page in tasks:
+                yield self._detect_pages(file_path, output_dir, dpi, first_page, last_page)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(self._worker_kwargs,),
+        ) as executor:
+            yield from executor.map(
+                _detect_pages,
+                [file_path for file_path, _, _ in tasks],
+                [output_dir] * len(tasks),
+                [dpi] * len(tasks),
+                [first_page for _, first_page, _ in tasks],
+                [last_page for _, _, last_page in tasks],
+            )
+
+    def _detect_pages(
+        self,
+        file_path: Path,
+        output_dir: Path,
+        dpi: int,
+        first_page: int,
+        last_page: int,
+    ) -> List[DetectedPage]:
         document = Document(file_path)
-        outputs: List[Path] = []
-        for page in document.load_pages(dpi, poppler_path=self.poppler_path):
+        pages = document.load_pages(
+            dpi, poppler_path=self.poppler_path, first_page=first_page, last_page=last_page
+        )
+        detected: List[DetectedPage] = []
+        for page in pages:
             boxes = self.detector.detect(page.image)
-            rendered = draw_boxes(
-                page.image,
-                boxes,
-                color=self.view_options.get("color", "red"),
-                width=self.view_options.get("width", 2),
-            )
-            page_index = page.index if document.is_pdf else None
-            output_name = build_output_name(page.source_name, page_index)
-            output_path = output_dir / output_name
-            rendered.save(output_path)
-            outputs.append(output_path)
+            result = DetectedPage(page.index, page.image.width, page.image.height, boxes)
+            if self.output_format == "png":
+                rendered = draw_boxes(
+                    page.image,
+                    boxes,
+                    color=self.view_options.get("color", "red"),
+                    width=self.view_options.get("width", 2),
+                )
+                page_index = page.index if document.is_pdf else None
+                output_name = build_output_name(page.source_name, page_index)
+                result.output_path = output_dir / output_name
+                rendered.save(result.output_path)
+                rendered.close()
             page.image.close()
-        return outputs
+            detected.append(result)
+        return detected
+
+    def _finish_file(
+        self, file_path: Path, output_dir: Path, dpi: int, pages: List[DetectedPage]
+    ) -> List[Path]:
+        if self.output_format == "png":
+            return [page.output_path for page in pages if page.output_path is not None]
+
+        box_file = BoxFile(
+            source=str(file_path.resolve()),
+            sha256=hash_file(file_path),
+            dpi=dpi,
+            detector=self.detector_name,
+            config_hash=hash_config(self.detector_name, self.detector_options),
+            pages=[
+                PageBoxes(page.index, page.width, page.height, page.boxes)
+                for page in sorted(pages, key=lambda page: page.index)
+            ],
+        )
+        output_path = output_dir / build_box_name(file_path.stem, self.output_format)
+        return [write_box_file(output_path, box_file, self.output_format)]
+
+
+def _init_worker(controller_kwargs: Dict[str, object]) -> None:
+    global _WORKER_CONTROLLER
+    _WORKER_CONTROLLER = PipelineController(**controller_kwargs)
+
+
+def _detect_pages(
+    file_path: Path,
+    output_dir: Path,
+    dpi: int,
+    first_page: int,
+    last_page: int,
+) -> List[DetectedPage]:
+    return _WORKER_CONTROLLER._detect_pages(file_path, output_dir, dpi, first_page, last_page)
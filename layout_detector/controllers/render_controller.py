@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+from PIL import Image
+
+from models.document_model import Document, DocumentPage
+from models.detectors.base import Box
+from utils.box_utils import BoxFile, PageBoxes, hash_file, read_box_file
+from utils.file_utils import build_output_name, collect_box_files, ensure_output_dir
+from views.render_view import draw_boxes
+
+
+class RenderController:
+    def __init__(
+        self,
+        view_options: Dict[str, object] | None = None,
+        poppler_path: str | None = None,
+        scale: float = 1.0,
+        pages_per_task: int = 4,
+    ) -> None:
+        self.view_options = view_options or {}
+        self.poppler_path = poppler_path
+        self.scale = min(1.0, max(0.01, float(scale)))
+        self.pages_per_task = max(1, int(pages_per_task))
+
+    def run(
+        self, boxes_path: Path, output_dir: Path, source_path: Path | None = None
+    ) -> List[Path]:
+        box_paths = collect_box_files(boxes_path)
+        if not box_paths:
+            raise FileNotFoundError(f"No box files found in {boxes_path}")
+
+        output_dir = ensure_output_dir(output_dir)
+        outputs: List[Path] = []
+        for box_path in box_paths:
+            box_file = read_box_file(box_path)
+            document = Document(self._resolve_source(box_file, source_path))
+            outputs.extend(self._render_document(document, box_file, output_dir))
+        return outputs
+
+    def _resolve_source(self, box_file: BoxFile, source_path: Path | None) -> Path:
+        path = Path(box_file.source)
+        if source_path is not None:
+            path = source_path if source_path.is_file() else source_path / path.name
+        if not path.is_file():
+            raise FileNotFoundError(f"Source document not found: {path}")
+        if hash_file(path) != box_file.sha256:
+            raise ValueError(f"{path} does not match the document the boxes were detected on")
+        return path
+
+    def _render_document(
+        self, document: Document, box_file: BoxFile, output_dir: Path
+    ) -> List[Path]:
+        dpi = max(1, int(round(box_file.dpi * self.scale)))
+        pages = {page.index: page for page in box_file.pages}
+        page_count = document.page_count(poppler_path=self.poppler_path)
+        outputs: List[Path] = []
+        for first_page in range(1, page_count + 1, self.pages_per_task):
+            last_page = min(page_count, first_page + self.pages_per_task - 1)
+            for page in document.load_pages(
+                dpi, poppler_path=self.poppler_path, first_page=first_page, last_page=last_page
+            ):
+                page_boxes = pages.get(page.index)
+                if page_boxes is None:
+                    page.image.close()
+                    continue
+                outputs.append(self._render_page(document, page, page_boxes, output_dir))
+        return outputs
+
+    def _render_page(
+        self,
+        document: Document,
+        page: DocumentPage,
+        page_boxes: PageBoxes,
+        output_dir: Path,
+    ) -> Path:
+        image = page.image
+        if not document.is_pdf and self.scale < 1.0:
+            size = (
+                max(1, int(image.width * self.scale)),
+                max(1, int(image.height * self.scale)),
+            )
+            image = image.resize(size, Image.Resampling.BILINEAR)
+            page.image.close()
+        scale_x = image.width / max(1, page_boxes.width)
+        scale_y = image.height / max(1, page_boxes.height)
+        boxes = [
+            Box(
+                int(box.left * scale_x),
+                int(box.top * scale_y),
+                int(box.right * scale_x),
+                int(box.bottom * scale_y),
+            )
+            for box in page_boxes.boxes
+        ]
+        rendered = draw_boxes(
+            image,
+            boxes,
+            color=self.view_options.get("color", "red"),
+            width=self.view_options.get("width", 2),
+        )
+        image.close()
+        page_index = page.index if document.is_pdf else None
+        output_path = output_dir / build_output_name(page.source_name, page_index)
+        rendered.save(output_path)
+        rendered.close()
+        return output_path
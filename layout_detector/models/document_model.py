@@ -6,7 +6,7 @@ from typing import List
 
 from PIL import Image
 
-from utils.pdf_utils import pdf_to_images
+from utils.pdf_utils import pdf_page_count, pdf_to_images
 
 
 @dataclass
@@ -24,11 +24,28 @@ class Document:
     def is_pdf(self) -> bool:
         return self.path.suffix.lower() == ".pdf"
 
-    def load_pages(self, dpi: int, poppler_path: str | None = None) -> List[DocumentPage]:
+    def page_count(self, poppler_path: str | None = None) -> int:
         if self.is_pdf:
-            images = pdf_to_images(self.path, dpi=dpi, poppler_path=poppler_path)
+            return pdf_page_count(self.path, poppler_path=poppler_path)
+        return 1
+
+    def load_pages(
+        self,
+        dpi: int,
+        poppler_path: str | None = None,
+        first_page: int = 1,
+        last_page: int | None = None,
+    ) -> List[DocumentPage]:
+        if self.is_pdf:
+            images = pdf_to_images(
+                self.path,
+                dpi=dpi,
+                poppler_path=poppler_path,
+                first_page=first_page,
+                last_page=last_page,
+            )
             return [
-                DocumentPage(index=i, image=image, source_name=self.path.stem)
+                DocumentPage(index=first_page - 1 + i, image=image, source_name=self.path.stem)
                 for i, image in enumerate(images)
             ]
 
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from controllers.render_controller import RenderController
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Render boxed overlay images from saved box files."
+    )
+    parser.add_argument(
+        "--boxes", "-b", required=True, help="Box file (.boxes.jsonl/.boxes.npz) or folder"
+    )
+    parser.add_argument(
+        "--input",
+        "-i",
+        default=None,
+        help="Source document or folder (default: path recorded in the box file)",
+    )
+    parser.add_argument("--output", "-o", default="output", help="Output folder")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Render at this fraction of the detection DPI (e.g. 0.25 for thumbnails)",
+    )
+    parser.add_argument(
+        "--poppler-path",
+        default=None,
+        help="Optional: Path to Poppler bin folder if not on PATH",
+    )
+    parser.add_argument("--box-color", default="red", help="Box color")
+    parser.add_argument("--box-width", type=int, default=2, help="Box line width")
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    controller = RenderController(
+        {"color": args.box_color, "width": args.box_width},
+        poppler_path=args.poppler_path,
+        scale=args.scale,
+    )
+    outputs = controller.run(
+        Path(args.boxes),
+        Path(args.output),
+        source_path=Path(args.input) if args.input else None,
+    )
+
+    for output_path in outputs:
+        print(output_path)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from models.detectors.base import Box
+
+BOX_FORMATS = ("jsonl", "npz")
+BOX_FILE_VERSION = 1
+
+
+@dataclass
+class PageBoxes:
+    index: int
+    width: int
+    height: int
+    boxes: List[Box] = field(default_factory=list)
+
+
+@dataclass
+class BoxFile:
+    source: str
+    sha256: str
+    dpi: int
+    detector: str
+    config_hash: str
+    pages: List[PageBoxes] = field(default_factory=list)
+
+    def header(self) -> Dict[str, object]:
+        return {
+            "version": BOX_FILE_VERSION,
+            "source": self.source,
+            "sha256": self.sha256,
+            "dpi": self.dpi,
+            "detector": self.detector,
+            "config_hash": self.config_hash,
+            "pages": len(self.pages),
+        }
+
+
+def write_box_file(path: Path, box_file: BoxFile, box_format: str = "jsonl") -> Path:
+    part_path = path.with_name(path.name + ".part")
+    if box_format == "npz":
+        with part_path.open("wb") as handle:
+            np.savez_compressed(handle, **_to_arrays(box_file))
+    else:
+        with part_path.open("w", encoding="utf-8") as handle:
+            handle.write(json.dumps(box_file.header(), ensure_ascii=False) + "\n")
+            for page in box_file.pages:
+                handle.write(json.dumps(_page_to_dict(page)) + "\n")
+    os.replace(part_path, path)
+    return path
+
+
+def read_box_file(path: Path) -> BoxFile:
+    if path.suffix.lower() == ".npz":
+        with np.load(path) as data:
+            return _from_arrays(data)
+
+    with path.open("r", encoding="utf-8") as handle:
+        lines = [line for line in handle if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty box file: {path}")
+    header = json.loads(lines[0])
+    pages = [_page_from_dict(json.loads(line)) for line in lines[1:]]
+    return _box_file(header, pages)
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_config(detector_name: str, options: Dict[str, object]) -> str:
+    payload = {"detector": detector_name, "options": options}
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _page_to_dict(page: PageBoxes) -> Dict[str, object]:
+    return {
+        "page": page.index + 1,
+        "width": page.width,
+        "height": page.height,
+        "boxes": [[box.left, box.top, box.right, box.bottom] for box in page.boxes],
+    }
+
+
+def _page_from_dict(data: Dict[str, object]) -> PageBoxes:
+    return PageBoxes(
+        index=int(data["page"]) - 1,
+        width=int(data["width"]),
+        height=int(data["height"]),
+        boxes=[Box(*(int(value) for value in box)) for box in data.get("boxes", [])],
+    )
+
+
+def _box_file(header: Dict[str, object], pages: List[PageBoxes]) -> BoxFile:
+    version = int(header.get("version", 0))
+    if version != BOX_FILE_VERSION:
+        raise ValueError(f"Unsupported box file version: {version}")
+    return BoxFile(
+        source=str(header["source"]),
+        sha256=str(header["sha256"]),
+        dpi=int(header["dpi"]),
+        detector=str(header["detector"]),
+        config_hash=str(header["config_hash"]),
+        pages=sorted(pages, key=lambda page: page.index),
+    )
+
+
+def _to_arrays(box_file: BoxFile) -> Dict[str, np.ndarray]:
+    rows = [
+        [page.index, box.left, box.top, box.right, box.bottom]
+        for page in box_file.pages
+        for box in page.boxes
+    ]
+    return {
+        "header": np.array(json.dumps(box_file.header(), ensure_ascii=False)),
+        "pages": np.array(
+            [[page.index, page.width, page.height] for page in box_file.pages], dtype=np.int32
+        ).reshape(-1, 3),
+        "boxes": np.array(rows, dtype=np.int32).reshape(-1, 5),
+    }
+
+
+def _from_arrays(data) -> BoxFile:
+    header = json.loads(str(data["header"]))
+    pages = {
+        int(index): PageBoxes(index=int(index), width=int(width), height=int(height))
+        for index, width, height in data["pages"]
+    }
+    for index, left, top, right, bottom in data["boxes"]:
+        pages[int(index)].boxes.append(Box(int(left), int(top), int(right), int(bottom)))
+    return _box_file(header, list(pages.values()))
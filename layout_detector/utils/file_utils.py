@@ -31,3 +31,17 @@ def build_output_name(base_name: str, page_index: int | None) -> str:
     if page_index is None:
         return f"{base_name}_boxes.png"
     return f"{base_name}_page_{page_index + 1}_boxes.png"
+
+
+def build_box_name(base_name: str, box_format: str) -> str:
+    return f"{base_name}.boxes.{box_format}"
+
+
+def collect_box_files(input_path: Path) -> List[Path]:
+    if input_path.is_file():
+        return [input_path]
+    return sorted(
+        path
+        for path in input_path.rglob("*.boxes.*")
+        if path.is_file() and path.suffix.lower() in (".jsonl", ".npz")
+    )
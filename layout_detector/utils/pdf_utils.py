@@ -3,16 +3,38 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pdf2image.exceptions import PDFInfoNotInstalledError
 from PIL import Image
 
+POPPLER_MISSING = (
+    "Poppler is required for PDF rendering. Install it and ensure `pdftoppm` is on PATH, "
+    "or provide --poppler-path pointing to the Poppler bin directory."
+)
 
-def pdf_to_images(path: Path, dpi: int = 200, poppler_path: str | None = None) -> List[Image.Image]:
+
+def pdf_to_images(
+    path: Path,
+    dpi: int = 200,
+    poppler_path: str | None = None,
+    first_page: int | None = None,
+    last_page: int | None = None,
+) -> List[Image.Image]:
+    try:
+        return convert_from_path(
+            str(path),
+            dpi=dpi,
+            poppler_path=poppler_path,
+            first_page=first_page,
+            last_page=last_page,
+        )
+    except PDFInfoNotInstalledError as err:
+        raise RuntimeError(POPPLER_MISSING) from err
+
+
+def pdf_page_count(path: Path, poppler_path: str | None = None) -> int:
     try:
-        return convert_from_path(str(path), dpi=dpi, poppler_path=poppler_path)
+        info = pdfinfo_from_path(str(path), poppler_path=poppler_path)
     except PDFInfoNotInstalledError as err:
-        raise RuntimeError(
-            "Poppler is required for PDF rendering. Install it and ensure `pdftoppm` is on PATH, "
-            "or provide --poppler-path pointing to the Poppler bin directory."
-        ) from err
+        raise RuntimeError(POPPLER_MISSING) from err
+    return int(info.get("Pages", 0))